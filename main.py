@@ -4,7 +4,11 @@ from scraper.streaming_parallel_scraper import scrape_jobs_streaming, cleanup_al
 from scraper.data_export import create_filename, save_to_excel, print_statistics
 from scraper.url_builder import build_search_url
 from scraper.page_parser import get_total_jobs
+from scraper.query_sharding import plan_shards
+from scraper.config import ENABLE_QUERY_SHARDING, SEEK_RESULT_CAP, ADAPTIVE_CONCURRENCY, ADAPTIVE_INITIAL_WORKERS
 from scraper.phone_cache import phone_cache
+from scraper.resume_manager import ResumeManager
+from scraper.process_reaper import install_reaper
 from scraper.user_input import get_sort_preference, get_parallel_workers, get_job_range
 
 
@@ -19,19 +23,26 @@ def main():
     if use_default:
         print("Running in AUTOMATIC mode with default configuration")
         sort_by_date = True
-        num_workers = 20
+        adaptive_workers = ADAPTIVE_CONCURRENCY
+        num_workers = ADAPTIVE_INITIAL_WORKERS if adaptive_workers else 20
         start_job = 1
         end_job = 999999  # Will scrape all available
         print(f"  - Sort by date: Yes")
-        print(f"  - Parallel browsers: {num_workers}")
+        if adaptive_workers:
+            print(f"  - Parallel browsers: adaptive (starting at {num_workers})")
+        else:
+            print(f"  - Parallel browsers: {num_workers}")
         print(f"  - Job range: All available\n")
     else:
         print("Running in INTERACTIVE mode\n")
         sort_by_date = get_sort_preference()
         num_workers = get_parallel_workers()
+        adaptive_workers = False
 
     driver = None
     phone_cache.load()
+    # Kill browsers orphaned by an earlier crash; this run's die with it (exit, Ctrl-C, SIGTERM)
+    install_reaper()
 
     try:
         print("Initializing browser...")
@@ -47,6 +58,11 @@ def main():
         else:
             end_job = min(end_job, total_jobs)
 
+        # Seek stops paginating at ~550 results, so split larger ranges into shards
+        shard_plan = None
+        if ENABLE_QUERY_SHARDING and end_job > SEEK_RESULT_CAP:
+            shard_plan = plan_shards(driver, total_jobs, sort_by_date=sort_by_date)
+
         filename = create_filename()
         print(f"Output will be saved to: {filename}\n")
 
@@ -61,11 +77,16 @@ def main():
             use_page_based=False,
             start_page=1,
             end_page=None,
-            sort_by_date=sort_by_date
+            sort_by_date=sort_by_date,
+            shard_plan=shard_plan,
+            adaptive_workers=adaptive_workers
         )
 
         df = save_to_excel(all_jobs_data, filename)
         print_statistics(df, filename)
+        # The results file is the only other copy of this run's jobs until the export exists
+        if df is not None:
+            ResumeManager(filename, load=False).cleanup_progress_file()
 
     except KeyboardInterrupt:
         print("\n\nInterrupted by user. Progress saved.")
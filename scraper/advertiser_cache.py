@@ -0,0 +1,127 @@
+"""Persistent advertiser profiles, so jobs from known-excluded advertisers can be skipped before fetching."""
+
+import json
+import os
+import time
+from threading import Lock
+from .config import ADVERTISER_CACHE_FILE, ADVERTISER_CACHE_TTL, ADVERTISER_MIN_CONFIDENCE
+from .company_matcher import normalize_company
+from .shared_json import merge_into_file
+
+
+class AdvertiserCache:
+    """
+    Thread-safe profile per advertiser: company size, recruiter or not, and the
+    last filter decision with how many observations in a row agreed with it.
+
+    Filled in by extract_job_details. The link collectors ask should_skip()
+    with the advertiser name from the search card; a job is skipped only when
+    the advertiser was excluded at least min_confidence times in a row and the
+    last observation is younger than ttl, so decisions get refreshed.
+
+    Saved with merge_into_file.
+    """
+
+    def __init__(self, cache_file=ADVERTISER_CACHE_FILE, ttl=ADVERTISER_CACHE_TTL, min_confidence=ADVERTISER_MIN_CONFIDENCE):
+        self.cache_file = cache_file
+        self.ttl = ttl
+        self.min_confidence = min_confidence
+        self.lock = Lock()
+        self.profiles = self._load()
+        self.changed = set()  # Profile keys updated since the last save
+        self.skipped = {}  # advertiser -> jobs skipped this run
+
+    def reset(self):
+        """Clear this run's skip counts (profiles are kept)."""
+        with self.lock:
+            self.skipped = {}
+
+    def _load(self):
+        if os.path.exists(self.cache_file):
+            try:
+                with open(self.cache_file, 'r', encoding='utf-8') as f:
+                    return json.load(f)
+            except Exception as e:
+                print(f"WARNING: Error loading advertiser cache: {e}")
+        return {}
+
+    def save(self):
+        """Write the profiles to disk if anything changed."""
+        with self.lock:
+            if not self.changed:
+                return
+            try:
+                self.profiles = merge_into_file(self.cache_file, self.profiles, self.changed, indent=2, ensure_ascii=False)
+                self.changed.clear()
+            except Exception as e:
+                print(f"WARNING: Error saving advertiser cache: {e}")
+
+    def record(self, company_name, recruiter=False, large=False, company_size=None):
+        """
+        Record what a fetched job page showed about its advertiser.
+
+        Args:
+            company_name: Advertiser name from the job page
+            recruiter: Whether it matched RECRUITMENT_COMPANIES
+            large: Whether its listed size was 1000+ employees
+            company_size: Listed size text, if it was read
+        """
+        key = normalize_company(company_name or '')
+        if not key or company_name == 'N/A':
+            return
+        decision = 'excluded' if recruiter or large else 'kept'
+        with self.lock:
+            profile = self.profiles.get(key)
+            if profile is None or profile['decision'] != decision:
+                profile = self.profiles[key] = {'company': company_name, 'confidence': 0}
+            profile.update({
+                'recruiter': recruiter,
+                'large': large,
+                'decision': decision,
+                'reason': 'recruiter' if recruiter else 'large' if large else '',
+                'confidence': profile['confidence'] + 1,
+                'last_seen': time.time(),
+            })
+            if company_size is not None:
+                profile['company_size'] = company_size
+            self.changed.add(key)
+
+    def should_skip(self, company_name):
+        """
+        True if jobs from this advertiser are reliably filtered out, so fetching them is wasted.
+
+        Args:
+            company_name: Advertiser name (e.g. from a search card); empty never skips
+        """
+        key = normalize_company(company_name or '')
+        if not key:
+            return False
+        with self.lock:
+            profile = self.profiles.get(key)
+            if (profile is None or profile['decision'] != 'excluded'
+                    or profile['confidence'] < self.min_confidence
+                    or time.time() - profile['last_seen'] > self.ttl):
+                return False
+            self.skipped[profile['company']] = self.skipped.get(profile['company'], 0) + 1
+            return True
+
+    def get_report(self):
+        with self.lock:
+            excluded = sum(1 for p in self.profiles.values() if p['decision'] == 'excluded')
+            return {
+                'advertisers': len(self.profiles),
+                'excluded': excluded,
+                'jobs_skipped': sum(self.skipped.values()),
+                'advertisers_skipped': len(self.skipped),
+            }
+
+    def print_report(self):
+        stats = self.get_report()
+        if not stats['advertisers']:
+            return
+        print(f"\nAdvertiser cache: {stats['jobs_skipped']} jobs skipped from {stats['advertisers_skipped']} "
+              f"known-excluded advertisers ({stats['excluded']}/{stats['advertisers']} profiles excluded)")
+
+
+# Global cache shared by all workers
+advertiser_cache = AdvertiserCache()
@@ -0,0 +1,98 @@
+"""Warm browsers shared by every scrape session in the process."""
+
+from collections import deque
+from threading import Lock
+from .driver_setup import setup_driver
+from .config import REUSE_DRIVERS
+from .process_reaper import reap_owned
+
+
+class BrowserPool:
+    """
+    Browsers checked out for one job at a time and kept warm in between.
+
+    A worker acquires a browser (an idle one if available, else a new one),
+    and after the job either releases it back to the pool or discards it if
+    it may be in a bad state. With REUSE_DRIVERS off every release quits the
+    browser. Every browser the pool started is tracked until it is quit, so
+    close_all() and the memory watchdog see them all.
+    """
+
+    def __init__(self, reuse=REUSE_DRIVERS):
+        self.reuse = reuse
+        self.lock = Lock()
+        self.drivers = []  # Every live browser, idle or checked out
+        self.idle = deque()
+
+    def acquire(self, headless=True):
+        """Return an idle browser, or start a new one."""
+        with self.lock:
+            while self.idle:
+                driver = self.idle.popleft()
+                if driver in self.drivers:
+                    return driver
+
+        driver = setup_driver(headless=headless)
+        with self.lock:
+            self.drivers.append(driver)
+        return driver
+
+    def release(self, driver):
+        """Return a browser after a successful job (quit instead if reuse is off)."""
+        if not self.reuse:
+            self.discard(driver)
+            return
+        with self.lock:
+            if driver in self.drivers:
+                self.idle.append(driver)
+
+    def discard(self, driver):
+        """Quit a browser and stop tracking it."""
+        with self.lock:
+            if driver in self.drivers:
+                self.drivers.remove(driver)
+            if driver in self.idle:
+                self.idle.remove(driver)
+        try:
+            driver.quit()
+        except:
+            pass
+
+    def snapshot(self):
+        """List of every live browser (for the memory watchdog)."""
+        with self.lock:
+            return list(self.drivers)
+
+    def close_idle(self):
+        """Quit the browsers not currently running a job."""
+        with self.lock:
+            idle = list(self.idle)
+            self.idle.clear()
+            for driver in idle:
+                if driver in self.drivers:
+                    self.drivers.remove(driver)
+        for driver in idle:
+            try:
+                driver.quit()
+            except:
+                pass
+
+    def close_all(self):
+        """Quit every tracked browser, then kill any still starting up or stuck in a page load."""
+        with self.lock:
+            drivers = list(self.drivers)
+            self.drivers.clear()
+            self.idle.clear()
+
+        for driver in drivers:
+            try:
+                driver.quit()
+            except:
+                pass
+
+        # Browsers mid-setup_driver were never tracked; only their process group finds them
+        reap_owned()
+
+
+# Global pool shared by all sessions
+browser_pool = BrowserPool()
@@ -0,0 +1,137 @@
+"""Match scraped advertiser names against a list of target companies."""
+
+import re
+from threading import Lock
+
+# Words that don't help identify a company
+COMMON_WORDS = {'the', 'of', 'and', 'for', 'in', 'victoria', 'victorian', 'department', 'office'}
+
+# Containment only counts when the shorter name is at least this long
+MIN_CONTAINED_LENGTH = 10
+
+
+def normalize_company(text):
+    """Lowercase, drop parenthesised parts and punctuation, collapse whitespace."""
+    # Remove parentheses and contents
+    text = re.sub(r'\([^)]*\)', '', text)
+    # Keep only alphanumeric and spaces
+    text = re.sub(r'[^a-zA-Z0-9\s]', '', text)
+    # Collapse whitespace
+    text = ' '.join(text.split())
+    return text.lower().strip()
+
+
+def company_tokens(normalized):
+    """Identifying words of a normalized name."""
+    return frozenset(normalized.split()) - COMMON_WORDS
+
+
+def _similarity(scraped_norm, scraped_tokens, expected_norm, expected_tokens):
+    """
+    Score how well two normalized names match.
+
+    Returns:
+        2.0 for an exact match, 1.5 if one name contains the other, else the word
+        overlap ratio (0-1) of their identifying words
+    """
+    if scraped_norm == expected_norm:
+        return 2.0
+    # Cases like "Department of X" vs "X"
+    if expected_norm in scraped_norm or scraped_norm in expected_norm:
+        if min(len(expected_norm), len(scraped_norm)) >= MIN_CONTAINED_LENGTH:
+            return 1.5
+    if not expected_tokens:
+        return 0.0
+    union = scraped_tokens | expected_tokens
+    return len(scraped_tokens & expected_tokens) / len(union) if union else 0.0
+
+
+def company_names_match(scraped_company, expected_company, threshold=0.6):
+    """
+    Check if scraped company name matches expected company name.
+    Uses fuzzy matching to handle variations.
+
+    Args:
+        scraped_company: Company name from scraped job
+        expected_company: Company name we're searching for
+        threshold: Minimum similarity ratio (0-1)
+
+    Returns:
+        True if names match closely enough
+    """
+    if not scraped_company or scraped_company == 'N/A':
+        return False
+    scraped_norm = normalize_company(scraped_company)
+    expected_norm = normalize_company(expected_company)
+    score = _similarity(scraped_norm, company_tokens(scraped_norm), expected_norm, company_tokens(expected_norm))
+    return score >= threshold
+
+
+class CompanyMatcher:
+    """
+    Finds which target company a scraped advertiser name belongs to.
+
+    Target names are normalized once and their identifying words put in an
+    inverted index, so a lookup only scores the targets sharing a word with
+    the advertiser instead of comparing against every name. Scores follow
+    company_names_match: exact, then containment, then word overlap. Results
+    are memoised per advertiser name.
+    """
+
+    def __init__(self, companies, threshold=0.6):
+        """
+        Args:
+            companies: Target company names
+            threshold: Minimum word overlap ratio for a fuzzy match (0-1)
+        """
+        self.threshold = threshold
+        self.lock = Lock()
+        self.memo = {}
+        self.targets = {}  # company -> (normalized name, identifying words)
+        self.exact = {}  # normalized name -> company
+        self.index = {}  # word -> companies using it
+        for company in companies:
+            normalized = normalize_company(company)
+            tokens = company_tokens(normalized)
+            self.targets[company] = (normalized, tokens)
+            self.exact.setdefault(normalized, company)
+            for token in tokens:
+                self.index.setdefault(token, []).append(company)
+
+    def match(self, scraped_company):
+        """
+        Return the target company an advertiser name matches best, or None.
+
+        Args:
+            scraped_company: Company name from a scraped job
+        """
+        if not scraped_company or scraped_company == 'N/A':
+            return None
+        with self.lock:
+            if scraped_company in self.memo:
+                return self.memo[scraped_company]
+
+        scraped_norm = normalize_company(scraped_company)
+        best = self.exact.get(scraped_norm)
+        if best is None:
+            scraped_tokens = company_tokens(scraped_norm)
+            candidates = {company for token in scraped_tokens for company in self.index.get(token, ())}
+            best_score = self.threshold
+            # Sorted so ties always go to the same company
+            for company in sorted(candidates):
+                normalized, tokens = self.targets[company]
+                score = _similarity(scraped_norm, scraped_tokens, normalized, tokens)
+                if score > best_score or (score == best_score and best is None):
+                    best, best_score = company, score
+
+        with self.lock:
+            self.memo[scraped_company] = best
+        return best
+
+    def matches(self, scraped_company, expected_company):
+        """True if the advertiser name matches the expected target (as company_names_match, precomputed)."""
+        if not scraped_company or scraped_company == 'N/A' or expected_company not in self.targets:
+            return company_names_match(scraped_company, expected_company, self.threshold)
+        scraped_norm = normalize_company(scraped_company)
+        normalized, tokens = self.targets[expected_company]
+        return _similarity(scraped_norm, company_tokens(scraped_norm), normalized, tokens) >= self.threshold
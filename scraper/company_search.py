@@ -1,14 +1,23 @@
 """Search for jobs from specific companies."""
 
 from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
 from urllib.parse import quote_plus
 from concurrent.futures import ThreadPoolExecutor, as_completed
+from queue import Queue, Empty
 from .driver_setup import setup_driver
+from .page_parser import get_job_cards_on_page
+from .config import BASE_URL, COMPANY_SEARCH_CACHE, MAX_PAGES, PAGE_LOAD_TIMEOUT
+from .readiness import wait_until
+from .company_search_cache import company_search_cache
+from .url_builder import extract_job_id
 import time
 import re
 
+NO_RESULTS_SELECTOR = "[data-automation='noSearchResults']"
+RESULTS_SELECTOR = "[data-search-sol-meta]"
+TOTAL_COUNT_SELECTOR = "[data-automation='totalJobsCount']"
+NEXT_PAGE_SELECTOR = "[data-automation='page-next']"
+
 
 def build_company_search_url(company_name, location="Melbourne", classification="information-communication-technology"):
     """
@@ -47,15 +56,143 @@ def build_company_search_url(company_name, location="Melbourne", classification=
     # Build URL in SEEK's path format
     # Format: /{Company-Name}-jobs-in-{classification}/in-{Location}
     if classification:
-        url = f"https://www.seek.com.au/{company_slug}-jobs-in-{classification}/in-{location_slug}"
+        url = f"{BASE_URL}/{company_slug}-jobs-in-{classification}/in-{location_slug}"
     else:
         # If no classification, just company and location
-        url = f"https://www.seek.com.au/{company_slug}-jobs/in-{location_slug}"
+        url = f"{BASE_URL}/{company_slug}-jobs/in-{location_slug}"
     
     return url
 
 
-def get_company_job_links(driver, company_name, location="Melbourne", classification="information-communication-technology"):
+def _results_state(driver):
+    """
+    Readiness check for a company search page.
+
+    Returns NO_RESULTS_SELECTOR for SEEK's empty-state message or a "0" result
+    count (whichever renders first), RESULTS_SELECTOR once the job cards are
+    there, or None while the page is still loading.
+    """
+    if driver.find_elements(By.CSS_SELECTOR, NO_RESULTS_SELECTOR):
+        return NO_RESULTS_SELECTOR
+    counts = driver.find_elements(By.CSS_SELECTOR, TOTAL_COUNT_SELECTOR)
+    if counts and re.sub(r'[^\d]', '', counts[0].text or '') == '0':
+        return NO_RESULTS_SELECTOR
+    if driver.find_elements(By.CSS_SELECTOR, RESULTS_SELECTOR):
+        return RESULTS_SELECTOR
+    return None
+
+
+def _read_job_links(driver):
+    """Return the cleaned job URLs on the current results page, in page order."""
+    job_links = []
+    job_cards = driver.find_elements(By.CSS_SELECTOR, "article[data-card-type='JobCard'] a[data-automation='jobTitle']")
+    for card in job_cards:
+        href = card.get_attribute('href')
+        if href and '/job/' in href:
+            # Clean URL
+            job_url = href.split('?')[0]
+            if job_url not in job_links:
+                job_links.append(job_url)
+    return job_links
+
+
+def _read_advertisers(driver, job_links, card_info):
+    """Fill card_info with url -> advertiser name from the search cards for job_links."""
+    try:
+        advertisers = {extract_job_id(card['url']): card['company'] for card in get_job_cards_on_page(driver)}
+    except Exception:
+        return
+    for job_url in job_links:
+        company = advertisers.get(extract_job_id(job_url))
+        if company:
+            card_info[job_url] = company
+
+
+def _read_pagination(driver):
+    """
+    Read the result count and whether an enabled "Next" link is on the page.
+    
+    Returns:
+        Tuple of (total jobs or None, has_next)
+    """
+    try:
+        # Missing elements would otherwise each cost a full implicit wait
+        driver.implicitly_wait(0)
+        total = None
+        counts = driver.find_elements(By.CSS_SELECTOR, TOTAL_COUNT_SELECTOR)
+        if counts:
+            digits = re.sub(r'[^\d]', '', counts[0].text or '')
+            total = int(digits) if digits else None
+        next_links = driver.find_elements(By.CSS_SELECTOR, NEXT_PAGE_SELECTOR)
+        has_next = bool(next_links) and next_links[0].get_attribute('aria-disabled') != 'true'
+        return total, has_next
+    finally:
+        driver.implicitly_wait(PAGE_LOAD_TIMEOUT)
+
+
+def iter_company_job_links(driver, company_name, location="Melbourne", classification="information-communication-technology", max_jobs=None, card_info=None):
+    """
+    Search a company and yield its job links one results page at a time.
+    
+    Follows pagination until the result count is covered, there is no next
+    page, or max_jobs links have been yielded (so no page beyond the limit is
+    fetched). A search that runs to completion is stored in the search cache.
+    
+    Args:
+        driver: Selenium WebDriver
+        company_name: Company to search for
+        location: Location filter
+        classification: Job category slug
+        max_jobs: Stop after this many links (None = all)
+        card_info: Optional dict filled with url -> advertiser name from the search cards
+    
+    Yields:
+        Lists of new job URLs, one per results page
+    
+    Raises:
+        TimeoutError: If the first results page never rendered
+    """
+    url = build_company_search_url(company_name, location, classification)
+    job_links = []
+    search_seconds = 0.0
+    complete = False
+    
+    for page in range(1, MAX_PAGES + 1):
+        start = time.perf_counter()
+        driver.get(url if page == 1 else f"{url}?page={page}")
+        # Wait for the results, SEEK's "0 jobs" message or a zero count, whichever renders first
+        found = wait_until(driver, 'company.results', _results_state, replaces=2, timeout=10)
+        if found is None and page == 1:
+            raise TimeoutError("no results rendered within the wait")
+        if found != RESULTS_SELECTOR:
+            complete = found == NO_RESULTS_SELECTOR
+            search_seconds += time.perf_counter() - start
+            break
+        
+        new_links = [link for link in _read_job_links(driver) if link not in job_links]
+        if max_jobs:
+            new_links = new_links[:max_jobs - len(job_links)]
+        job_links.extend(new_links)
+        if card_info is not None:
+            _read_advertisers(driver, new_links, card_info)
+        total, has_next = _read_pagination(driver)
+        search_seconds += time.perf_counter() - start
+        
+        if new_links:
+            yield new_links
+        if max_jobs and len(job_links) >= max_jobs:
+            break
+        if not new_links or not has_next or (total is not None and len(job_links) >= total):
+            complete = True
+            break
+    
+    print(f"  Found {len(job_links)} jobs for {company_name}" + ("" if complete else " (stopped at limit)"))
+    if COMPANY_SEARCH_CACHE:
+        job_ids = [extract_job_id(job_url) for job_url in job_links]
+        company_search_cache.set(url, company_name, job_ids, search_seconds, complete=complete)
+
+
+def get_company_job_links(driver, company_name, location="Melbourne", classification="information-communication-technology", max_jobs=None):
     """
     Get all job links for a specific company.
     
@@ -64,52 +201,32 @@ def get_company_job_links(driver, company_name, location="Melbourne", classifica
         company_name: Company to search for
         location: Location filter
         classification: Job category slug
+        max_jobs: Stop after this many links (None = all)
     
     Returns:
         List of job URLs
     """
-    url = build_company_search_url(company_name, location, classification)
-    driver.get(url)
-    time.sleep(2)
-    
     job_links = []
     
     try:
-        # Check if there are any jobs (SEEK shows "0 jobs" message if none found)
-        # Try to find the job count or no results message first
-        try:
-            no_results = driver.find_elements(By.CSS_SELECTOR, "[data-automation='noSearchResults']")
-            if no_results:
-                print(f"  Found 0 jobs for {company_name}")
-                return []
-        except:
-            pass
-        
-        # Wait for results
-        WebDriverWait(driver, 10).until(
-            EC.presence_of_element_located((By.CSS_SELECTOR, "[data-search-sol-meta]"))
-        )
-        
-        # Get all job links on page
-        job_cards = driver.find_elements(By.CSS_SELECTOR, "article[data-card-type='JobCard'] a[data-automation='jobTitle']")
-        
-        for card in job_cards:
-            href = card.get_attribute('href')
-            if href and '/job/' in href:
-                # Clean URL
-                job_url = href.split('?')[0]
-                if job_url not in job_links:
-                    job_links.append(job_url)
-        
-        print(f"  Found {len(job_links)} jobs for {company_name}")
-        
+        for page_links in iter_company_job_links(driver, company_name, location, classification, max_jobs):
+            job_links.extend(page_links)
     except Exception as e:
         print(f"  WARNING: Error searching {company_name}: {e}")
     
     return job_links
 
 
-def search_company_with_driver(company_name, location="Melbourne", classification="information-communication-technology", headless=True):
+def get_cached_company_job_links(company_name, location="Melbourne", classification="information-communication-technology", max_jobs=None):
+    """
+    Return a company's job links from the search cache, or None if it has to be searched live.
+    """
+    if not COMPANY_SEARCH_CACHE:
+        return None
+    return company_search_cache.get(build_company_search_url(company_name, location, classification), max_jobs)
+
+
+def search_company_with_driver(company_name, location="Melbourne", classification="information-communication-technology", headless=True, max_jobs=None):
     """
     Search a single company with its own driver instance (for parallel execution).
     
@@ -118,14 +235,19 @@ def search_company_with_driver(company_name, location="Melbourne", classificatio
         location: Location filter
         classification: Job category slug
         headless: Run browser in headless mode
+        max_jobs: Stop after this many links (None = all)
     
     Returns:
         Tuple of (company_name, job_links)
     """
+    cached = get_cached_company_job_links(company_name, location, classification, max_jobs)
+    if cached is not None:
+        return (company_name, cached)
+    
     driver = None
     try:
         driver = setup_driver(headless=headless)
-        job_links = get_company_job_links(driver, company_name, location, classification)
+        job_links = get_company_job_links(driver, company_name, location, classification, max_jobs)
         driver.quit()
         return (company_name, job_links)
     except Exception as e:
@@ -138,7 +260,7 @@ def search_company_with_driver(company_name, location="Melbourne", classificatio
         return (company_name, [])
 
 
-def search_multiple_companies(driver, company_list, location="Melbourne", classification="information-communication-technology"):
+def search_multiple_companies(driver, company_list, location="Melbourne", classification="information-communication-technology", max_jobs=None):
     """
     Search jobs for multiple companies (sequential, single driver).
     
@@ -147,6 +269,7 @@ def search_multiple_companies(driver, company_list, location="Melbourne", classi
         company_list: List of company names
         location: Location filter
         classification: Job category slug
+        max_jobs: Links to collect per company (None = all)
     
     Returns:
         Dict mapping company names to job URLs
@@ -156,18 +279,23 @@ def search_multiple_companies(driver, company_list, location="Melbourne", classi
     print(f"\nSearching {len(company_list)} companies in {location}...\n")
     
     for i, company in enumerate(company_list, 1):
+        cached = get_cached_company_job_links(company, location, classification, max_jobs)
+        if cached is not None:
+            results[company] = cached
+            continue
         print(f"[{i}/{len(company_list)}] Searching: {company}")
-        job_links = get_company_job_links(driver, company, location, classification)
+        job_links = get_company_job_links(driver, company, location, classification, max_jobs)
         results[company] = job_links
         time.sleep(1)
     
     total_jobs = sum(len(jobs) for jobs in results.values())
     print(f"\nTotal jobs found: {total_jobs}")
+    company_search_cache.print_report()
     
     return results
 
 
-def search_multiple_companies_parallel(company_list, location="Melbourne", classification="information-communication-technology", num_workers=5, headless=True):
+def search_multiple_companies_parallel(company_list, location="Melbourne", classification="information-communication-technology", num_workers=5, headless=True, max_jobs=None):
     """
     Search jobs for multiple companies in parallel (each with own headless browser).
     
@@ -177,6 +305,7 @@ def search_multiple_companies_parallel(company_list, location="Melbourne", class
         classification: Job category slug
         num_workers: Number of parallel browser instances
         headless: Run browsers in headless mode
+        max_jobs: Links to collect per company (None = all)
     
     Returns:
         Dict mapping company names to job URLs
@@ -188,7 +317,7 @@ def search_multiple_companies_parallel(company_list, location="Melbourne", class
     
     with ThreadPoolExecutor(max_workers=num_workers) as executor:
         futures = {
-            executor.submit(search_company_with_driver, company, location, classification, headless): company
+            executor.submit(search_company_with_driver, company, location, classification, headless, max_jobs): company
             for company in company_list
         }
         
@@ -209,5 +338,75 @@ def search_multiple_companies_parallel(company_list, location="Melbourne", class
     
     total_jobs = sum(len(jobs) for jobs in results.values())
     print(f"\nTotal jobs found: {total_jobs}")
+    company_search_cache.print_report()
     
     return results
+
+
+def stream_company_job_links(company_list, location="Melbourne", classification="information-communication-technology", num_workers=5, headless=True, max_jobs=None, card_info=None):
+    """
+    Search companies in parallel and yield each job link as soon as its results page is read.
+    
+    Each worker searches one company at a time with its own browser; cached
+    companies are yielded without opening one. Lets scraping start while the
+    remaining companies are still being searched.
+    
+    Args:
+        company_list: List of company names
+        location: Location filter
+        classification: Job category slug
+        num_workers: Number of parallel browser instances
+        headless: Run browsers in headless mode
+        max_jobs: Links to collect per company (None = all)
+        card_info: Optional dict filled with url -> advertiser name from the search cards
+            (searches served from the cache record no advertisers)
+    
+    Yields:
+        (company_name, job_url) tuples in discovery order
+    """
+    found = Queue()
+    
+    def search(company_name):
+        cached = get_cached_company_job_links(company_name, location, classification, max_jobs)
+        if cached is not None:
+            for job_url in cached:
+                found.put((company_name, job_url))
+            return
+        
+        driver = None
+        try:
+            driver = setup_driver(headless=headless)
+            for page_links in iter_company_job_links(driver, company_name, location, classification, max_jobs,
+                                                     card_info=card_info):
+                for job_url in page_links:
+                    found.put((company_name, job_url))
+        except Exception as e:
+            print(f"  ✗ Failed to search {company_name}: {e}")
+        finally:
+            if driver:
+                try:
+                    driver.quit()
+                except:
+                    pass
+    
+    print(f"\nSearching {len(company_list)} companies in {location} ({num_workers} parallel workers)...")
+    total_jobs = 0
+    with ThreadPoolExecutor(max_workers=num_workers) as executor:
+        futures = [executor.submit(search, company) for company in company_list]
+        try:
+            while True:
+                try:
+                    item = found.get(timeout=0.2)
+                except Empty:
+                    if all(future.done() for future in futures) and found.empty():
+                        break
+                    continue
+                total_jobs += 1
+                yield item
+        finally:
+            # Consumer stopped early: don't start the searches still waiting
+            for future in futures:
+                future.cancel()
+    
+    print(f"\nCompany search complete: {total_jobs} jobs found")
+    company_search_cache.print_report()
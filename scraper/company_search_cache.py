@@ -0,0 +1,105 @@
+"""Persistent cache of company search results (company -> job IDs) with a TTL."""
+
+import json
+import os
+import time
+from threading import Lock
+from .config import BASE_URL, COMPANY_SEARCH_CACHE_FILE, COMPANY_SEARCH_TTL
+from .shared_json import merge_into_file
+
+
+class CompanySearchCache:
+    """
+    Thread-safe job IDs per company search URL, with how long the live search took.
+
+    Entries older than ttl seconds are ignored. A hit adds the recorded search
+    time to the seconds skipped, so a run can report what the cache saved.
+    Saved with merge_into_file.
+    """
+
+    def __init__(self, cache_file=COMPANY_SEARCH_CACHE_FILE, ttl=COMPANY_SEARCH_TTL):
+        self.cache_file = cache_file
+        self.ttl = ttl
+        self.lock = Lock()
+        self.cache = self._load()
+        self.changed = set()  # Search URLs set since the last save
+        self.stats = {'hits': 0, 'misses': 0, 'zero_results': 0, 'seconds_skipped': 0.0}
+
+    def _load(self):
+        if os.path.exists(self.cache_file):
+            try:
+                with open(self.cache_file, 'r', encoding='utf-8') as f:
+                    return json.load(f)
+            except Exception as e:
+                print(f"WARNING: Error loading company search cache: {e}")
+        return {}
+
+    def _save(self):
+        """Merge this process's new searches into the cache file (caller holds the lock)."""
+        if not self.changed:
+            return
+        try:
+            self.cache = merge_into_file(self.cache_file, self.cache, self.changed, indent=2, ensure_ascii=False)
+            self.changed.clear()
+        except Exception as e:
+            print(f"WARNING: Error saving company search cache: {e}")
+
+    def get(self, search_url, max_jobs=None):
+        """
+        Return the cached job URLs for a company search, or None if missing or expired.
+
+        A search that stopped at a job limit only satisfies requests for up to that many jobs.
+        """
+        with self.lock:
+            entry = self.cache.get(search_url)
+            if entry is None or time.time() - entry['searched_at'] > self.ttl:
+                self.stats['misses'] += 1
+                return None
+            job_ids = entry['job_ids']
+            if not entry.get('complete', True) and (not max_jobs or len(job_ids) < max_jobs):
+                self.stats['misses'] += 1
+                return None
+            self.stats['hits'] += 1
+            self.stats['seconds_skipped'] += entry.get('search_seconds', 0.0)
+            return [f"{BASE_URL}/job/{job_id}" for job_id in job_ids[:max_jobs or None]]
+
+    def set(self, search_url, company_name, job_ids, search_seconds, complete=True):
+        """
+        Record a completed live search.
+
+        Args:
+            search_url: Company search URL (the cache key)
+            company_name: Company searched for
+            job_ids: Job IDs found (empty for a zero-result search)
+            search_seconds: How long the live search took
+            complete: False if the search stopped at a job limit before the last page
+        """
+        with self.lock:
+            self.cache[search_url] = {
+                'company': company_name,
+                'job_ids': list(job_ids),
+                'searched_at': time.time(),
+                'search_seconds': round(search_seconds, 2),
+                'complete': complete,
+            }
+            self.changed.add(search_url)
+            if not job_ids:
+                self.stats['zero_results'] += 1
+            self._save()
+
+    def get_report(self):
+        with self.lock:
+            return dict(self.stats)
+
+    def print_report(self):
+        stats = self.get_report()
+        searched = stats['hits'] + stats['misses']
+        if not searched:
+            return
+        print(f"Company search cache: {stats['hits']}/{searched} companies from cache, "
+              f"~{stats['seconds_skipped']:.0f}s of searching skipped "
+              f"({stats['zero_results']} live searches had no jobs)")
+
+
+# Global cache shared by all search workers
+company_search_cache = CompanySearchCache()
@@ -0,0 +1,191 @@
+"""Adaptive (AIMD) concurrency control for the scrape pool."""
+
+import time
+from collections import deque
+from contextlib import contextmanager
+from threading import Condition
+from .host_stats import get_cpu_utilization, get_free_memory_fraction
+from .stage_timer import percentile
+from .config import (
+    ADAPTIVE_INTERVAL, ADAPTIVE_WINDOW, ADAPTIVE_INCREASE_STEP, ADAPTIVE_DECREASE_FACTOR,
+    ADAPTIVE_MAX_ERROR_RATE, ADAPTIVE_MAX_TIMEOUT_RATE, ADAPTIVE_MAX_CPU, ADAPTIVE_MIN_FREE_MEMORY,
+    ADAPTIVE_LATENCY_FACTOR
+)
+
+
+class AdaptiveConcurrencyController:
+    """
+    Limits how many jobs run at once and adjusts the limit from live measurements.
+
+    Workers call acquire()/release() (or use slot()) around each job and report
+    its outcome with record(). Every ADAPTIVE_INTERVAL seconds the controller
+    looks at the recent window of jobs plus host CPU and free memory:
+    - any sign of overload (errors, timeouts, latency well above the best seen,
+      CPU saturated, memory low) shrinks the limit multiplicatively;
+    - otherwise, if all slots were busy, the limit grows (doubling until the
+      first overload, then additively), up to the ceiling.
+    Every decision is logged with the measured throughput.
+    """
+
+    def __init__(self, floor, ceiling, initial=None, adaptive=True):
+        """
+        Args:
+            floor: Minimum number of concurrent jobs
+            ceiling: Maximum number of concurrent jobs (size the executor to this)
+            initial: Starting limit (default: floor)
+            adaptive: If False, the limit only changes through shrink() (e.g. memory pressure)
+        """
+        self.floor = max(1, floor)
+        self.ceiling = max(self.floor, ceiling)
+        self.limit = min(self.ceiling, max(self.floor, initial or self.floor))
+        self.adaptive = adaptive
+
+        self.condition = Condition()
+        self.active = 0
+        self.peak_active = 0
+        self.saturated = False
+        self.slow_start = True
+
+        self.window = deque(maxlen=ADAPTIVE_WINDOW)
+        self.best_latency = None
+        self.completed = 0
+        self.completed_at_last_decision = 0
+        self.last_decision_at = time.time()
+        self.evaluating = False
+        self.decisions = []
+
+    def acquire(self):
+        """Block until a slot is free, then take it."""
+        with self.condition:
+            while self.active >= self.limit:
+                self.saturated = True
+                self.condition.wait()
+            self.active += 1
+            self.peak_active = max(self.peak_active, self.active)
+            if self.active >= self.limit:
+                self.saturated = True
+
+    def release(self):
+        """Give a slot back."""
+        with self.condition:
+            self.active -= 1
+            self.condition.notify_all()
+
+    @contextmanager
+    def slot(self):
+        """Context manager holding one slot for its body."""
+        self.acquire()
+        try:
+            yield
+        finally:
+            self.release()
+
+    def record(self, latency, error=False, timeout=False):
+        """Report a finished job (latency in seconds) and re-evaluate the limit if due."""
+        with self.condition:
+            self.window.append((latency, error, timeout))
+            self.completed += 1
+            due = (self.adaptive and not self.evaluating
+                   and time.time() - self.last_decision_at >= ADAPTIVE_INTERVAL)
+            if due:
+                self.evaluating = True
+        if due:
+            try:
+                self.evaluate()
+            finally:
+                self.evaluating = False
+
+    def _set_limit(self, new_limit, action, reason, throughput, details):
+        """Apply a new limit and log the decision (caller holds the condition)."""
+        old_limit = self.limit
+        self.limit = min(self.ceiling, max(self.floor, new_limit))
+        decision = {
+            'time': round(time.time(), 1),
+            'action': action,
+            'from': old_limit,
+            'to': self.limit,
+            'reason': reason,
+            'throughput': round(throughput, 3),
+            **details,
+        }
+        self.decisions.append(decision)
+        print(f"  [Concurrency] {old_limit} -> {self.limit} ({action}: {reason}) | "
+              f"{throughput:.2f} jobs/s | p50 {details.get('p50_latency', 0):.1f}s | "
+              f"errors {details.get('error_rate', 0) * 100:.0f}% | CPU {details.get('cpu', 0) * 100:.0f}% | "
+              f"free mem {details.get('free_memory', 1) * 100:.0f}%")
+        if self.limit > old_limit:
+            self.condition.notify_all()
+
+    def evaluate(self):
+        """Look at the recent window and host load, then grow, shrink or hold the limit."""
+        cpu = get_cpu_utilization()
+        free_memory = get_free_memory_fraction()
+
+        with self.condition:
+            now = time.time()
+            elapsed = max(1e-6, now - self.last_decision_at)
+            throughput = (self.completed - self.completed_at_last_decision) / elapsed
+            self.last_decision_at = now
+            self.completed_at_last_decision = self.completed
+
+            samples = list(self.window)
+            if not samples:
+                return
+            latencies = sorted(s[0] for s in samples)
+            p50 = percentile(latencies, 50)
+            error_rate = sum(1 for s in samples if s[1]) / len(samples)
+            timeout_rate = sum(1 for s in samples if s[2]) / len(samples)
+            if self.best_latency is None or p50 < self.best_latency:
+                self.best_latency = p50
+
+            details = {
+                'p50_latency': round(p50, 3),
+                'error_rate': round(error_rate, 3),
+                'timeout_rate': round(timeout_rate, 3),
+                'cpu': round(cpu, 3),
+                'free_memory': round(free_memory, 3),
+                'active': self.active,
+            }
+
+            reason = None
+            if free_memory < ADAPTIVE_MIN_FREE_MEMORY:
+                reason = 'low memory'
+            elif cpu > ADAPTIVE_MAX_CPU:
+                reason = 'CPU saturated'
+            elif error_rate > ADAPTIVE_MAX_ERROR_RATE:
+                reason = 'error rate'
+            elif timeout_rate > ADAPTIVE_MAX_TIMEOUT_RATE:
+                reason = 'timeout rate'
+            elif self.best_latency and p50 > self.best_latency * ADAPTIVE_LATENCY_FACTOR:
+                reason = 'latency rising'
+
+            if reason:
+                self.slow_start = False
+                self.window.clear()
+                if self.limit > self.floor:
+                    self._set_limit(int(self.limit * ADAPTIVE_DECREASE_FACTOR), 'decrease', reason, throughput, details)
+            elif self.saturated and self.limit < self.ceiling:
+                step = self.limit if self.slow_start else ADAPTIVE_INCREASE_STEP
+                self._set_limit(self.limit + step, 'increase', 'all slots busy', throughput, details)
+            self.saturated = self.active >= self.limit
+
+    def shrink(self, reason):
+        """Multiplicatively decrease the limit right away (e.g. on memory pressure)."""
+        with self.condition:
+            self.slow_start = False
+            if self.limit > self.floor:
+                elapsed = max(1e-6, time.time() - self.last_decision_at)
+                throughput = (self.completed - self.completed_at_last_decision) / elapsed
+                self._set_limit(int(self.limit * ADAPTIVE_DECREASE_FACTOR), 'decrease', reason, throughput, {})
+
+    def get_stats(self):
+        """Return a summary of the controller's run."""
+        with self.condition:
+            return {
+                'limit': self.limit,
+                'floor': self.floor,
+                'ceiling': self.ceiling,
+                'peak_active': self.peak_active,
+                'completed': self.completed,
+                'decisions': len(self.decisions),
+            }
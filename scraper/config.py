@@ -1,9 +1,12 @@
 """Configuration and constants for the Seek scraper."""
 
+import os
+
 # Search configuration
 CLASSIFICATION = "information-communication-technology"
 LOCATION = "All-Melbourne-VIC"
-BASE_URL = "https://www.seek.com.au"
+# Override with SEEK_BASE_URL to point at a local fixture server (see scraper/fixture_server.py)
+BASE_URL = os.getenv('SEEK_BASE_URL', "https://www.seek.com.au").rstrip('/')
 
 # Scraping settings
 DEFAULT_WORKERS = 20
@@ -11,18 +14,183 @@ MAX_WORKERS = 20
 CHECKPOINT_INTERVAL = 50
 MAX_PAGES = 100
 
+# Adaptive concurrency (automatic mode): browsers grow/shrink between floor and ceiling
+ADAPTIVE_CONCURRENCY = True
+ADAPTIVE_MIN_WORKERS = 2
+ADAPTIVE_MAX_WORKERS = max(MAX_WORKERS, (os.cpu_count() or 1) * 2)
+ADAPTIVE_INITIAL_WORKERS = 4
+ADAPTIVE_INTERVAL = 10  # Seconds between decisions
+ADAPTIVE_WINDOW = 50  # Recent jobs considered per decision
+ADAPTIVE_INCREASE_STEP = 1
+ADAPTIVE_DECREASE_FACTOR = 0.7
+ADAPTIVE_MAX_ERROR_RATE = 0.1
+ADAPTIVE_MAX_TIMEOUT_RATE = 0.05
+ADAPTIVE_MAX_CPU = 0.9
+ADAPTIVE_MIN_FREE_MEMORY = 0.15
+ADAPTIVE_LATENCY_FACTOR = 2.0  # Shrink when p50 latency exceeds this multiple of the best seen
+
+# Browser reuse and memory watchdog
+REUSE_DRIVERS = True  # Browsers go back to the shared pool between jobs instead of one Chrome per job
+MEMORY_WATCHDOG_INTERVAL = 5  # Seconds between RSS samples
+BROWSER_RSS_LIMIT_MB = 1024  # Recycle a browser (chromedriver + Chrome tree) above this
+WATCHDOG_MIN_FREE_MEMORY = 0.1  # Lower concurrency when host free memory drops below this fraction
+
+# Query sharding (Seek only exposes ~25 pages / ~550 results per search)
+ENABLE_QUERY_SHARDING = True
+SEEK_RESULT_CAP = 550
+SHARD_WORKERS = 4
+# Dimensions are split in this order until each shard fits under the cap
+SHARD_DIMENSIONS = ['location', 'worktype', 'salaryrange', 'subclassification']
+SHARD_SUB_LOCATIONS = [
+    'CBD-&-Inner-Suburbs-Melbourne-VIC',
+    'Bayside-&-South-Eastern-Suburbs-Melbourne-VIC',
+    'Eastern-Suburbs-Melbourne-VIC',
+    'Northern-Suburbs-Melbourne-VIC',
+    'Western-Suburbs-Melbourne-VIC',
+    'Mornington-Peninsula-&-Bass-Coast-Melbourne-VIC',
+]
+SHARD_WORK_TYPES = {
+    '242': 'Full time',
+    '243': 'Part time',
+    '244': 'Contract/Temp',
+    '245': 'Casual/Vacation',
+}
+SHARD_SALARY_BANDS = [
+    '0-80000', '80000-100000', '100000-120000', '120000-140000',
+    '140000-160000', '160000-200000', '200000-',
+]
+SHARD_SUBCLASSIFICATIONS = {
+    '6282': 'Architects',
+    '6283': 'Business/Systems Analysts',
+    '6284': 'Computer Operators',
+    '6285': 'Consultants',
+    '6286': 'Database Development & Administration',
+    '6287': 'Developers/Programmers',
+    '6288': 'Engineering - Hardware',
+    '6289': 'Engineering - Network',
+    '6290': 'Engineering - Software',
+    '6291': 'Help Desk & IT Support',
+    '6292': 'Management',
+    '6293': 'Networks & Systems Administration',
+    '6294': 'Product Management & Development',
+    '6295': 'Programme & Project Management',
+    '6296': 'Sales - Pre & Post',
+    '6297': 'Security',
+    '6298': 'Team Leaders',
+    '6299': 'Technical Writers',
+    '6300': 'Telecommunications',
+    '6301': 'Testing & Quality Assurance',
+    '6302': 'Web Development & Production',
+    '6303': 'Other',
+}
+
 # Timeout settings (in seconds)
 PAGE_LOAD_TIMEOUT = 1.5
 ELEMENT_WAIT_TIMEOUT = 1.5
 BRIEF_PAUSE = 0.2
 PAGE_TRANSITION = 0.8
 PAGINATION_SCROLL = 0.8
+NAVIGATION_TIMEOUT = 30  # driver.get() gives up after this (set_page_load_timeout)
+SCRIPT_TIMEOUT = 15  # execute_script / execute_async_script limit
+JOB_DEADLINE = 90  # Hard limit for one job (navigation and extraction) and for one Google enrichment search
+JOB_MAX_RETRIES = 1  # Times a job that hit its deadline is re-queued on a fresh browser
+RESULT_POLL_INTERVAL = 5  # Seconds the result loop waits before re-checking for cancellation
+
+# Readiness waits (scraper/readiness.py) poll for a page condition instead of sleeping
+READINESS_POLL_INTERVAL = 0.05
+READINESS_QUIET_PERIOD = 0.3  # DOM/network must be quiet this long to count as settled
+READINESS_MIN_SAMPLES = 10  # Waits observed before a condition's timeout adapts
+READINESS_TIMEOUT_FACTOR = 2.0  # Adaptive timeout = observed p95 x this
+READINESS_MIN_TIMEOUT = 0.5
+
+# Selector fallbacks are reordered by success (scraper/selector_registry.py, stats in cache/)
+SELECTOR_SCORE_DECAY = 0.9  # Weight of past outcomes in a selector's moving success score
+SELECTOR_STALE_AFTER = 3  # Misses in a row, each made up for by a fallback, before a selector is flagged
+
+# Build records from Seek's own JSON API responses (Chrome network log) before falling back to the DOM
+CAPTURE_NETWORK = os.getenv('CAPTURE_NETWORK', 'false').lower() == 'true'
+
+# Bounded queue between link collection and the workers (collection blocks when it is full)
+WORK_QUEUE_SIZE = 500
+SPILL_WORK_QUEUE = False  # Spill overflow to cache/ on disk instead of blocking collection
+
+# Scrape pipeline (scraper/pipeline.py): fetch/extract -> filter -> enrich -> sink
+PIPELINE_QUEUE_SIZE = 50  # Items waiting between two stages before the earlier one blocks
+ENRICH_WORKERS = 2  # Threads looking up office phones (each may hold a browser for a Google search)
+
+# Distributed mode (scripts/coordinator.py + scripts/worker.py): jobs shared through a leased queue
+SHARED_QUEUE_URL = os.getenv('SHARED_QUEUE_URL', 'sqlite:///cache/work_queue.db')
+WORKER_BROWSERS = int(os.getenv('WORKER_BROWSERS', '5'))  # Browsers per worker process
+WORK_LEASE_SECONDS = 120  # A leased job goes back to the queue if its worker stops renewing it this long
+WORK_MAX_ATTEMPTS = 3  # Leases a job may lose (worker died) before it is marked failed
+WORK_POLL_INTERVAL = 2  # Seconds between queue checks when there is nothing to lease
+
+# Scheduling: queued jobs are ordered by these scorers (scraper/scheduler.py); [] keeps discovery order
+SCHEDULER_SCORERS = ['newest']
+COMPANY_SCHEDULER_SCORERS = ['round_robin_company', 'newest']
+# Stop starting new jobs after this many seconds (None = no limit); highest-priority jobs run first
+SCRAPE_TIME_BUDGET = int(os.getenv('SCRAPE_TIME_BUDGET', '0')) or None
+
+# Hedged requests: a job running past the observed p95 is duplicated on an idle worker, first result wins
+ENABLE_HEDGING = False
+HEDGE_PERCENTILE = 95
+HEDGE_MIN_SAMPLES = 20  # Completed jobs needed before the percentile is trusted
+HEDGE_MAX_RATIO = 0.05  # At most this many hedges per job in the run
+HEDGE_CHECK_INTERVAL = 0.5  # Seconds between straggler checks
+
+# Performance report (per-stage timings) written next to the Excel output
+SAVE_TIMING_REPORT = True
 
 # Chrome options
 USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
 
+# Requests blocked in the browser (Network.setBlockedURLs wildcards), per kind of page
+REQUEST_BLOCKING = os.getenv('REQUEST_BLOCKING', 'true').lower() == 'true'
+BLOCK_COMMON = [
+    '*.woff', '*.woff2', '*.ttf', '*.otf', '*.eot',
+    '*.mp4', '*.webm', '*.mp3', '*.m3u8',
+    '*google-analytics.com*', '*googletagmanager.com*', '*doubleclick.net*', '*googlesyndication.com*',
+    '*googleadservices.com*', '*facebook.net*', '*connect.facebook.com*', '*hotjar.com*',
+    '*nr-data.net*', '*newrelic.com*', '*segment.io*', '*segment.com/analytics*', '*optimizely.com*',
+    '*bat.bing.com*', '*analytics.tiktok.com*', '*snap.licdn.com*', '*ads.linkedin.com*',
+    '*youtube.com/embed*', '*player.vimeo.com*',
+]
+BLOCK_PROFILES = {
+    # Seek's own API (/api/, /graphql) must stay reachable for network capture
+    'seek': BLOCK_COMMON + ['*tags.tiqcdn.com*', '*seek.com.au/static/ca-tracking*', '*braze.com*', '*appboy*'],
+    'google': BLOCK_COMMON + ['*/gen_204*', '*/client_204*', '*play.google.com/log*', '*apis.google.com*',
+                              '*ogs.google.com*', '*gstatic.com/og/*'],
+}
+MEASURE_PAGE_WEIGHT = True  # Record requests and bytes per page (Resource Timing) for the run summary
+
+# Keep each fetched job page (gzip, content-addressed) for offline re-extraction (scripts/reextract.py)
+ARCHIVE_HTML = os.getenv('ARCHIVE_HTML', 'false').lower() == 'true'
+HTML_ARCHIVE_DIR = os.path.join("cache", "html_archive")
+
+# On-disk cache of what was scraped from each job page (scraper/http_cache.py); fresh entries skip the browser
+HTTP_CACHE = os.getenv('HTTP_CACHE', 'false').lower() == 'true'
+HTTP_CACHE_DIR = os.path.join("cache", "http_cache")
+HTTP_CACHE_MAX_MB = 500  # Least recently used entries are evicted beyond this
+HTTP_CACHE_JOB_TTL = 24 * 3600  # Job ads rarely change within a day; 'Posted 3d ago' is re-aged on a hit
+
+# Company search results (job IDs per company) reused across runs by scripts/scrape_companies.py
+COMPANY_SEARCH_CACHE = os.getenv('COMPANY_SEARCH_CACHE', 'true').lower() == 'true'
+COMPANY_SEARCH_CACHE_FILE = os.path.join("cache", "company_search_cache.json")
+COMPANY_SEARCH_TTL = 12 * 3600  # Agencies post a handful of ICT roles a week
+
+# Advertiser profiles (scraper/advertiser_cache.py): skip jobs from advertisers that are always filtered out
+ADVERTISER_CACHE = os.getenv('ADVERTISER_CACHE', 'true').lower() == 'true'
+ADVERTISER_CACHE_FILE = os.path.join("cache", "advertiser_cache.json")
+ADVERTISER_CACHE_TTL = 7 * 24 * 3600  # After a week one job gets fetched again to refresh the decision
+ADVERTISER_MIN_CONFIDENCE = 2  # Excluded this many times in a row before their jobs are skipped
+
+# Link collection progress (scraper/frontier.py): a restarted run resumes the search walk where it stopped
+LINK_FRONTIER = os.getenv('LINK_FRONTIER', 'true').lower() == 'true'
+LINK_FRONTIER_FILE = os.path.join("cache", "link_frontier.json")
+LINK_FRONTIER_MAX_AGE = 60 * 60  # Older walks are discarded; new listings shift every page
+
 # Google enrichment settings
-ENABLE_GOOGLE_ENRICHMENT = True
+ENABLE_GOOGLE_ENRICHMENT = os.getenv('ENABLE_GOOGLE_ENRICHMENT', 'true').lower() == 'true'
 GOOGLE_SEARCH_DELAY = 3
 
 # Data columns
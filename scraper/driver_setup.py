@@ -1,9 +1,12 @@
 """WebDriver setup and configuration."""
 
 from selenium import webdriver
-from selenium.webdriver.chrome.service import Service
 from webdriver_manager.chrome import ChromeDriverManager
-from .config import USER_AGENT, PAGE_LOAD_TIMEOUT
+from .config import USER_AGENT, PAGE_LOAD_TIMEOUT, NAVIGATION_TIMEOUT, SCRIPT_TIMEOUT, CAPTURE_NETWORK
+from .stage_timer import stage_timer
+from .process_reaper import TrackedService
+from .network_capture import enable_performance_logging
+from .request_blocking import use_block_profile
 
 
 def create_chrome_options(headless=False):
@@ -49,11 +52,21 @@ def create_chrome_options(headless=False):
     return options
 
 
-def setup_driver(headless=False):
-    """Initialize and return a configured Selenium WebDriver instance."""
+@stage_timer.timed('driver.spawn')
+def setup_driver(headless=False, capture_network=CAPTURE_NETWORK):
+    """
+    Initialize and return a configured Selenium WebDriver instance.
+    
+    Args:
+        headless: Run Chrome without a window
+        capture_network: Record network events so Seek's API responses can be read (see network_capture)
+    """
     try:
         options = create_chrome_options(headless)
-        service = Service(ChromeDriverManager().install())
+        if capture_network:
+            enable_performance_logging(options)
+        # Own process group so the reaper can kill chromedriver and Chrome together
+        service = TrackedService(ChromeDriverManager().install())
         driver = webdriver.Chrome(service=service, options=options)
         
         # Execute CDP commands to hide webdriver property
@@ -61,9 +74,14 @@ def setup_driver(headless=False):
             "userAgent": USER_AGENT
         })
         driver.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
+        # Drop fonts, media, analytics and ad requests (see BLOCK_PROFILES)
+        use_block_profile(driver, 'seek')
         
         # Set implicit wait for faster performance
         driver.implicitly_wait(PAGE_LOAD_TIMEOUT)
+        # Bound navigation and scripts so a hung page raises instead of blocking forever
+        driver.set_page_load_timeout(NAVIGATION_TIMEOUT)
+        driver.set_script_timeout(SCRIPT_TIMEOUT)
         
         return driver
     except Exception as e:
@@ -0,0 +1,369 @@
+"""Local fixture Seek server for offline throughput benchmarks.
+
+Serves synthetic (or recorded) search-result pages and job detail pages that
+use the same data-automation markup the scraper's selectors expect, with
+configurable latency, error rate and page count. Point the scraper at it by
+setting SEEK_BASE_URL before importing the scraper package.
+
+Usage:
+    python -m scraper.fixture_server --port 8765 --total-jobs 300 --latency 0.2
+"""
+
+import argparse
+import html
+import json
+import os
+import random
+import re
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from threading import Thread
+from urllib.parse import urlparse, parse_qs
+
+FIRST_JOB_ID = 80000000
+
+SYNTHETIC_TITLES = [
+    'Software Engineer', 'Senior Developer', 'Data Analyst', 'DevOps Engineer',
+    'Business Analyst', 'IT Support Officer', 'Solutions Architect', 'QA Tester',
+    'Network Engineer', 'Project Manager',
+]
+SYNTHETIC_COMPANIES = [
+    ('Acme Software', '11-50 employees'),
+    ('Blue Gum Analytics', '51-200 employees'),
+    ('Yarra Digital', '201-500 employees'),
+    ('Southern Cross Systems', '1,001-5,000 employees'),
+    ('Hays Technology', ''),
+    ('Bayside Health IT', '501-1,000 employees'),
+    ('Koala Cloud', '1-10 employees'),
+    ('Robert Half', ''),
+]
+SYNTHETIC_WORK_TYPES = ['Full time', 'Full time', 'Full time', 'Part time', 'Contract/Temp', 'Casual/Vacation']
+SYNTHETIC_LOCATIONS = ['Melbourne VIC', 'Richmond, Melbourne VIC', 'Docklands, Melbourne VIC', 'Box Hill, Melbourne VIC']
+SYNTHETIC_SALARIES = ['$90,000 - $110,000 per year', '$120,000 - $140,000 + super', '', '$700 - $850 per day']
+
+
+def synthetic_job(job_id):
+    """Return the deterministic synthetic record for a job ID."""
+    rng = random.Random(job_id)
+    company, company_size = rng.choice(SYNTHETIC_COMPANIES)
+    contact = ''
+    if rng.random() < 0.4:
+        contact += f" Email careers{job_id % 97}@example.com.au for details."
+    if rng.random() < 0.3:
+        contact += f" Call 03 9{rng.randint(100, 999)} {rng.randint(1000, 9999)}."
+    return {
+        'id': job_id,
+        'title': rng.choice(SYNTHETIC_TITLES),
+        'company': company,
+        'company_size': company_size,
+        'location': rng.choice(SYNTHETIC_LOCATIONS),
+        'classification': 'Information & Communication Technology',
+        'work_type': rng.choice(SYNTHETIC_WORK_TYPES),
+        'salary': rng.choice(SYNTHETIC_SALARIES),
+        # Higher IDs are newer listings, as on Seek
+        'days_ago': max(0, 30 - (job_id - FIRST_JOB_ID) // 10),
+        'description': f"We are hiring. Visit https://www.acme{job_id % 13}.com.au to learn more.{contact}",
+    }
+
+
+def render_search_page(job_ids, page, total_pages, total_jobs, query=''):
+    """Render a search-results page for the given job IDs."""
+    cards = []
+    for job_id in job_ids:
+        job = synthetic_job(job_id)
+        cards.append(
+            f'<article data-card-type="JobCard" data-job-id="{job_id}">'
+            f'<a data-automation="jobTitle" data-card-tracking-control="true" '
+            f'href="/job/{job_id}?type=standard&amp;ref=search-standalone">{html.escape(job["title"])}</a>'
+            f'<a data-automation="jobCompany">{html.escape(job["company"])}</a>'
+            f'<span data-automation="jobListingDate">{job["days_ago"]}d ago</span>'
+            f'</article>'
+        )
+
+    params = f"&amp;{query}" if query else ''
+    if page < total_pages:
+        next_link = f'<a data-automation="page-next" aria-label="Next" href="?page={page + 1}{params}">Next</a>'
+    else:
+        next_link = '<span data-automation="page-next" aria-disabled="true">Next</span>'
+
+    if not job_ids:
+        results = '<div data-automation="noSearchResults">No matching search results</div>'
+    else:
+        results = '<div data-search-sol-meta="fixture">' + ''.join(cards) + '</div>'
+
+    return (
+        '<!DOCTYPE html><html><head><title>Fixture search</title></head><body>'
+        f'<h1><span data-automation="totalJobsCount">{total_jobs:,}</span> jobs</h1>'
+        f'{results}'
+        f'<nav aria-label="pagination">{next_link}</nav>'
+        '</body></html>'
+    )
+
+
+def render_job_page(job_id):
+    """Render a job detail page for a job ID."""
+    job = synthetic_job(job_id)
+    salary = f'<span data-automation="job-detail-salary">{html.escape(job["salary"])}</span>' if job['salary'] else ''
+    size = f'<span data-automation="company-size">{html.escape(job["company_size"])}</span>' if job['company_size'] else ''
+    return (
+        '<!DOCTYPE html><html><head><title>Fixture job</title></head><body>'
+        f'<h1 data-automation="job-detail-title">{html.escape(job["title"])}</h1>'
+        f'<span data-automation="advertiser-name">{html.escape(job["company"])}</span>'
+        f'<div data-automation="advertiser-profile">{size}</div>'
+        f'<span data-automation="job-detail-location">{html.escape(job["location"])}</span>'
+        f'<a data-automation="job-detail-classifications">{html.escape(job["classification"])}</a>'
+        f'<span data-automation="job-detail-work-type">{job["work_type"]}</span>'
+        f'{salary}'
+        f'<span data-automation="job-detail-date">Posted {job["days_ago"]}d ago</span>'
+        f'<div data-automation="jobAdDetails"><p>{html.escape(job["description"])}</p></div>'
+        '</body></html>'
+    )
+
+
+def render_search_payload(job_ids, total_jobs):
+    """Render the job search API response for a search page."""
+    data = []
+    for job_id in job_ids:
+        job = synthetic_job(job_id)
+        data.append({
+            'id': str(job_id),
+            'title': job['title'],
+            'advertiser': {'description': job['company']},
+            'companyName': job['company'],
+            'locations': [{'label': job['location']}],
+            'workTypes': [job['work_type']],
+            'listingDateDisplay': f"{job['days_ago']}d ago",
+        })
+    return {'data': data, 'totalCount': total_jobs}
+
+
+def render_job_payload(job_id):
+    """Render the job details GraphQL response for a job."""
+    job = synthetic_job(job_id)
+    size = {'description': job['company_size']} if job['company_size'] else None
+    return {'data': {'jobDetails': {
+        'job': {
+            'id': str(job_id),
+            'title': job['title'],
+            'advertiser': {'name': job['company']},
+            'location': {'label': job['location']},
+            'classifications': [{'label': job['classification']}],
+            'workTypes': {'label': job['work_type']},
+            'salary': {'label': job['salary']} if job['salary'] else None,
+            'listedAt': {'label': f"{job['days_ago']}d ago"},
+            'content': f"<p>{html.escape(job['description'])}</p>",
+        },
+        'companyProfile': {'size': size},
+    }}}
+
+
+class FixtureSite:
+    """Synthetic (or recorded) Seek site content, independent of any transport."""
+
+    def __init__(self, total_jobs=300, jobs_per_page=22, max_pages=25, fixture_dir=None, seed=0):
+        """
+        Args:
+            total_jobs: Number of jobs the search reports
+            jobs_per_page: Job cards per search page
+            max_pages: Pages exposed before pagination stops (Seek exposes ~25)
+            fixture_dir: Optional directory of recorded pages (search_page_<n>.html, job_<id>.html)
+            seed: Seed for the relevance ordering
+        """
+        self.total_jobs = total_jobs
+        self.jobs_per_page = jobs_per_page
+        self.max_pages = max_pages
+        self.fixture_dir = fixture_dir
+
+        self.job_ids = [FIRST_JOB_ID + i for i in range(total_jobs)]
+        self.relevance_order = list(self.job_ids)
+        random.Random(seed).shuffle(self.relevance_order)
+
+    def _read_recorded(self, name):
+        """Return a recorded page from fixture_dir, or None."""
+        if not self.fixture_dir:
+            return None
+        path = os.path.join(self.fixture_dir, name)
+        if os.path.exists(path):
+            with open(path, 'r', encoding='utf-8') as f:
+                return f.read()
+        return None
+
+    def _search_ids(self, page, sort_by_date):
+        """Return (job IDs on the page, total pages) for a search."""
+        ordered = sorted(self.job_ids, reverse=True) if sort_by_date else self.relevance_order
+        reachable = ordered[:self.jobs_per_page * self.max_pages]
+        total_pages = max(1, min(self.max_pages, -(-len(reachable) // self.jobs_per_page)))
+        start = (page - 1) * self.jobs_per_page
+        page_ids = reachable[start:start + self.jobs_per_page] if page <= total_pages else []
+        return page_ids, total_pages
+
+    def search_page(self, page, sort_by_date, query=''):
+        """Return the HTML for a search page."""
+        recorded = self._read_recorded(f"search_page_{page}.html")
+        if recorded is not None:
+            return recorded
+
+        page_ids, total_pages = self._search_ids(page, sort_by_date)
+        return render_search_page(page_ids, page, total_pages, self.total_jobs, query)
+
+    def job_page(self, job_id):
+        """Return the HTML for a job detail page."""
+        recorded = self._read_recorded(f"job_{job_id}.html")
+        if recorded is not None:
+            return recorded
+        return render_job_page(job_id)
+
+    def api_responses(self, url):
+        """
+        Return the JSON API calls Seek's frontend would make for a page (see network_capture).
+
+        Returns:
+            List of (request URL, JSON body text); empty for recorded pages and other URLs
+        """
+        parsed = urlparse(url)
+        params = parse_qs(parsed.query)
+        job_match = re.match(r'^/job/(\d+)', parsed.path)
+
+        if job_match:
+            job_id = int(job_match.group(1))
+            if self._read_recorded(f"job_{job_id}.html") is not None:
+                return []
+            return [('/graphql', json.dumps(render_job_payload(job_id)))]
+        if '-jobs' in parsed.path:
+            page = int(params.get('page', ['1'])[0])
+            if self._read_recorded(f"search_page_{page}.html") is not None:
+                return []
+            sort_by_date = params.get('sortmode', [''])[0] == 'ListedDate'
+            page_ids, _ = self._search_ids(page, sort_by_date)
+            api_url = f"/api/jobsearch/v5/search?siteKey=AU-Main&page={page}&pageSize={self.jobs_per_page}"
+            return [(api_url, json.dumps(render_search_payload(page_ids, self.total_jobs)))]
+        return []
+
+    def render(self, url):
+        """
+        Render any site URL (absolute, or path plus query string).
+
+        Returns:
+            Tuple of (http_status, html)
+        """
+        parsed = urlparse(url)
+        params = parse_qs(parsed.query)
+        job_match = re.match(r'^/job/(\d+)', parsed.path)
+
+        if job_match:
+            return 200, self.job_page(int(job_match.group(1)))
+        if '-jobs' in parsed.path:
+            page = int(params.get('page', ['1'])[0])
+            sort_by_date = params.get('sortmode', [''])[0] == 'ListedDate'
+            query = 'sortmode=ListedDate' if sort_by_date else ''
+            return 200, self.search_page(page, sort_by_date, query)
+        if parsed.path in ('', '/'):
+            return 200, '<html><body><h1>Fixture Seek</h1></body></html>'
+        return 404, '<html><body><h1>Not Found</h1></body></html>'
+
+
+class FixtureServer:
+    """Threaded HTTP server serving a FixtureSite with injected latency and errors."""
+
+    def __init__(self, host='127.0.0.1', port=0, total_jobs=300, jobs_per_page=22, max_pages=25,
+                 latency=0.0, latency_jitter=0.0, error_rate=0.0, fixture_dir=None, seed=0):
+        """
+        Args:
+            host: Interface to bind
+            port: Port to bind (0 picks a free port)
+            total_jobs: Number of jobs the search reports
+            jobs_per_page: Job cards per search page
+            max_pages: Pages exposed before pagination stops (Seek exposes ~25)
+            latency: Base delay added to every response (seconds)
+            latency_jitter: Extra random delay up to this many seconds
+            error_rate: Fraction of requests answered with HTTP 500
+            fixture_dir: Optional directory of recorded pages (search_page_<n>.html, job_<id>.html)
+            seed: Seed for the relevance ordering and the latency/error draws
+        """
+        self.site = FixtureSite(total_jobs, jobs_per_page, max_pages, fixture_dir, seed)
+        self.latency = latency
+        self.latency_jitter = latency_jitter
+        self.error_rate = error_rate
+        self.rng = random.Random(seed)
+        self.requests_served = 0
+        self.errors_served = 0
+
+        self.httpd = ThreadingHTTPServer((host, port), self._make_handler())
+        self.httpd.daemon_threads = True
+        self.thread = None
+
+    @property
+    def url(self):
+        """Base URL to use as SEEK_BASE_URL."""
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self):
+        """Start serving in a background thread."""
+        self.thread = Thread(target=self.httpd.serve_forever, daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self):
+        """Stop serving and release the port."""
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def _make_handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, format, *args):
+                pass
+
+            def _send(self, status, body):
+                data = body.encode('utf-8')
+                self.send_response(status)
+                self.send_header('Content-Type', 'text/html; charset=utf-8')
+                self.send_header('Content-Length', str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def do_GET(self):
+                delay = server.latency + server.rng.random() * server.latency_jitter
+                failed = server.rng.random() < server.error_rate
+                if delay:
+                    time.sleep(delay)
+
+                server.requests_served += 1
+                if failed:
+                    server.errors_served += 1
+                    self._send(500, '<html><body><h1>Internal Server Error</h1></body></html>')
+                    return
+
+                self._send(*server.site.render(self.path))
+
+        return Handler
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve synthetic Seek pages for offline benchmarks.")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--total-jobs', type=int, default=300)
+    parser.add_argument('--jobs-per-page', type=int, default=22)
+    parser.add_argument('--max-pages', type=int, default=25)
+    parser.add_argument('--latency', type=float, default=0.0)
+    parser.add_argument('--latency-jitter', type=float, default=0.0)
+    parser.add_argument('--error-rate', type=float, default=0.0)
+    parser.add_argument('--fixture-dir', default=None)
+    args = parser.parse_args()
+
+    server = FixtureServer(args.host, args.port, args.total_jobs, args.jobs_per_page, args.max_pages,
+                           args.latency, args.latency_jitter, args.error_rate, args.fixture_dir)
+    print(f"Fixture Seek server on {server.url} (SEEK_BASE_URL={server.url})")
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.httpd.server_close()
+
+
+if __name__ == "__main__":
+    main()
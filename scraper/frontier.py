@@ -0,0 +1,120 @@
+"""Persisted link collection progress, so a restarted run resumes the search walk instead of starting at page 1."""
+
+import json
+import os
+import time
+from threading import Lock
+from .config import LINK_FRONTIER_FILE, LINK_FRONTIER_MAX_AGE
+from .url_builder import extract_job_id
+from .shared_json import merge_into_file
+
+
+class LinkFrontier:
+    """
+    Pages fully harvested per search, with the jobs each one yielded.
+
+    Keyed by the search's first-page URL, so query shards are tracked
+    separately. A search is 'complete' once its walk ran out of pages. Entries
+    older than max_age (from their first harvested page) are dropped, since
+    the result order has moved on by then. Saved with merge_into_file.
+
+    Stored as:
+        {search_url: {'started_at', 'updated_at', 'complete',
+                      'pages': {page: {'harvested_at', 'jobs': [[job_id, url, company], ...]}}}}
+    """
+
+    def __init__(self, path=LINK_FRONTIER_FILE, max_age=LINK_FRONTIER_MAX_AGE):
+        self.path = path
+        self.max_age = max_age
+        self.lock = Lock()
+        self.searches = self._load()
+        self.changed = set()  # Searches recorded or dropped since the last save
+
+    def _load(self):
+        if os.path.exists(self.path):
+            try:
+                with open(self.path, 'r', encoding='utf-8') as f:
+                    return json.load(f)
+            except Exception as e:
+                print(f"WARNING: Error loading link frontier: {e}")
+        return {}
+
+    def _save(self):
+        """Write the changed searches to disk (caller holds the lock)."""
+        try:
+            self.searches = merge_into_file(self.path, self.searches, self.changed)
+            self.changed.clear()
+        except Exception as e:
+            print(f"WARNING: Error saving link frontier: {e}")
+
+    def _fresh(self, search_url):
+        """Return the state for a search if it is young enough to reuse, dropping it otherwise (caller holds the lock)."""
+        state = self.searches.get(search_url)
+        if state is not None and time.time() - state['started_at'] > self.max_age:
+            del self.searches[search_url]
+            self.changed.add(search_url)
+            state = None
+        return state
+
+    def replay(self, search_url, start_page=1, end_page=None):
+        """
+        Return the harvested pages a run can reuse instead of fetching.
+
+        Args:
+            search_url: First-page URL of the search
+            start_page: First page the run wants
+            end_page: Last page the run wants (None = no limit)
+
+        Returns:
+            Tuple (pages, next_page, complete): pages is a list of (page, [(url, company), ...])
+            for the consecutive harvested pages from start_page; next_page is the first page
+            still to fetch; complete is True if nothing is left to fetch
+        """
+        with self.lock:
+            state = self._fresh(search_url)
+            if state is None:
+                return [], start_page, False
+            pages = []
+            page = start_page
+            while str(page) in state['pages'] and (end_page is None or page <= end_page):
+                jobs = state['pages'][str(page)]['jobs']
+                pages.append((page, [(url, company) for _, url, company in jobs]))
+                page += 1
+            last_page = max((int(p) for p in state['pages']), default=0)
+            complete = (state['complete'] and page > last_page) or (end_page is not None and page > end_page)
+            return pages, page, complete
+
+    def record_page(self, search_url, page, jobs):
+        """
+        Mark a page as harvested.
+
+        Args:
+            search_url: First-page URL of the search
+            page: Page number
+            jobs: List of (url, company) found on the page
+        """
+        now = time.time()
+        with self.lock:
+            state = self._fresh(search_url)
+            if state is None:
+                state = self.searches[search_url] = {'started_at': now, 'complete': False, 'pages': {}}
+            state['pages'][str(page)] = {
+                'harvested_at': now,
+                'jobs': [[extract_job_id(url), url, company] for url, company in jobs],
+            }
+            state['updated_at'] = now
+            self.changed.add(search_url)
+            self._save()
+
+    def mark_complete(self, search_url):
+        """Record that the search walk reached its last page."""
+        with self.lock:
+            state = self._fresh(search_url)
+            if state is not None:
+                state['complete'] = True
+                self.changed.add(search_url)
+                self._save()
+
+
+# Global frontier shared by all collectors (and query shards)
+link_frontier = LinkFrontier()
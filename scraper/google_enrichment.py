@@ -4,8 +4,11 @@ import time
 import re
 from selenium.webdriver.common.by import By
 from selenium.webdriver.common.keys import Keys
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
+from .readiness import wait_for_element
+from .request_blocking import use_block_profile, measure_page_weight
+from .selector_registry import selector_registry
+
+GOOGLE_RESULTS_SELECTORS = ['#search', '#rso', '#botstuff']
 
 
 def search_google_business_phone(driver, company_name, location=''):
@@ -30,18 +33,20 @@ def search_google_business_phone(driver, company_name, location=''):
         query += " phone number"
         
         # Navigate to Google
+        use_block_profile(driver, 'google')
         driver.get("https://www.google.com")
-        time.sleep(0.5)  # Reduced from 1 second
         
         # Find search box and enter query
         try:
-            search_box = WebDriverWait(driver, 3).until(  # Reduced from 5 seconds
-                EC.presence_of_element_located((By.NAME, "q"))
-            )
+            if not wait_for_element(driver, '[name="q"]', 'google.search_box', replaces=0.5, timeout=3):
+                return ''
+            search_box = driver.find_element(By.NAME, "q")
             search_box.clear()
             search_box.send_keys(query)
             search_box.send_keys(Keys.RETURN)
-            time.sleep(1.5)  # Reduced from 2 seconds
+            # The results container only exists on the results page, not the homepage
+            wait_for_element(driver, GOOGLE_RESULTS_SELECTORS, 'google.results', replaces=1.5, timeout=5)
+            measure_page_weight(driver, 'google')
         except:
             return ''
         
@@ -59,22 +64,23 @@ def search_google_business_phone(driver, company_name, location=''):
             'a[href^="tel:"]',
         ]
         
-        for selector in phone_selectors:
-            try:
-                elements = driver.find_elements(By.CSS_SELECTOR, selector)
-                for element in elements:
-                    text = element.text.strip()
-                    if text and is_valid_phone_format(text):
-                        return clean_phone_number(text)
-                    
-                    # Check href attribute for tel: links
-                    href = element.get_attribute('href')
-                    if href and href.startswith('tel:'):
-                        phone = href.replace('tel:', '').strip()
-                        if is_valid_phone_format(phone):
-                            return clean_phone_number(phone)
-            except:
-                continue
+        def read_phone(selector):
+            for element in driver.find_elements(By.CSS_SELECTOR, selector):
+                text = element.text.strip()
+                if text and is_valid_phone_format(text):
+                    return clean_phone_number(text)
+                
+                # Check href attribute for tel: links
+                href = element.get_attribute('href')
+                if href and href.startswith('tel:'):
+                    phone = href.replace('tel:', '').strip()
+                    if is_valid_phone_format(phone):
+                        return clean_phone_number(phone)
+            return None
+        
+        phone = selector_registry.find_first('google.phone', phone_selectors, read_phone)
+        if phone is not None:
+            return phone
         
         # Try to extract from general page text as fallback
         try:
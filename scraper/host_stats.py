@@ -0,0 +1,164 @@
+"""Host CPU, memory and process-tree readings from /proc and cgroups (Linux), with safe fallbacks."""
+
+import os
+from threading import Lock
+
+_cpu_lock = Lock()
+_last_cpu_sample = None
+
+
+def _read_file(path):
+    try:
+        with open(path, 'r') as f:
+            return f.read()
+    except Exception:
+        return None
+
+
+def get_cpu_utilization():
+    """
+    Return host CPU utilisation (0.0-1.0) since the previous call.
+
+    Uses /proc/stat deltas; falls back to the 1-minute load average per core.
+    """
+    global _last_cpu_sample
+    stat = _read_file('/proc/stat')
+    if stat:
+        fields = [int(v) for v in stat.splitlines()[0].split()[1:]]
+        idle = fields[3] + (fields[4] if len(fields) > 4 else 0)
+        total = sum(fields)
+        with _cpu_lock:
+            previous = _last_cpu_sample
+            _last_cpu_sample = (idle, total)
+        if previous and total > previous[1]:
+            return 1.0 - (idle - previous[0]) / (total - previous[1])
+
+    try:
+        return os.getloadavg()[0] / (os.cpu_count() or 1)
+    except (AttributeError, OSError):
+        return 0.0
+
+
+def get_memory_info():
+    """
+    Return (total_bytes, available_bytes) for the host, honouring a cgroup memory limit.
+
+    Returns (0, 0) when memory information is not available.
+    """
+    total = available = 0
+    meminfo = _read_file('/proc/meminfo')
+    if meminfo:
+        values = {}
+        for line in meminfo.splitlines():
+            parts = line.split()
+            if len(parts) >= 2:
+                values[parts[0].rstrip(':')] = int(parts[1]) * 1024
+        total = values.get('MemTotal', 0)
+        available = values.get('MemAvailable', values.get('MemFree', 0))
+
+    # Containers: a cgroup v2 (or v1) limit is the real ceiling
+    limit = _read_file('/sys/fs/cgroup/memory.max') or _read_file('/sys/fs/cgroup/memory/memory.limit_in_bytes')
+    usage = _read_file('/sys/fs/cgroup/memory.current') or _read_file('/sys/fs/cgroup/memory/memory.usage_in_bytes')
+    if limit and usage and limit.strip().isdigit():
+        limit_bytes = int(limit.strip())
+        if 0 < limit_bytes < (total or limit_bytes + 1):
+            total = limit_bytes
+            available = min(available or limit_bytes, max(0, limit_bytes - int(usage.strip())))
+
+    return total, available
+
+
+def get_free_memory_fraction():
+    """Return available memory as a fraction of total (1.0 if unknown)."""
+    total, available = get_memory_info()
+    if not total:
+        return 1.0
+    return available / total
+
+
+def get_parent_map():
+    """Return {pid: parent_pid} for every process visible in /proc."""
+    parents = {}
+    try:
+        entries = os.listdir('/proc')
+    except OSError:
+        return parents
+    for entry in entries:
+        if not entry.isdigit():
+            continue
+        stat = _read_file(f'/proc/{entry}/stat')
+        if not stat:
+            continue
+        # The command name is in parentheses and may contain spaces
+        fields = stat[stat.rfind(')') + 2:].split()
+        if len(fields) > 1:
+            parents[int(entry)] = int(fields[1])
+    return parents
+
+
+def get_process_tree(pid, parent_map=None):
+    """Return pid plus all of its descendants (e.g. chromedriver and its Chrome processes)."""
+    if parent_map is None:
+        parent_map = get_parent_map()
+    children = {}
+    for child, parent in parent_map.items():
+        children.setdefault(parent, []).append(child)
+
+    tree, stack = [], [pid]
+    while stack:
+        current = stack.pop()
+        tree.append(current)
+        stack.extend(children.get(current, []))
+    return tree
+
+
+def get_rss_bytes(pid):
+    """Return the resident set size of a process in bytes (0 if it is gone)."""
+    statm = _read_file(f'/proc/{pid}/statm')
+    if not statm:
+        return 0
+    try:
+        return int(statm.split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (IndexError, ValueError, OSError):
+        return 0
+
+
+def get_tree_rss_bytes(pid, parent_map=None):
+    """Return the summed RSS of a process and all its descendants."""
+    return sum(get_rss_bytes(p) for p in get_process_tree(pid, parent_map))
+
+
+def get_process_group(pgid):
+    """Return the PIDs of every live process in a process group."""
+    members = []
+    try:
+        entries = os.listdir('/proc')
+    except OSError:
+        return members
+    for entry in entries:
+        if not entry.isdigit():
+            continue
+        stat = _read_file(f'/proc/{entry}/stat')
+        if not stat:
+            continue
+        fields = stat[stat.rfind(')') + 2:].split()
+        # fields: state, ppid, pgrp, ...; zombies are already dead
+        if len(fields) > 2 and fields[0] != 'Z' and int(fields[2]) == pgid:
+            members.append(int(entry))
+    return members
+
+
+def get_cmdline(pid):
+    """Return a process's command line as one string ('' if it is gone)."""
+    cmdline = _read_file(f'/proc/{pid}/cmdline')
+    return cmdline.replace('\0', ' ').strip() if cmdline else ''
+
+
+def get_process_start_time(pid):
+    """Return a process's start time in clock ticks since boot (None if it is gone)."""
+    stat = _read_file(f'/proc/{pid}/stat')
+    if not stat:
+        return None
+    fields = stat[stat.rfind(')') + 2:].split()
+    # starttime is field 22 of /proc/<pid>/stat, i.e. index 19 after the command name
+    return int(fields[19]) if len(fields) > 19 else None
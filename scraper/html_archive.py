@@ -0,0 +1,101 @@
+"""Compressed, content-addressed archive of fetched job pages for offline re-extraction."""
+
+import gzip
+import hashlib
+import json
+import os
+from datetime import datetime
+from threading import Lock
+from .config import HTML_ARCHIVE_DIR
+from .url_builder import extract_job_id
+
+
+class HtmlArchive:
+    """
+    Job page HTML stored once per distinct content, plus an index by job ID and fetch time.
+
+    Layout under root:
+        objects/<sha256[:2]>/<sha256>.html.gz   gzip-compressed page HTML
+        index.jsonl                             one line per fetch: job_id, url, sha256, fetched_at
+
+    A page fetched again unchanged only adds an index line.
+    """
+
+    def __init__(self, root=HTML_ARCHIVE_DIR):
+        self.root = root
+        self.index_file = os.path.join(root, "index.jsonl")
+        self.lock = Lock()
+
+    def _object_path(self, digest):
+        return os.path.join(self.root, "objects", digest[:2], f"{digest}.html.gz")
+
+    def store(self, job_url, html):
+        """
+        Archive a fetched page.
+
+        Args:
+            job_url: URL the page was fetched from
+            html: Page source
+
+        Returns:
+            SHA-256 hex digest of the HTML
+        """
+        data = html.encode('utf-8')
+        digest = hashlib.sha256(data).hexdigest()
+        path = self._object_path(digest)
+        if not os.path.exists(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp_path = f"{path}.{os.getpid()}.tmp"
+            with gzip.open(tmp_path, 'wb') as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+
+        entry = {
+            'job_id': extract_job_id(job_url),
+            'url': job_url,
+            'sha256': digest,
+            'fetched_at': datetime.now().isoformat(timespec='seconds'),
+        }
+        with self.lock:
+            with open(self.index_file, 'a', encoding='utf-8') as f:
+                f.write(json.dumps(entry) + "\n")
+        return digest
+
+    def load(self, digest):
+        """Return the archived HTML for a digest."""
+        with gzip.open(self._object_path(digest), 'rb') as f:
+            return f.read().decode('utf-8')
+
+    def iter_index(self):
+        """Yield every index entry in fetch order, skipping a torn last line."""
+        if not os.path.exists(self.index_file):
+            return
+        with open(self.index_file, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    yield json.loads(line)
+                except ValueError:
+                    continue
+
+    def latest(self, since=None):
+        """
+        Return the most recent fetch of each job.
+
+        Args:
+            since: Optional ISO timestamp; older fetches are ignored
+
+        Returns:
+            List of index entries, one per job ID
+        """
+        entries = {}
+        for entry in self.iter_index():
+            if since and entry['fetched_at'] < since:
+                continue
+            current = entries.get(entry['job_id'])
+            if current is None or entry['fetched_at'] >= current['fetched_at']:
+                entries[entry['job_id']] = entry
+        return list(entries.values())
+
+
+# Global archive used by scrape_job_details when ARCHIVE_HTML is on
+html_archive = HtmlArchive()
@@ -0,0 +1,192 @@
+"""On-disk cache of what was scraped from Seek job pages, with a TTL and LRU eviction."""
+
+import gzip
+import hashlib
+import json
+import os
+import re
+import time
+from threading import Lock
+from urllib.parse import urlparse, parse_qsl, urlencode
+from .config import BASE_URL, HTTP_CACHE_DIR, HTTP_CACHE_MAX_MB, HTTP_CACHE_JOB_TTL
+from .shared_json import merge_into_file
+
+# Query parameters that only track where a link was clicked from
+TRACKING_PARAMS = {'ref', 'origin', 'type', 'tracking', 'sol', 'searchrequesttoken', 'cid'}
+
+
+def canonical_url(url):
+    """Cache key for a URL: job pages by ID, other pages with tracking parameters dropped and the query sorted."""
+    job_match = re.search(r'/job/(\d+)', url or '')
+    if job_match:
+        return f"{BASE_URL}/job/{job_match.group(1)}"
+    parsed = urlparse(url)
+    query = sorted((k, v) for k, v in parse_qsl(parsed.query) if k.lower() not in TRACKING_PARAMS)
+    return f"{parsed.scheme}://{parsed.netloc}{parsed.path}" + (f"?{urlencode(query)}" if query else '')
+
+
+def ttl_for(url):
+    """Seconds an entry stays fresh: HTTP_CACHE_JOB_TTL for job ads, 0 (not cached) for anything else."""
+    if re.search(r'/job/\d+', url or ''):
+        return HTTP_CACHE_JOB_TTL
+    return 0
+
+
+class ResponseCache:
+    """
+    Bodies stored gzip-compressed under root, with an index of expiry and size.
+
+    The job scraper stores the record it extracted from each page, so fresh
+    entries are served without loading the page at all; stale ones count as
+    misses and are replaced when the page is fetched again. When the stored
+    bytes exceed max_bytes the least recently used entries are evicted.
+    The index is saved with merge_into_file.
+    """
+
+    def __init__(self, root=HTTP_CACHE_DIR, max_bytes=HTTP_CACHE_MAX_MB * 1024 * 1024):
+        self.root = root
+        self.index_file = os.path.join(root, "index.json")
+        self.max_bytes = max_bytes
+        self.lock = Lock()
+        self.index = self._load()
+        self.total_bytes = sum(entry['size'] for entry in self.index.values())
+        self.changed = set()  # Keys stored, used or dropped since the last save
+        self.stats = {'hits': 0, 'misses': 0, 'stores': 0, 'evictions': 0, 'bytes_saved': 0}
+
+    def _load(self):
+        if os.path.exists(self.index_file):
+            try:
+                with open(self.index_file, 'r', encoding='utf-8') as f:
+                    return json.load(f)
+            except Exception as e:
+                print(f"WARNING: Error loading HTTP cache index: {e}")
+        return {}
+
+    def save(self):
+        """Merge the changed index entries into the index file and adopt other processes' entries."""
+        with self.lock:
+            if not self.changed:
+                return
+            try:
+                self.index = merge_into_file(self.index_file, self.index, self.changed)
+                self.changed.clear()
+                self.total_bytes = sum(entry['size'] for entry in self.index.values())
+                # Entries from other processes can push the total over the cap; dropped on the next save
+                self._evict()
+            except Exception as e:
+                print(f"WARNING: Error saving HTTP cache index: {e}")
+
+    def _body_path(self, key):
+        digest = hashlib.sha256(key.encode('utf-8')).hexdigest()
+        return os.path.join(self.root, digest[:2], f"{digest}.gz")
+
+    def _read_body(self, key):
+        try:
+            with gzip.open(self._body_path(key), 'rb') as f:
+                return f.read().decode('utf-8')
+        except OSError:
+            return None
+
+    def _hit(self, key, entry, body):
+        """Caller holds the lock."""
+        entry['last_used'] = time.time()
+        self.changed.add(key)
+        self.stats['hits'] += 1
+        self.stats['bytes_saved'] += entry.get('page_bytes', entry['size'])
+        return body
+
+    def get(self, url):
+        """
+        Return the cached body for a URL if it is still fresh, else None (counted as a miss).
+        """
+        key = canonical_url(url)
+        with self.lock:
+            entry = self.index.get(key)
+            if entry is None or entry['expires_at'] <= time.time():
+                self.stats['misses'] += 1
+                return None
+        body = self._read_body(key)
+        with self.lock:
+            if body is None:
+                if self.index.pop(key, None):
+                    self.total_bytes -= entry['size']
+                    self.changed.add(key)
+                self.stats['misses'] += 1
+                return None
+            return self._hit(key, entry, body)
+
+    def put(self, url, body, ttl=None, page_bytes=None):
+        """
+        Store the body cached for a page.
+
+        Args:
+            url: Page URL (canonicalised for the key)
+            body: Text to serve for the URL (the job scraper stores a JSON record)
+            ttl: Seconds until stale (default: ttl_for(url)); 0 skips caching
+            page_bytes: Size of the page a hit saves loading (default: the body size)
+        """
+        ttl = ttl_for(url) if ttl is None else ttl
+        if not ttl or not body:
+            return
+        key = canonical_url(url)
+        data = body.encode('utf-8')
+        path = self._body_path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.{id(data)}.tmp"
+        with gzip.open(tmp_path, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+
+        now = time.time()
+        with self.lock:
+            previous = self.index.get(key)
+            if previous:
+                self.total_bytes -= previous['size']
+            self.total_bytes += len(data)
+            self.index[key] = {
+                'stored_at': now,
+                'expires_at': now + ttl,
+                'last_used': now,
+                'size': len(data),
+                'page_bytes': len(data) if page_bytes is None else page_bytes,
+            }
+            self.changed.add(key)
+            self.stats['stores'] += 1
+            self._evict()
+
+    def _evict(self):
+        """Drop least recently used entries until under max_bytes (caller holds the lock)."""
+        if self.total_bytes <= self.max_bytes:
+            return
+        for key, entry in sorted(self.index.items(), key=lambda item: item[1]['last_used']):
+            if self.total_bytes <= self.max_bytes:
+                break
+            try:
+                os.remove(self._body_path(key))
+            except OSError:
+                pass
+            self.total_bytes -= entry['size']
+            del self.index[key]
+            self.changed.add(key)
+            self.stats['evictions'] += 1
+
+    def get_report(self):
+        with self.lock:
+            stats = dict(self.stats)
+            stats['entries'] = len(self.index)
+            stats['stored_mb'] = round(self.total_bytes / 1024 / 1024, 1)
+        lookups = stats['hits'] + stats['misses']
+        stats['hit_rate'] = round(stats['hits'] / lookups, 3) if lookups else 0.0
+        return stats
+
+    def print_report(self):
+        stats = self.get_report()
+        if not stats['hits'] and not stats['misses']:
+            return
+        print(f"\nHTTP cache: {stats['hits']} hits / {stats['misses']} misses ({stats['hit_rate']:.0%}), "
+              f"{stats['bytes_saved'] / 1024 / 1024:.1f} MB of pages not reloaded")
+        print(f"  {stats['entries']} entries, {stats['stored_mb']} MB stored, {stats['evictions']} evicted")
+
+
+# Global cache shared by all workers
+response_cache = ResponseCache()
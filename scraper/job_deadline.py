@@ -0,0 +1,87 @@
+"""Hard per-job deadline: kill the browser of a job that runs too long."""
+
+from threading import Lock, Timer
+from .memory_watchdog import get_driver_pid
+from .process_reaper import kill_group
+
+
+class JobDeadlineExceeded(Exception):
+    """Raised when a job was aborted because it ran past its deadline."""
+
+
+class JobDeadline:
+    """
+    Timer armed around one job (navigation, extraction and enrichment).
+
+    When it fires, the job's browser is killed so whatever call the worker is
+    blocked in (driver.get, a wait, a script) fails straight away. The worker
+    then sees `expired` and raises JobDeadlineExceeded so the job can be
+    re-queued on a fresh browser. abort() does the same on demand (e.g. for
+    the losing copy of a hedged job) and sets `aborted` instead.
+    """
+
+    def __init__(self, seconds):
+        """
+        Args:
+            seconds: Deadline for the job (0 or None disables it)
+        """
+        self.seconds = seconds
+        self.lock = Lock()
+        self.driver = None
+        self.expired = False
+        self.aborted = False
+        self.finished = False
+        self.timer = None
+
+    def __enter__(self):
+        if self.seconds:
+            self.timer = Timer(self.seconds, self._expire)
+            self.timer.daemon = True
+            self.timer.start()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if self.timer:
+            self.timer.cancel()
+        # The worker may reuse this browser for its next job; never kill it after this point
+        with self.lock:
+            self.finished = True
+        return False
+
+    def watch(self, driver):
+        """Attach the job's browser (it may only exist after the timer started)."""
+        with self.lock:
+            self.driver = driver
+            stopped = self.expired or self.aborted
+        if stopped:
+            _kill_driver(driver)
+
+    def abort(self):
+        """Stop the job now by killing its browser (no-op once the job has finished)."""
+        # Kill under the lock so the job cannot finish (and reuse the browser) mid-kill
+        with self.lock:
+            if self.finished:
+                return
+            self.aborted = True
+            if self.driver is not None:
+                _kill_driver(self.driver)
+
+    def _expire(self):
+        with self.lock:
+            if self.finished:
+                return
+            self.expired = True
+            if self.driver is not None:
+                _kill_driver(self.driver)
+
+
+def _kill_driver(driver):
+    """Kill a browser's whole process group; fall back to quit() for drivers without one."""
+    pid = get_driver_pid(driver)
+    if pid is not None:
+        kill_group(pid, grace=0.5)
+    else:
+        try:
+            driver.quit()
+        except:
+            pass
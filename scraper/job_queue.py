@@ -0,0 +1,155 @@
+"""Bounded job queue between link collection and the scrape workers."""
+
+import heapq
+import json
+import os
+import time
+from collections import deque
+from threading import Condition
+from .config import WORK_QUEUE_SIZE
+
+
+class BoundedJobQueue:
+    """
+    Jobs waiting for a worker, with a fixed in-memory size.
+
+    Jobs come out in FIFO order, or by priority when a sort key is given (see
+    scheduler.build_priority). When the queue is full the producer (link
+    collection) blocks until the workers catch up - or, with a spill file, the
+    overflow is appended to disk and read back in order as space frees up, so
+    collection never stalls. Priority only applies among jobs held in memory.
+    """
+
+    def __init__(self, maxsize=WORK_QUEUE_SIZE, spill_file=None, priority=None):
+        """
+        Args:
+            maxsize: Jobs held in memory before put() blocks (or spills)
+            spill_file: Optional JSONL path for overflow; if None, put() blocks when full
+            priority: Optional callable job -> sort key; lower keys are taken first
+        """
+        self.maxsize = max(1, maxsize)
+        self.spill_file = spill_file
+        self.priority = priority
+        self.items = [] if priority else deque()
+        self.sequence = 0
+        self.condition = Condition()
+        self.closed = False
+
+        self.spilled = 0  # Items in the current spill file
+        self.unspilled = 0  # Items read back from it
+        self.total_spilled = 0
+        self.spill_offset = 0
+        self.max_depth = 0
+        self.blocked_seconds = 0.0
+
+        if spill_file and os.path.exists(spill_file):
+            os.remove(spill_file)
+
+    def __len__(self):
+        with self.condition:
+            return len(self.items) + self.spilled - self.unspilled
+
+    def put(self, item):
+        """
+        Add a job, blocking while the queue is full (unless spilling).
+
+        Returns:
+            False if the queue was closed before the job could be added
+        """
+        with self.condition:
+            if self.spill_file and (len(self.items) >= self.maxsize or self.spilled > self.unspilled):
+                # Keep FIFO order: once spilling, everything goes through the file until it drains
+                with open(self.spill_file, 'a', encoding='utf-8') as f:
+                    f.write(json.dumps(item) + "\n")
+                self.spilled += 1
+                self.total_spilled += 1
+                return True
+
+            if len(self.items) >= self.maxsize:
+                start = time.perf_counter()
+                while len(self.items) >= self.maxsize and not self.closed:
+                    self.condition.wait(timeout=1)
+                self.blocked_seconds += time.perf_counter() - start
+            if self.closed:
+                return False
+
+            self._push(item)
+            self.max_depth = max(self.max_depth, len(self.items))
+            self.condition.notify_all()
+            return True
+
+    def get(self, timeout=None):
+        """
+        Take the next job.
+
+        Args:
+            timeout: Seconds to wait for one (0 = don't wait, None = until one arrives or the queue closes)
+
+        Returns:
+            The job, or None if none arrived in time or the queue is closed and empty
+        """
+        with self.condition:
+            deadline = None if timeout is None else time.time() + timeout
+            while not self.items and not self._refill():
+                if self.closed:
+                    return None
+                remaining = None if deadline is None else deadline - time.time()
+                if remaining is not None and remaining <= 0:
+                    return None
+                self.condition.wait(timeout=remaining)
+            item = self._pop()
+            self._refill()
+            self.condition.notify_all()
+            return item
+
+    def _push(self, item):
+        if self.priority:
+            # The sequence number keeps equal-priority jobs in arrival order
+            heapq.heappush(self.items, (self.priority(item), self.sequence, item))
+            self.sequence += 1
+        else:
+            self.items.append(item)
+
+    def _pop(self):
+        if self.priority:
+            return heapq.heappop(self.items)[2]
+        return self.items.popleft()
+
+    def _refill(self):
+        """Move spilled jobs back into memory while there is room (caller holds the condition)."""
+        if self.spilled == self.unspilled:
+            return False
+        with open(self.spill_file, 'r', encoding='utf-8') as f:
+            f.seek(self.spill_offset)
+            while len(self.items) < self.maxsize and self.unspilled < self.spilled:
+                line = f.readline()
+                if not line:
+                    break
+                self._push(json.loads(line))
+                self.unspilled += 1
+            self.spill_offset = f.tell()
+        if self.unspilled == self.spilled:
+            os.remove(self.spill_file)
+            self.spilled = self.unspilled = self.spill_offset = 0
+        return bool(self.items)
+
+    def close(self):
+        """Mark the producer as finished (or stop it); blocked put() calls return False."""
+        with self.condition:
+            self.closed = True
+            self.condition.notify_all()
+
+    @property
+    def exhausted(self):
+        """True once the producer has finished and every job has been taken."""
+        with self.condition:
+            return self.closed and not self.items and self.spilled == self.unspilled
+
+    def get_stats(self):
+        """Return queue depth and backpressure figures for the run summary."""
+        with self.condition:
+            return {
+                'max_depth': self.max_depth,
+                'blocked_seconds': round(self.blocked_seconds, 1),
+                'spilled': self.total_spilled,
+            }
@@ -1,11 +1,20 @@
 """Job details scraping logic."""
 
+import json
+import re
 import time
 from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from .config import BRIEF_PAUSE, ELEMENT_WAIT_TIMEOUT, COLUMNS, RECRUITMENT_COMPANIES
+from .config import BRIEF_PAUSE, ELEMENT_WAIT_TIMEOUT, COLUMNS, RECRUITMENT_COMPANIES, CAPTURE_NETWORK, ARCHIVE_HTML, HTTP_CACHE, ADVERTISER_CACHE
+from .advertiser_cache import advertiser_cache
 from .extractors import extract_contact_info
+from .html_archive import html_archive
+from .http_cache import response_cache
+from .network_capture import get_job_details
+from .readiness import wait_for_element
+from .request_blocking import use_block_profile, measure_page_weight
+from .selector_registry import selector_registry
+from .stage_timer import stage_timer
+from .url_builder import extract_job_id
 
 
 def create_empty_job_data(job_url):
@@ -26,35 +35,48 @@ def create_empty_job_data(job_url):
     }
 
 
-def extract_text_by_selector(driver, selectors, default=''):
-    """Try multiple selectors and return the first successful text extraction."""
-    for selector in selectors:
-        try:
-            element = driver.find_element(By.CSS_SELECTOR, selector)
-            return element.text.strip()
-        except:
-            continue
-    return default
+def extract_text_by_selector(driver, selectors, default='', field=None):
+    """
+    Try multiple selectors and return the first successful text extraction.
+    
+    With a field name the selectors are tried in selector_registry order and the hit is recorded.
+    """
+    if field is None:
+        for selector in selectors:
+            try:
+                element = driver.find_element(By.CSS_SELECTOR, selector)
+                return element.text.strip()
+            except:
+                continue
+        return default
+    
+    text = selector_registry.find_first(
+        field, selectors, lambda selector: driver.find_element(By.CSS_SELECTOR, selector).text.strip()
+    )
+    return default if text is None else text
 
 
+@stage_timer.timed('extract.title')
 def extract_job_title(driver):
     """Extract job title from the page."""
     selectors = [
         'h1[data-automation="job-detail-title"]',
         'h1'
     ]
-    return extract_text_by_selector(driver, selectors, 'N/A')
+    return extract_text_by_selector(driver, selectors, 'N/A', field='job.title')
 
 
+@stage_timer.timed('extract.company')
 def extract_company(driver):
     """Extract company name from the page."""
     selectors = [
         '[data-automation="advertiser-name"]',
         'span[data-automation="advertiser-name"]'
     ]
-    return extract_text_by_selector(driver, selectors, 'N/A')
+    return extract_text_by_selector(driver, selectors, 'N/A', field='job.company')
 
 
+@stage_timer.timed('extract.company_size')
 def extract_company_size(driver):
     """Extract company size from the page."""
     try:
@@ -63,12 +85,11 @@ def extract_company_size(driver):
             'span[data-automation="company-size"]'
         ]
         
-        for selector in size_selectors:
-            try:
-                element = driver.find_element(By.CSS_SELECTOR, selector)
-                return element.text.strip()
-            except:
-                continue
+        element = selector_registry.find_first(
+            'job.company_size', size_selectors, lambda selector: driver.find_element(By.CSS_SELECTOR, selector)
+        )
+        if element is not None:
+            return element.text.strip()
         
         try:
             profile_elements = driver.find_elements(By.CSS_SELECTOR, '[data-automation="company-profile"] span, [data-automation="advertiser-profile"] span')
@@ -85,33 +106,37 @@ def extract_company_size(driver):
     return ''
 
 
+@stage_timer.timed('extract.location')
 def extract_location(driver):
     """Extract location from the page."""
     selectors = [
         '[data-automation="job-detail-location"]',
         'span[data-automation="job-detail-location"]'
     ]
-    return extract_text_by_selector(driver, selectors)
+    return extract_text_by_selector(driver, selectors, field='job.location')
 
 
+@stage_timer.timed('extract.classification')
 def extract_classification(driver):
     """Extract job classification from the page."""
     selectors = [
         '[data-automation="job-detail-classifications"]',
         'a[data-automation="job-detail-classifications"]'
     ]
-    return extract_text_by_selector(driver, selectors)
+    return extract_text_by_selector(driver, selectors, field='job.classification')
 
 
+@stage_timer.timed('extract.work_type')
 def extract_work_type(driver):
     """Extract work type from the page."""
     selectors = [
         '[data-automation="job-detail-work-type"]',
         'span[data-automation="job-detail-work-type"]'
     ]
-    return extract_text_by_selector(driver, selectors)
+    return extract_text_by_selector(driver, selectors, field='job.work_type')
 
 
+@stage_timer.timed('extract.salary')
 def extract_salary(driver):
     """Extract salary information from the page."""
     # Try listed salary first
@@ -119,7 +144,7 @@ def extract_salary(driver):
         '[data-automation="job-detail-salary"]',
         'span[data-automation="job-detail-salary"]'
     ]
-    salary = extract_text_by_selector(driver, selectors)
+    salary = extract_text_by_selector(driver, selectors, field='job.salary')
     
     if salary:
         return salary
@@ -138,6 +163,7 @@ def extract_salary(driver):
     return ''
 
 
+@stage_timer.timed('extract.time_posted')
 def extract_time_posted(driver):
     """Extract time posted from the page."""
     try:
@@ -156,8 +182,9 @@ def extract_time_posted(driver):
         '[data-automation="job-detail-date"]',
         'span[data-automation="job-detail-date"]'
     ]
-    return extract_text_by_selector(driver, selectors)
+    return extract_text_by_selector(driver, selectors, field='job.time_posted')
 
+@stage_timer.timed('extract.contact')
 def extract_contact_details(driver):
     """Extract contact information from job description."""
     try:
@@ -230,51 +257,182 @@ def is_large_company(company_size):
     return False
 
 
-def scrape_job_details(driver, job_url):
-    """Scrape all job details from a given job URL."""
+def extract_job_details(driver, job_url, api_job=None):
+    """
+    Extract and filter job details from the page already loaded in the driver.
+
+    Args:
+        driver: Selenium WebDriver instance
+        job_url: Job page URL
+        api_job: Optional fields parsed from the job's API payload (network_capture);
+            any field it lacks is read from the DOM
+
+    Returns:
+        Job data dict, or None if the job is filtered out
+    """
+    api_job = api_job or {}
+    
+    def field(name, extractor):
+        return api_job[name] if name in api_job else extractor(driver)
+    
     job_data = create_empty_job_data(job_url)
     
+    job_data['job_title'] = field('job_title', extract_job_title)
+    
+    job_data['work_type'] = field('work_type', extract_work_type)
+    if not is_permanent_role(job_data['work_type']):
+        return None
+    
+    job_data['company'] = field('company', extract_company)
+    if is_recruitment_company(job_data['company']):
+        if ADVERTISER_CACHE:
+            advertiser_cache.record(job_data['company'], recruiter=True)
+        return None
+    
+    company_size = field('company_size', extract_company_size)
+    large = is_large_company(company_size)
+    if ADVERTISER_CACHE:
+        advertiser_cache.record(job_data['company'], large=large, company_size=company_size)
+    if large:
+        return None
+    
+    job_data['location'] = field('location', extract_location)
+    job_data['classification'] = field('classification', extract_classification)
+    job_data['salary'] = field('salary', extract_salary)
+    job_data['time_posted'] = field('time_posted', extract_time_posted)
+    
+    if 'description' in api_job:
+        contact_info = extract_contact_info(api_job['description'])
+    else:
+        contact_info = extract_contact_details(driver)
+    job_data['email'] = contact_info['email']
+    job_data['phone'] = contact_info['phone']
+    job_data['website'] = contact_info['website']
+    
+    return job_data
+
+
+# "Posted 4d ago", "Posted 30m ago"; "30d+ ago" is open-ended and never re-aged
+POSTED_AGE_PATTERN = re.compile(r'(\d+)([mhd])(?!\+)(?=\s*ago)')
+POSTED_AGE_UNITS = {'m': 60, 'h': 3600, 'd': 86400}
+
+
+def age_time_posted(time_posted, elapsed):
+    """
+    Move a relative posting time forward by the seconds since it was read.
+    
+    Args:
+        time_posted: Text such as "Posted 4d ago"
+        elapsed: Seconds since the text was scraped
+    
+    Returns:
+        The text as it would read now, e.g. "Posted 5d ago" a day later; unchanged if not recognised
+    """
+    match = POSTED_AGE_PATTERN.search(time_posted or '')
+    if not match:
+        return time_posted
+    seconds = int(match.group(1)) * POSTED_AGE_UNITS[match.group(2)] + int(max(elapsed, 0))
+    if seconds < 3600:
+        age = f"{seconds // 60}m"
+    elif seconds < 86400:
+        age = f"{seconds // 3600}h"
+    else:
+        age = f"{seconds // 86400}d"
+    return time_posted[:match.start()] + age + time_posted[match.end():]
+
+
+def load_cached_job(job_url):
+    """
+    Look up the record extracted from a job page in the response cache.
+    
+    Returns:
+        (hit, job_data): job_data is None for a cached filtered job; hit is False on a miss
+    """
+    body = response_cache.get(job_url)
+    if body is None:
+        return False, None
     try:
-        driver.get(job_url)
-        time.sleep(BRIEF_PAUSE)
-        
-        # Wait for title to ensure page is loaded
-        try:
-            WebDriverWait(driver, ELEMENT_WAIT_TIMEOUT).until(
-                EC.presence_of_element_located((By.CSS_SELECTOR, 'h1[data-automation="job-detail-title"]'))
-            )
-        except:
-            pass
-        
-        job_data['job_title'] = extract_job_title(driver)
-        
-        job_data['work_type'] = extract_work_type(driver)
-        if not is_permanent_role(job_data['work_type']):
-            return None
+        record = json.loads(body)
+    except ValueError:
+        return False, None
+    job_data = record.get('job_data')
+    if job_data is not None:
+        job_data['time_posted'] = age_time_posted(job_data.get('time_posted', ''), time.time() - record['scraped_at'])
+    return True, job_data
+
+
+def store_cached_job(job_url, job_data, page_bytes):
+    """Cache the record extracted from a job page (None if it was filtered out)."""
+    record = {'scraped_at': time.time(), 'job_data': job_data}
+    response_cache.put(job_url, json.dumps(record, ensure_ascii=False), page_bytes=page_bytes)
+
+
+def scrape_job_details(driver, job_url, outcome=None, archive=ARCHIVE_HTML, use_cache=HTTP_CACHE):
+    """
+    Scrape all job details from a given job URL.
+    
+    Args:
+        driver: Selenium WebDriver instance
+        job_url: Job page URL
+        outcome: Optional dict; 'error' is set to 'timeout' or 'error' if the page failed
+        archive: Store the page HTML in html_archive for offline re-extraction
+        use_cache: Serve the job from the response cache when fresh, and store it after fetching
+    
+    Returns:
+        Job data dict (mostly empty on failure), or None if the job is filtered out
+    """
+    job_data = create_empty_job_data(job_url)
+    
+    try:
+        if use_cache:
+            with stage_timer.time('page.cache_lookup'):
+                hit, cached_job = load_cached_job(job_url)
+            if hit:
+                return cached_job
         
-        job_data['company'] = extract_company(driver)
-        if is_recruitment_company(job_data['company']):
-            return None
+        # The worker may have been on a Google page with the Google profile
+        use_block_profile(driver, 'seek')
+        with stage_timer.time('page.navigate'):
+            driver.get(job_url)
         
-        company_size = extract_company_size(driver)
-        if is_large_company(company_size):
-            return None
+        # The ad's API payload, if it has already arrived, makes the DOM wait unnecessary
+        api_job = get_job_details(driver, extract_job_id(job_url)) if CAPTURE_NETWORK else None
         
-        job_data['location'] = extract_location(driver)
-        job_data['classification'] = extract_classification(driver)
-        job_data['salary'] = extract_salary(driver)
-        job_data['time_posted'] = extract_time_posted(driver)
+        page_ready = api_job is not None
+        if api_job is None:
+            # Wait for title to ensure page is loaded
+            with stage_timer.time('page.title_wait'):
+                page_ready = wait_for_element(driver, 'h1[data-automation="job-detail-title"]', 'job.title',
+                                              replaces=BRIEF_PAUSE, timeout=ELEMENT_WAIT_TIMEOUT + BRIEF_PAUSE) is not None
+            if CAPTURE_NETWORK:
+                api_job = get_job_details(driver, extract_job_id(job_url))
+        measure_page_weight(driver, 'job')
+        html = None
+        if archive or use_cache:
+            with stage_timer.time('page.archive'):
+                try:
+                    html = driver.page_source
+                    if archive:
+                        html_archive.store(job_url, html)
+                except Exception as e:
+                    print(f"WARNING: Could not archive {job_url}: {e}")
         
-        contact_info = extract_contact_details(driver)
-        job_data['email'] = contact_info['email']
-        job_data['phone'] = contact_info['phone']
-        job_data['website'] = contact_info['website']
+        extracted = extract_job_details(driver, job_url, api_job)
+        # Never cache what was read from an error or half-loaded page for a day
+        if use_cache and page_ready and html is not None:
+            try:
+                store_cached_job(job_url, extracted, len(html.encode('utf-8')))
+            except Exception as e:
+                print(f"WARNING: Could not cache {job_url}: {e}")
+        return extracted
         
     except Exception as e:
         error_msg = str(e)
         if 'invalid session id' in error_msg.lower() or 'session' in error_msg.lower():
             raise
         else:
+            if outcome is not None:
+                outcome['error'] = 'timeout' if 'timeout' in type(e).__name__.lower() or 'timed out' in error_msg.lower() else 'error'
             print(f"Error scraping {job_url}: {e}")
     
-    return job_data
+    return job_data
\ No newline at end of file
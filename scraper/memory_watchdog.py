@@ -0,0 +1,143 @@
+"""Per-browser memory watchdog for long parallel runs."""
+
+import time
+from threading import Event, Lock, Thread
+from .host_stats import get_parent_map, get_tree_rss_bytes, get_free_memory_fraction
+from .config import MEMORY_WATCHDOG_INTERVAL, BROWSER_RSS_LIMIT_MB, WATCHDOG_MIN_FREE_MEMORY
+
+MB = 1024 * 1024
+
+
+def get_driver_pid(driver):
+    """Return the chromedriver PID behind a Selenium driver, or None."""
+    try:
+        return driver.service.process.pid
+    except AttributeError:
+        return None
+
+
+class MemoryWatchdog:
+    """
+    Samples the RSS of every tracked browser's process tree in a background thread.
+
+    A browser whose chromedriver + Chrome tree goes over BROWSER_RSS_LIMIT_MB is
+    flagged; workers check needs_recycle() between jobs and replace it. When
+    host (or container) free memory drops below WATCHDOG_MIN_FREE_MEMORY, the
+    concurrency controller is asked to shrink.
+    """
+
+    def __init__(self, get_drivers, controller=None, limit_mb=BROWSER_RSS_LIMIT_MB,
+                 interval=MEMORY_WATCHDOG_INTERVAL, min_free_memory=WATCHDOG_MIN_FREE_MEMORY):
+        """
+        Args:
+            get_drivers: Callable returning a snapshot list of the drivers to watch
+            controller: Optional AdaptiveConcurrencyController to shrink under memory pressure
+            limit_mb: Per-browser RSS threshold that triggers recycling
+            interval: Seconds between samples
+            min_free_memory: Free memory fraction below which concurrency is lowered
+        """
+        self.get_drivers = get_drivers
+        self.controller = controller
+        self.limit_bytes = limit_mb * MB
+        self.interval = interval
+        self.min_free_memory = min_free_memory
+
+        self.lock = Lock()
+        self.stop_event = Event()
+        self.thread = None
+        self.flagged = set()
+        self.browser_stats = {}  # pid -> {'peak': bytes, 'total': bytes, 'samples': n}
+        self.recycles = 0
+        self.pressure_events = 0
+        self.last_pressure_at = 0.0
+
+    def start(self):
+        """Start sampling in a daemon thread."""
+        self.thread = Thread(target=self._run, name="memory-watchdog", daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self):
+        """Stop sampling."""
+        self.stop_event.set()
+        if self.thread:
+            self.thread.join(timeout=self.interval + 1)
+
+    def _run(self):
+        while not self.stop_event.wait(self.interval):
+            try:
+                self.sample()
+            except Exception as e:
+                print(f"  WARNING: Memory watchdog sample failed: {e}")
+
+    def sample(self):
+        """Take one RSS sample of every tracked browser and check host memory."""
+        parent_map = get_parent_map()
+        for driver in self.get_drivers():
+            pid = get_driver_pid(driver)
+            if pid is None:
+                continue
+            rss = get_tree_rss_bytes(pid, parent_map)
+            if not rss:
+                continue
+            with self.lock:
+                stats = self.browser_stats.setdefault(pid, {'peak': 0, 'total': 0, 'samples': 0})
+                stats['peak'] = max(stats['peak'], rss)
+                stats['total'] += rss
+                stats['samples'] += 1
+                if rss > self.limit_bytes and pid not in self.flagged:
+                    self.flagged.add(pid)
+                    print(f"  [Memory] Browser {pid} at {rss / MB:.0f} MB (limit {self.limit_bytes / MB:.0f} MB) - will recycle")
+
+        free = get_free_memory_fraction()
+        # At most one shrink per few samples so the pool has time to react
+        if free < self.min_free_memory and time.time() - self.last_pressure_at > self.interval * 3:
+            self.last_pressure_at = time.time()
+            self.pressure_events += 1
+            print(f"  [Memory] Host free memory at {free * 100:.0f}% - lowering concurrency")
+            if self.controller is not None:
+                self.controller.shrink('memory pressure')
+
+    def needs_recycle(self, driver):
+        """True if this driver's browser has gone over the RSS threshold."""
+        pid = get_driver_pid(driver)
+        with self.lock:
+            return pid in self.flagged
+
+    def forget(self, driver, recycled=False):
+        """Stop tracking a driver that has been quit (its stats stay in the report)."""
+        pid = get_driver_pid(driver)
+        with self.lock:
+            self.flagged.discard(pid)
+            if recycled:
+                self.recycles += 1
+
+    def get_report(self):
+        """Return peak and average memory per browser over the run."""
+        with self.lock:
+            stats = [s for s in self.browser_stats.values() if s['samples']]
+            recycles = self.recycles
+            pressure_events = self.pressure_events
+        if not stats:
+            return {'browsers': 0, 'recycles': recycles, 'pressure_events': pressure_events}
+        averages = [s['total'] / s['samples'] for s in stats]
+        return {
+            'browsers': len(stats),
+            'peak_mb': round(max(s['peak'] for s in stats) / MB, 1),
+            'mean_peak_mb': round(sum(s['peak'] for s in stats) / len(stats) / MB, 1),
+            'average_mb': round(sum(averages) / len(averages) / MB, 1),
+            'recycles': recycles,
+            'pressure_events': pressure_events,
+        }
+
+    def print_report(self):
+        """Print the per-browser memory summary."""
+        report = self.get_report()
+        print("\nBrowser memory:")
+        if not report['browsers']:
+            print("  No memory samples recorded")
+        else:
+            print(f"  Browsers sampled: {report['browsers']}")
+            print(f"  Peak per browser: {report['peak_mb']} MB (mean of peaks: {report['mean_peak_mb']} MB)")
+            print(f"  Average per browser: {report['average_mb']} MB")
+        print(f"  Recycled over {self.limit_bytes / MB:.0f} MB: {report['recycles']} | Memory pressure events: {report['pressure_events']}")
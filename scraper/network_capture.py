@@ -0,0 +1,251 @@
+"""Read Seek's own JSON API responses from Chrome's network log instead of the rendered DOM.
+
+Seek's search page fetches its results from the job search API and the job
+page fetches the ad from GraphQL. With CAPTURE_NETWORK on, setup_driver turns
+on Chrome's performance log; after each navigation the matching responses are
+pulled out of the log, their bodies fetched over CDP and parsed into the same
+fields the DOM extractors produce. Anything the payload lacks (or a page whose
+payload was not captured) falls back to DOM extraction.
+"""
+
+import base64
+import html
+import json
+import re
+import weakref
+from threading import Lock
+from urllib.parse import urlparse, parse_qs
+from .config import BASE_URL
+
+SEARCH_API_PATTERN = re.compile(r'/api/(?:jobsearch|chalice-search)/v\d+/search')
+JOB_API_PATTERN = re.compile(r'/graphql')
+
+# Seek's search API page size, used when the request URL does not say
+DEFAULT_PAGE_SIZE = 22
+
+
+def enable_performance_logging(options):
+    """Ask Chrome to record network events in the 'performance' log."""
+    options.set_capability('goog:loggingPrefs', {'performance': 'ALL'})
+    return options
+
+
+def _page_number(url):
+    params = parse_qs(urlparse(url or '').query)
+    try:
+        return int(params.get('page', ['1'])[0])
+    except ValueError:
+        return 1
+
+
+def _first(value, *keys):
+    """Follow nested keys/indexes, returning None as soon as one is missing."""
+    for key in keys:
+        if isinstance(value, dict):
+            value = value.get(key)
+        elif isinstance(value, list) and isinstance(key, int) and len(value) > key:
+            value = value[key]
+        else:
+            return None
+        if value is None:
+            return None
+    return value
+
+
+def html_to_text(content):
+    """Flatten an ad's HTML body to text for the contact extractors."""
+    text = re.sub(r'<(?:br|/p|/li|/div)[^>]*>', '\n', content or '', flags=re.IGNORECASE)
+    return html.unescape(re.sub(r'<[^>]+>', ' ', text))
+
+
+def parse_search_payload(payload, request_url=''):
+    """
+    Parse a job search API response.
+
+    Args:
+        payload: Decoded JSON body
+        request_url: URL the payload was fetched from (carries page and pageSize)
+
+    Returns:
+        Dict with 'jobs' (list of {'url', 'company'}), 'total', 'page' and 'has_next',
+        or None if the payload is not a search result
+    """
+    if not isinstance(payload, dict) or not isinstance(payload.get('data'), list):
+        return None
+
+    jobs = []
+    for item in payload['data']:
+        job_id = str(item.get('id', '')).strip()
+        if not job_id.isdigit():
+            continue
+        company = (item.get('companyName') or _first(item, 'advertiser', 'description') or '').strip()
+        jobs.append({'url': f"{BASE_URL}/job/{job_id}", 'company': company})
+
+    params = parse_qs(urlparse(request_url).query)
+    page = _page_number(request_url)
+    try:
+        page_size = int(params.get('pageSize', [DEFAULT_PAGE_SIZE])[0])
+    except ValueError:
+        page_size = DEFAULT_PAGE_SIZE
+    total = payload.get('totalCount')
+    if not isinstance(total, int):
+        total = None
+    has_next = None
+    if total is not None:
+        has_next = bool(jobs) and page * page_size < total
+
+    return {'jobs': jobs, 'total': total, 'page': page, 'has_next': has_next}
+
+
+def parse_job_payload(payload):
+    """
+    Parse a job details GraphQL response.
+
+    Returns:
+        Dict with 'job_id' and whichever of job_title, company, company_size, location,
+        classification, work_type, salary, time_posted and description were present,
+        or None if the payload is not a job ad
+    """
+    details = _first(payload, 'data', 'jobDetails')
+    job = _first(details, 'job')
+    if not isinstance(job, dict) or not job.get('id'):
+        return None
+
+    time_posted = _first(job, 'listedAt', 'label') or ''
+    if time_posted and not time_posted.lower().startswith('posted'):
+        time_posted = f"Posted {time_posted}"
+
+    fields = {
+        'job_id': str(job['id']),
+        'job_title': job.get('title'),
+        'company': _first(job, 'advertiser', 'name'),
+        # An explicit null means "not listed", so the DOM need not be searched for it
+        'company_size': _first(details, 'companyProfile', 'size', 'description')
+                        or ('' if isinstance(details.get('companyProfile'), dict) else None),
+        'location': _first(job, 'location', 'label'),
+        'classification': _first(job, 'classifications', 0, 'label'),
+        'work_type': _first(job, 'workTypes', 'label'),
+        'salary': _first(job, 'salary', 'label') or ('' if 'salary' in job else None),
+        'time_posted': time_posted,
+        'description': html_to_text(job['content']) if job.get('content') else None,
+    }
+    return {key: value.strip() if isinstance(value, str) else value
+            for key, value in fields.items() if value is not None}
+
+
+class NetworkCapture:
+    """Parsed API payloads seen by one browser, newest search page and job ads by ID."""
+
+    def __init__(self):
+        self.search = None
+        self.jobs = {}
+
+    def poll(self, driver):
+        """Drain the browser's performance log and parse any Seek API responses in it."""
+        try:
+            entries = driver.get_log('performance')
+        except:
+            return
+        for entry in entries:
+            try:
+                message = json.loads(entry['message'])['message']
+            except (KeyError, TypeError, ValueError):
+                continue
+            if message.get('method') != 'Network.responseReceived':
+                continue
+            response = message['params'].get('response', {})
+            url = response.get('url', '')
+            is_search = bool(SEARCH_API_PATTERN.search(url))
+            if not is_search and not JOB_API_PATTERN.search(url):
+                continue
+            if 'json' not in response.get('mimeType', 'json'):
+                continue
+
+            payload = _response_json(driver, message['params'].get('requestId'))
+            if payload is None:
+                continue
+            if is_search:
+                parsed = parse_search_payload(payload, url)
+                if parsed is not None:
+                    self.search = parsed
+            else:
+                parsed = parse_job_payload(payload)
+                if parsed is not None:
+                    self.jobs[parsed['job_id']] = parsed
+
+
+def _response_json(driver, request_id):
+    """Fetch and decode a response body over CDP (None if it is gone or not JSON)."""
+    try:
+        result = driver.execute_cdp_cmd('Network.getResponseBody', {'requestId': request_id})
+        body = result.get('body', '')
+        if result.get('base64Encoded'):
+            body = base64.b64decode(body).decode('utf-8')
+        return json.loads(body)
+    except:
+        return None
+
+
+captures = weakref.WeakKeyDictionary()
+captures_lock = Lock()
+
+
+def get_capture(driver):
+    """Return the NetworkCapture for a browser, creating it on first use."""
+    with captures_lock:
+        capture = captures.get(driver)
+        if capture is None:
+            capture = captures[driver] = NetworkCapture()
+        return capture
+
+
+def get_search_results(driver):
+    """
+    Return the parsed search payload for the page the browser is on.
+
+    Returns:
+        Dict as from parse_search_payload, or None if that page's payload was not captured
+    """
+    capture = get_capture(driver)
+    capture.poll(driver)
+    search = capture.search
+    # A payload for another page means this page's request has not been seen
+    if search is None or search['page'] != _page_number(driver.current_url):
+        return None
+    return search
+
+
+def get_job_details(driver, job_id):
+    """Return (and forget) the parsed GraphQL payload for a job, or None if it was not captured."""
+    capture = get_capture(driver)
+    capture.poll(driver)
+    return capture.jobs.pop(str(job_id), None)
+
+
+def load_har(path):
+    """
+    Read a HAR recording (e.g. saved from Chrome DevTools) as fixtures for FakeDriver.
+
+    Returns:
+        Tuple (pages, responses): pages maps URL -> HTML for document responses; responses
+        maps page URL -> list of (request URL, JSON body text) for the API calls it made
+    """
+    with open(path, 'r', encoding='utf-8') as f:
+        log = json.load(f)['log']
+
+    page_urls = {page['id']: page.get('title', '') for page in log.get('pages', [])}
+    pages = {}
+    responses = {}
+    for entry in log.get('entries', []):
+        url = entry['request']['url']
+        content = entry.get('response', {}).get('content', {})
+        text = content.get('text', '')
+        if content.get('encoding') == 'base64':
+            text = base64.b64decode(text).decode('utf-8')
+        mime_type = content.get('mimeType', '')
+        if 'html' in mime_type:
+            pages[url] = text
+        elif 'json' in mime_type:
+            page_url = page_urls.get(entry.get('pageref'), '')
+            responses.setdefault(page_url, []).append((url, text))
+    return pages, responses
@@ -1,18 +1,23 @@
 """Page parsing logic for Seek website."""
 
 import re
-import time
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-from .config import ELEMENT_WAIT_TIMEOUT, PAGINATION_SCROLL
+from .config import ELEMENT_WAIT_TIMEOUT, PAGINATION_SCROLL, PAGE_LOAD_TIMEOUT, CAPTURE_NETWORK
+from .network_capture import get_search_results
+from .readiness import wait_for_element, wait_for_url_change
+from .selector_registry import selector_registry
 
 
 def get_total_jobs(driver):
     """Extract and return the total number of job postings available."""
+    if CAPTURE_NETWORK:
+        search = get_search_results(driver)
+        if search and search['total'] is not None:
+            return search['total']
+    
     try:
-        time.sleep(1)
-        
         # Try multiple selectors for job count
         selectors = [
             '[data-automation="totalJobsCount"]',
@@ -20,17 +25,18 @@ def get_total_jobs(driver):
             '.yvsb870',
             'strong[data-automation="totalJobsCount"]'
         ]
+        wait_for_element(driver, selectors, 'results.count', replaces=1, timeout=1 + ELEMENT_WAIT_TIMEOUT)
         
-        for selector in selectors:
-            try:
-                element = WebDriverWait(driver, ELEMENT_WAIT_TIMEOUT).until(
-                    EC.presence_of_element_located((By.CSS_SELECTOR, selector))
-                )
-                total_text = element.text.replace(',', '').strip()
-                if total_text.isdigit():
-                    return int(total_text)
-            except:
-                continue
+        def read_count(selector):
+            element = WebDriverWait(driver, ELEMENT_WAIT_TIMEOUT).until(
+                EC.presence_of_element_located((By.CSS_SELECTOR, selector))
+            )
+            total_text = element.text.replace(',', '').strip()
+            return int(total_text) if total_text.isdigit() else None
+        
+        total = selector_registry.find_first('results.count', selectors, read_count)
+        if total is not None:
+            return total
         
         # Fallback: regex search in page source
         page_source = driver.page_source
@@ -52,47 +58,83 @@ def get_total_jobs(driver):
 
 def get_job_links_on_page(driver):
     """Extract all job links from the current page."""
+    if CAPTURE_NETWORK:
+        search = get_search_results(driver)
+        if search and search['jobs']:
+            return [job['url'] for job in search['jobs']]
+    
     job_links = []
     try:
-        time.sleep(0.5)
-        
         selectors = [
             'a[data-automation="jobTitle"]',
             '[data-automation="jobTitle"]',
             'a[data-card-tracking-control="true"]',
             'article a[href*="/job/"]'
         ]
+        wait_for_element(driver, selectors, 'results.cards', replaces=0.5, timeout=0.5 + ELEMENT_WAIT_TIMEOUT)
         
-        for selector in selectors:
-            try:
-                job_cards = WebDriverWait(driver, ELEMENT_WAIT_TIMEOUT).until(
-                    EC.presence_of_all_elements_located((By.CSS_SELECTOR, selector))
-                )
-                if job_cards:
-                    for card in job_cards:
-                        try:
-                            link = card.get_attribute('href')
-                            if link and '/job/' in link:
-                                job_links.append(link)
-                        except:
-                            continue
-                    if job_links:
-                        return job_links
-            except:
-                continue
+        def read_links(selector):
+            job_cards = WebDriverWait(driver, ELEMENT_WAIT_TIMEOUT).until(
+                EC.presence_of_all_elements_located((By.CSS_SELECTOR, selector))
+            )
+            links = []
+            for card in job_cards:
+                try:
+                    link = card.get_attribute('href')
+                    if link and '/job/' in link:
+                        links.append(link)
+                except:
+                    continue
+            return links or None
         
+        job_links = selector_registry.find_first('results.links', selectors, read_links) or []
         return job_links
     except Exception as e:
         print(f"Error retrieving job links: {e}")
         return []
 
 
+def get_job_cards_on_page(driver):
+    """
+    Extract job links from the current page together with the advertiser on each card.
+    
+    Returns:
+        List of {'url', 'company'} dicts in page order ('company' is '' if the card shows none)
+    """
+    if CAPTURE_NETWORK:
+        search = get_search_results(driver)
+        if search and search['jobs']:
+            return [dict(job) for job in search['jobs']]
+    
+    links = get_job_links_on_page(driver)
+    if not links:
+        return []
+    
+    companies = {}
+    try:
+        # Cards without an advertiser would otherwise each cost a full implicit wait
+        driver.implicitly_wait(0)
+        for article in driver.find_elements(By.CSS_SELECTOR, 'article'):
+            try:
+                titles = article.find_elements(By.CSS_SELECTOR, '[data-automation="jobTitle"]')
+                names = article.find_elements(By.CSS_SELECTOR, '[data-automation="jobCompany"]')
+                if titles and names:
+                    companies[titles[0].get_attribute('href')] = names[0].text.strip()
+            except:
+                continue
+    except Exception as e:
+        print(f"Error reading job cards: {e}")
+    finally:
+        driver.implicitly_wait(PAGE_LOAD_TIMEOUT)
+    
+    return [{'url': link, 'company': companies.get(link, '')} for link in links]
+
+
 def click_next_page(driver):
     """Click the next page button. Returns True if successful, False otherwise."""
     try:
         # Scroll to bottom to ensure pagination is visible
         driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-        time.sleep(PAGINATION_SCROLL)
         
         # Try multiple selectors for the next button
         next_selectors = [
@@ -101,22 +143,30 @@ def click_next_page(driver):
             'a[aria-label="Next"]',
             'nav[aria-label="pagination"] a:last-child'
         ]
-        
-        for selector in next_selectors:
+        # Replaces the old scroll pause; a slow render still gets the per-selector waits
+        # below before this counts as the last page
+        wait_for_element(driver, next_selectors, 'pagination.button', replaces=PAGINATION_SCROLL, timeout=PAGINATION_SCROLL)
+
+        missed = []
+        for selector in selector_registry.order('pagination.next', next_selectors):
             try:
                 next_button = WebDriverWait(driver, 1).until(
                     EC.element_to_be_clickable((By.CSS_SELECTOR, selector))
                 )
+                selector_registry.record('pagination.next', missed, selector)
+                missed = []
                 
                 # Check if button is not disabled
                 if next_button.get_attribute('aria-disabled') == 'true':
                     return False
                 
                 # Click using JavaScript to avoid interception issues
+                old_url = driver.current_url
                 driver.execute_script("arguments[0].click();", next_button)
                 
-                # Wait for page to transition or stabilize
-                time.sleep(PAGINATION_SCROLL * 1.5)
+                # Wait for the page to transition (pagination changes the URL)
+                wait_for_url_change(driver, old_url, 'pagination.url', replaces=PAGINATION_SCROLL * 1.5,
+                                    timeout=PAGINATION_SCROLL * 1.5 + ELEMENT_WAIT_TIMEOUT)
                 
                 # Extra safety: wait for job links to be visible or at least page to respond
                 try:
@@ -129,8 +179,10 @@ def click_next_page(driver):
                 
                 return True
             except:
+                missed.append(selector)
                 continue
         
+        selector_registry.record('pagination.next', missed)
         return False
         
     except Exception as e:
@@ -7,12 +7,10 @@ from .driver_setup import setup_driver
 from .job_scraper import scrape_job_details, create_empty_job_data
 from .google_enrichment import search_google_business_phone
 from .config import COLUMNS, ENABLE_GOOGLE_ENRICHMENT
-from .phone_cache import PhoneCache
+from .phone_cache import phone_cache
 
 # Thread-safe lock for data collection
 data_lock = Lock()
-# Persistent cache for company phone numbers
-phone_cache = PhoneCache()
 
 
 def scrape_job_parallel(job_url, job_num, total_jobs, headless=True):
@@ -4,17 +4,23 @@ import json
 import os
 from threading import Lock
 from datetime import datetime
+from .shared_json import merge_into_file
 
 CACHE_FILE = os.path.join("cache", "company_phone_cache.json")
 cache_lock = Lock()
 
 
 class PhoneCache:
-    """Thread-safe persistent phone number cache."""
+    """
+    Thread-safe persistent phone number cache.
+    
+    Saved with merge_into_file.
+    """
     
     def __init__(self, cache_file=CACHE_FILE):
         self.cache_file = cache_file
         self.cache = self._load_cache()
+        self.changed = set()  # Companies set since the last save
     
     def _load_cache(self):
         """Load cache from disk."""
@@ -30,10 +36,12 @@ class PhoneCache:
         return {}
     
     def _save_cache(self):
-        """Save cache to disk."""
+        """Merge this process's new entries into the cache file (caller holds cache_lock)."""
+        if not self.changed:
+            return
         try:
-            with open(self.cache_file, 'w', encoding='utf-8') as f:
-                json.dump(self.cache, f, indent=2, ensure_ascii=False)
+            self.cache = merge_into_file(self.cache_file, self.cache, self.changed, indent=2, ensure_ascii=False)
+            self.changed.clear()
         except Exception as e:
             print(f"WARNING: Error saving cache: {e}")
     
@@ -53,6 +61,7 @@ class PhoneCache:
                 'location': location,
                 'cached_at': datetime.now().isoformat()
             }
+            self.changed.add(company_name)
             self._save_cache()
     
     def has(self, company_name):
@@ -73,11 +82,14 @@ class PhoneCache:
     
     def load(self):
         """Reload cache from disk (for compatibility)."""
-        self.cache = self._load_cache()
+        with cache_lock:
+            self.cache = self._load_cache()
+            self.changed.clear()
     
     def save(self):
         """Save cache to disk (for compatibility)."""
-        self._save_cache()
+        with cache_lock:
+            self._save_cache()
 
 
 # Global singleton instance
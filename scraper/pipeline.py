@@ -0,0 +1,303 @@
+"""Staged scrape pipeline: fetch/extract -> filter -> enrich -> sink, with bounded queues between stages."""
+
+import time
+from concurrent.futures import ThreadPoolExecutor
+from threading import Lock, Thread
+from .config import (
+    PIPELINE_QUEUE_SIZE, ENRICH_WORKERS, ENABLE_GOOGLE_ENRICHMENT, ENABLE_HEDGING,
+    HEDGE_CHECK_INTERVAL, RESULT_POLL_INTERVAL
+)
+from .job_queue import BoundedJobQueue
+from .job_scraper import scrape_job_details, create_empty_job_data
+
+
+class PipelineStage:
+    """
+    One step of the pipeline: worker threads taking items from a bounded inbox.
+
+    Each item is handed to handler(item), which updates it in place, and then
+    to the next stage. When the inbox is full the previous stage blocks, so a
+    slow stage shows up as its inbox filling and its upstream waiting. Stages
+    with no handler are driven by the pipeline itself (the fetch stage).
+    """
+
+    def __init__(self, name, handler=None, workers=1, inbox=None, queue_size=PIPELINE_QUEUE_SIZE):
+        """
+        Args:
+            name: Stage name for the report
+            handler: Callable(item) run by the worker threads
+            workers: Number of worker threads (or browsers, for the fetch stage)
+            inbox: Queue to read from (default: a new BoundedJobQueue of queue_size)
+            queue_size: Size of the default inbox
+        """
+        self.name = name
+        self.handler = handler
+        self.workers = workers
+        self.inbox = inbox if inbox is not None else BoundedJobQueue(queue_size)
+        self.next_stage = None
+        self.lock = Lock()
+        self.threads = []
+        self.running = 0
+        self.processed = 0
+        self.busy_seconds = 0.0
+        self.started_at = None
+        self.finished_at = None
+
+    def start(self):
+        """Start the worker threads."""
+        self.started_at = time.perf_counter()
+        self.running = self.workers
+        for i in range(self.workers):
+            thread = Thread(target=self._run, name=f"pipeline-{self.name}-{i + 1}", daemon=True)
+            thread.start()
+            self.threads.append(thread)
+        return self
+
+    def _run(self):
+        try:
+            while True:
+                item = self.inbox.get()
+                if item is None:
+                    break
+                start = time.perf_counter()
+                try:
+                    self.handler(item)
+                except Exception as e:
+                    print(f"  ✗ [Job #{item.get('job_num')}] {self.name} failed: {e}")
+                self.record(time.perf_counter() - start)
+                self.forward(item)
+        finally:
+            with self.lock:
+                self.running -= 1
+                last = self.running == 0
+            if last:
+                self.finish()
+
+    def record(self, seconds):
+        """Count one item handled in the given time."""
+        with self.lock:
+            self.processed += 1
+            self.busy_seconds += seconds
+
+    def forward(self, item):
+        """Pass an item to the next stage (blocks while its inbox is full)."""
+        if self.next_stage is not None:
+            self.next_stage.inbox.put(item)
+
+    def finish(self):
+        """Mark the stage done; the next stage stops once it has drained its inbox."""
+        self.finished_at = time.perf_counter()
+        if self.next_stage is not None:
+            self.next_stage.inbox.close()
+
+    def join(self, timeout=None):
+        for thread in self.threads:
+            thread.join(timeout)
+
+    def get_stats(self):
+        """Return throughput, utilisation and queue figures for the report."""
+        end = self.finished_at or time.perf_counter()
+        wall = max(end - self.started_at, 1e-9) if self.started_at else 0.0
+        queue_stats = self.inbox.get_stats()
+        with self.lock:
+            return {
+                'workers': self.workers,
+                'processed': self.processed,
+                'per_second': round(self.processed / wall, 2) if wall else 0.0,
+                'utilisation': round(self.busy_seconds / (wall * self.workers), 2) if wall else 0.0,
+                'queued': len(self.inbox),
+                'peak_queued': queue_stats['max_depth'],
+                'upstream_blocked_seconds': queue_stats['blocked_seconds'],
+            }
+
+
+class ScrapePipeline:
+    """
+    Scrapes the jobs in a work queue as a chain of independently sized stages:
+
+        fetch    pooled browsers load each page and extract it on the live page,
+                 applying the job filters (through the session's JobDispatcher, so
+                 deadlines, retries, hedging and the concurrency limit apply)
+        filter   the caller's filter_job(item, job_data), e.g. matching the advertiser
+        enrich   threads look up office phones (cache first, Google on a miss)
+        sink     one thread hands every finished item to on_result(item)
+
+    Stages are joined by bounded queues, so a browser is free for the next page as
+    soon as its page is extracted, and a slow stage holds back the ones before it
+    instead of letting work pile up. print_report() shows per-stage throughput,
+    utilisation and queue depth to find the bottleneck.
+
+    Every item reaches the sink, with item['job_data'] set to the job data dict or
+    None if the job was filtered out. Jobs cut short by cancellation arrive with
+    job_data None and item['cancelled'] set.
+    """
+
+    def __init__(self, session, job_queue, fetch_workers, on_result, filter_job=None, total_jobs=None,
+                 hedging=ENABLE_HEDGING, time_budget=None, on_quota=None,
+                 enrich_workers=ENRICH_WORKERS, queue_size=PIPELINE_QUEUE_SIZE):
+        """
+        Args:
+            session: ScrapeSession providing browsers, the concurrency limit and the phone cache
+            job_queue: BoundedJobQueue of jobs ({'url', 'job_num', ...}) filled by the caller
+            fetch_workers: Browsers fetching and extracting pages at once (at most)
+            on_result: Callable(item) run in the sink thread for every finished job
+            filter_job: Optional callable(item, job_data) returning job_data to keep it, or None
+            total_jobs: Total shown in the workers' output (None if not known yet)
+            hedging: Duplicate straggling fetches on idle browsers
+            time_budget: Seconds after which no new jobs are started (None = no limit)
+            on_quota: Optional callable run before pausing for the Google quota (e.g. a checkpoint)
+            enrich_workers: Threads looking up office phones
+            queue_size: Items waiting between two stages before the earlier one blocks
+        """
+        self.session = session
+        self.job_queue = job_queue
+        self.on_result = on_result
+        self.filter_job = filter_job
+        self.total_jobs = total_jobs
+        self.hedging = hedging
+        self.time_budget = time_budget
+        self.on_quota = on_quota
+        self.quota_lock = Lock()
+        self.fetching = {}  # dispatcher key -> item
+
+        self.fetch = PipelineStage('fetch', workers=fetch_workers, inbox=job_queue)
+        self.filter = PipelineStage('filter', self._filter, 1, queue_size=queue_size)
+        self.enrich = PipelineStage('enrich', self._enrich, enrich_workers, queue_size=queue_size)
+        self.sink = PipelineStage('sink', self._sink, 1, queue_size=queue_size)
+        self.stages = [self.fetch, self.filter, self.enrich, self.sink]
+        for stage, next_stage in zip(self.stages, self.stages[1:]):
+            stage.next_stage = next_stage
+
+    def run(self):
+        """Scrape until the job queue is exhausted (or the time budget is spent) and every stage has drained."""
+        # Imported here: streaming_parallel_scraper builds on this module
+        from .streaming_parallel_scraper import JobDispatcher
+
+        for stage in self.stages[1:]:
+            stage.start()
+        self.fetch.started_at = time.perf_counter()
+        pool_size = self.fetch.workers
+        poll_interval = HEDGE_CHECK_INTERVAL if self.hedging else RESULT_POLL_INTERVAL
+        run_start = time.time()
+        budget_spent = False
+
+        with ThreadPoolExecutor(max_workers=pool_size) as executor:
+            self.session.executor = executor
+            dispatcher = JobDispatcher(executor, hedging=self.hedging, backlog=lambda: len(self.job_queue),
+                                       session=self.session, task=scrape_job_details)
+            try:
+                while not self.session.is_cancelled:
+                    if self.time_budget and not budget_spent and time.time() - run_start > self.time_budget:
+                        budget_spent = True
+                        print(f"\nTime budget of {self.time_budget}s reached - finishing {dispatcher.active_jobs} running jobs, "
+                              f"{len(self.job_queue)} queued jobs left unscraped")
+                        self.job_queue.close()
+
+                    # Keep every browser busy, but pull no more from the queue than the pool can run
+                    while not budget_spent and not self.session.is_cancelled and dispatcher.active_jobs < pool_size:
+                        job = self.job_queue.get(timeout=0)
+                        if job is None:
+                            break
+                        self._dispatch(dispatcher, job)
+
+                    if dispatcher.active_jobs == 0:
+                        if budget_spent or self.job_queue.exhausted:
+                            break
+                        # Waiting on the producer
+                        job = self.job_queue.get(timeout=poll_interval)
+                        if job is not None:
+                            self._dispatch(dispatcher, job)
+                        continue
+
+                    for key, future in dispatcher.poll(poll_interval):
+                        self._fetched(key, future)
+            finally:
+                # Unblocks the producer if scraping stopped early
+                self.job_queue.close()
+                self.session.executor = None
+                # Jobs still fetching when scraping stopped early reach the sink as cancelled
+                for item in self.fetching.values():
+                    item['job_data'] = None
+                    item['cancelled'] = True
+                    self.fetch.forward(item)
+                self.fetching.clear()
+                self.fetch.finish()
+
+        for stage in self.stages[1:]:
+            stage.join()
+
+    def _dispatch(self, dispatcher, job):
+        """Send a job to a browser."""
+        item = dict(job)
+        key = (item['url'], item['job_num'])
+        self.fetching[key] = item
+        try:
+            dispatcher.submit(key, item['url'], item['job_num'], self.total_jobs)
+        except RuntimeError:
+            # Executor shut down by a cancel; the item is forwarded as cancelled when run() stops
+            pass
+
+    def _fetched(self, key, future):
+        """Pass a finished fetch on to the filter stage."""
+        item = self.fetching.pop(key)
+        try:
+            # Job data, or None if filtered out or cancelled
+            item['job_data'] = future.result()
+        except Exception as e:
+            print(f"  ✗ Job #{item['job_num']} failed: {e}")
+            item['job_data'] = create_empty_job_data(item['url'])
+        self.fetch.record(getattr(future, 'progress', {}).get('elapsed') or 0.0)
+        self.fetch.forward(item)
+
+    def _filter(self, item):
+        job_data = item.get('job_data')
+        if job_data is not None and self.filter_job is not None:
+            item['job_data'] = self.filter_job(item, job_data)
+
+    def _enrich(self, item):
+        job_data = item.get('job_data')
+        if job_data is None or not ENABLE_GOOGLE_ENRICHMENT or self.session.is_cancelled:
+            return
+        # One worker pauses for the quota; the others wait for it on the lock
+        with self.quota_lock:
+            if self.session.quota_exceeded():
+                print("\nWARNING: Quota threshold reached - triggering pause...")
+                if self.on_quota is not None:
+                    self.on_quota()
+                self.session.wait_for_quota_reset(wait_minutes=5)
+        self.session.add_office_phone(job_data)
+
+    def _sink(self, item):
+        job_data = item.get('job_data')
+        if item.get('cancelled'):
+            print(f"  [Job #{item['job_num']}] Cancelled")
+        elif job_data is None:
+            print(f"  [Job #{item['job_num']}] Filtered")
+        else:
+            office_phone_status = " (phone)" if job_data.get('office_phone') else ""
+            print(f"  [Job #{item['job_num']}] Completed{office_phone_status}")
+        self.on_result(item)
+
+    def depth_line(self):
+        """One-line view of what is waiting at each stage (for progress output)."""
+        parts = [f"fetch {len(self.job_queue)}+{len(self.fetching)} running"]
+        parts += [f"{stage.name} {len(stage.inbox)}" for stage in self.stages[1:]]
+        return "Waiting: " + ", ".join(parts)
+
+    def get_report(self):
+        return {stage.name: stage.get_stats() for stage in self.stages}
+
+    def print_report(self):
+        """Print per-stage throughput, utilisation and queue depth, and name the busiest stage."""
+        report = self.get_report()
+        print("\nPipeline stages:")
+        for name, stats in report.items():
+            line = (f"  {name:<8} {stats['workers']:>2} workers  {stats['processed']:>5} items  "
+                    f"{stats['per_second']:>6.2f}/s  busy {stats['utilisation']:>4.0%}  "
+                    f"queue peak {stats['peak_queued']}")
+            if stats['upstream_blocked_seconds']:
+                line += f", upstream blocked {stats['upstream_blocked_seconds']}s"
+            print(line)
+        busiest = max(report, key=lambda name: report[name]['utilisation'])
+        if report[busiest]['processed']:
+            print(f"  Bottleneck: {busiest} ({report[busiest]['utilisation']:.0%} busy)")
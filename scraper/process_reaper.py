@@ -0,0 +1,232 @@
+"""Track browser process groups and reap stragglers on exit, on signal and at startup."""
+
+import atexit
+import json
+import os
+import signal
+import socket
+import time
+from contextlib import contextmanager
+from threading import Event, Lock
+from selenium.webdriver.chrome.service import Service
+from .host_stats import get_process_group, get_cmdline, get_process_start_time
+from .shared_json import locked
+
+REGISTRY_FILE = os.path.join("cache", "browser_pgids.json")
+# Guards the registry file between this process's threads; other processes are kept out with flock.
+# The signal handler never takes it (see _handle_signal).
+registry_lock = Lock()
+# Set when the run is being cancelled; workers check it before starting more work
+cancel_event = Event()
+# Process groups started by this process: pgid -> start time
+owned_groups = {}
+_handlers_installed = False
+
+
+class TrackedService(Service):
+    """
+    Chrome service whose chromedriver starts in its own session/process group.
+
+    Chrome is launched by chromedriver, so killing the group takes the whole
+    browser down. The group is registered as soon as the process exists, before
+    the WebDriver session is created, so a worker interrupted mid-setup_driver
+    still leaves nothing behind.
+    """
+
+    def __init__(self, *args, **kwargs):
+        popen_kw = dict(kwargs.pop('popen_kw', None) or {})
+        if os.name == 'posix':
+            popen_kw['start_new_session'] = True
+        super().__init__(*args, popen_kw=popen_kw, **kwargs)
+
+    def _start_process(self, path):
+        super()._start_process(path)
+        if os.name == 'posix' and self.process:
+            register_group(self.process.pid)
+
+    def stop(self):
+        try:
+            super().stop()
+        finally:
+            if os.name == 'posix' and self.process:
+                kill_group(self.process.pid)
+
+
+def _load_registry():
+    try:
+        with open(REGISTRY_FILE, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except Exception:
+        return {}
+
+
+def _save_registry(registry):
+    try:
+        os.makedirs(os.path.dirname(REGISTRY_FILE), exist_ok=True)
+        tmp_file = f"{REGISTRY_FILE}.{os.getpid()}.tmp"
+        with open(tmp_file, 'w', encoding='utf-8') as f:
+            json.dump(registry, f, indent=2)
+        os.replace(tmp_file, REGISTRY_FILE)
+    except Exception as e:
+        print(f"WARNING: Error saving browser registry: {e}")
+
+
+@contextmanager
+def _registry_file_lock():
+    """Exclusive lock on the registry file, so scrapers sharing cache/ never lose each other's entries."""
+    with registry_lock, locked(REGISTRY_FILE):
+        yield
+
+
+def register_group(pgid):
+    """Record a browser process group owned by this process."""
+    owned_groups[pgid] = time.time()
+    with _registry_file_lock():
+        registry = _load_registry()
+        registry[str(pgid)] = {
+            # PIDs only mean something on the host (container) that recorded them
+            'host': socket.gethostname(),
+            'owner': os.getpid(),
+            'owner_start': get_process_start_time(os.getpid()),
+            'started': round(owned_groups[pgid], 1),
+        }
+        _save_registry(registry)
+
+
+def unregister_group(pgid):
+    """Forget a process group once it is gone."""
+    owned_groups.pop(pgid, None)
+    with _registry_file_lock():
+        registry = _load_registry()
+        if registry.pop(str(pgid), None) is not None:
+            _save_registry(registry)
+
+
+def _is_browser_group(pgid):
+    """True if the group still has a Chrome/Chromium/chromedriver process (guards against PID reuse)."""
+    return any('chrom' in get_cmdline(pid).lower() for pid in get_process_group(pgid))
+
+
+def kill_group(pgid, grace=2.0, forget=True):
+    """
+    Terminate a browser process group: SIGTERM, then SIGKILL after a grace period.
+
+    Args:
+        pgid: Process group ID
+        grace: Seconds to wait for SIGTERM before SIGKILL
+        forget: Remove the group from the registry file afterwards
+
+    Returns:
+        True if a live browser group was found and signalled
+    """
+    killed = False
+    if _is_browser_group(pgid):
+        try:
+            os.killpg(pgid, signal.SIGTERM)
+            killed = True
+            deadline = time.time() + grace
+            while time.time() < deadline and get_process_group(pgid):
+                time.sleep(0.1)
+            if get_process_group(pgid):
+                os.killpg(pgid, signal.SIGKILL)
+        except (ProcessLookupError, PermissionError):
+            pass
+    if forget:
+        unregister_group(pgid)
+    return killed
+
+
+def reap_owned(forget=True):
+    """
+    Kill every browser group started by this process. Returns how many were still alive.
+
+    Args:
+        forget: Also remove the groups from the registry file; without it only the
+            groups held in memory are touched and the file is left to a later call
+    """
+    pgids = list(owned_groups)
+    return sum(1 for pgid in pgids if kill_group(pgid, grace=0.5, forget=forget))
+
+
+def _owner_alive(entry):
+    """True if the process that registered a group is still running (and is not a reused PID)."""
+    owner = entry.get('owner')
+    if not owner:
+        return False
+    start_time = get_process_start_time(owner)
+    return start_time is not None and start_time == entry.get('owner_start')
+
+
+def reap_stale():
+    """
+    Kill browser groups left behind by earlier runs whose owner process has exited.
+
+    Groups owned by a still-running scraper are left alone, and so are groups recorded
+    on another host: containers sharing cache/ have their own PID namespaces, so their
+    owner PIDs cannot be checked (or their groups killed) from here.
+
+    Returns:
+        Number of orphaned browser groups killed
+    """
+    if os.name != 'posix':
+        return 0
+    with _registry_file_lock():
+        registry = _load_registry()
+    host = socket.gethostname()
+    reaped = 0
+    for pgid, entry in registry.items():
+        if entry.get('host', host) != host or _owner_alive(entry):
+            continue
+        if kill_group(int(pgid), grace=0.5):
+            reaped += 1
+        else:
+            unregister_group(int(pgid))
+    if reaped:
+        print(f"Reaped {reaped} orphaned browser(s) from a previous run")
+    return reaped
+
+
+def request_cancel(reason="cancelled", forget=True):
+    """
+    Cancel the run cooperatively: flag workers to stop and kill every browser.
+
+    Killing the process groups makes any in-flight driver.get() fail fast
+    instead of pinning its worker until the page finishes loading.
+
+    Args:
+        reason: Shown in the cancel message
+        forget: Also remove the killed groups from the registry file (see reap_owned)
+    """
+    if not cancel_event.is_set():
+        print(f"\nCancelling: {reason} - stopping browsers...")
+    cancel_event.set()
+    reap_owned(forget=forget)
+
+
+def _handle_signal(signum, frame):
+    # The signal may have interrupted a registry write on this thread, so only kill the
+    # groups held in memory; the atexit hook removes them from the file on the way out
+    request_cancel(signal.Signals(signum).name, forget=False)
+    if signum == signal.SIGINT:
+        raise KeyboardInterrupt
+    raise SystemExit(128 + signum)
+
+
+def install_reaper():
+    """
+    Reap orphans from previous runs and make sure this run's browsers die with it.
+
+    Registers an atexit hook and SIGINT/SIGTERM handlers (main thread only).
+    """
+    global _handlers_installed
+    reap_stale()
+    if _handlers_installed:
+        return
+    _handlers_installed = True
+    atexit.register(reap_owned)
+    try:
+        signal.signal(signal.SIGINT, _handle_signal)
+        signal.signal(signal.SIGTERM, _handle_signal)
+    except ValueError:
+        # Not the main thread; atexit still covers normal exits
+        pass
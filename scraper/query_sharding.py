@@ -0,0 +1,213 @@
+"""Query sharding to get past Seek's pagination cap.
+
+Seek only exposes ~25 result pages (~550 jobs) per search, however many jobs
+the search reports. A search over the cap is split recursively into narrower
+sub-searches (sub-location, work type, salary band, subclassification) until
+each one fits, and the shards are collected in parallel and merged by job ID.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+from queue import Queue
+from threading import Event
+from .driver_setup import setup_driver
+from .page_parser import get_total_jobs
+from .streaming_collector import stream_job_links
+from .frontier import link_frontier
+from .url_builder import build_search_url, extract_job_id
+from .process_reaper import cancel_event
+from .config import (
+    SEEK_RESULT_CAP, SHARD_WORKERS, SHARD_DIMENSIONS, SHARD_SUB_LOCATIONS,
+    SHARD_WORK_TYPES, SHARD_SALARY_BANDS, SHARD_SUBCLASSIFICATIONS, LINK_FRONTIER
+)
+
+# Sentinel put on the queue when a shard has finished collecting
+_SHARD_DONE = object()
+
+
+def get_dimension_values(dimension):
+    """Return the values a search can be split on for the given dimension."""
+    if dimension == 'location':
+        return list(SHARD_SUB_LOCATIONS)
+    if dimension == 'worktype':
+        return list(SHARD_WORK_TYPES)
+    if dimension == 'salaryrange':
+        return list(SHARD_SALARY_BANDS)
+    if dimension == 'subclassification':
+        return list(SHARD_SUBCLASSIFICATIONS)
+    raise ValueError(f"Unknown shard dimension: {dimension}")
+
+
+def describe_shard(shard):
+    """Return a short human-readable label for a shard."""
+    parts = []
+    if shard.get('location'):
+        parts.append(shard['location'])
+    for key, value in shard.get('filters', {}).items():
+        if key == 'worktype':
+            value = SHARD_WORK_TYPES.get(value, value)
+        elif key == 'subclassification':
+            value = SHARD_SUBCLASSIFICATIONS.get(value, value)
+        parts.append(f"{key}={value}")
+    return ', '.join(parts) if parts else 'full search'
+
+
+def count_search_results(driver, sort_by_date=False, location=None, filters=None):
+    """Navigate to a (narrowed) search and return its reported total."""
+    driver.get(build_search_url(sort_by_date=sort_by_date, location=location, filters=filters))
+    return get_total_jobs(driver)
+
+
+def _split_shard(driver, shard, dimensions, sort_by_date, cap, depth=0):
+    """Recursively split a shard along the remaining dimensions until it fits under the cap."""
+    indent = "  " * (depth + 1)
+    if shard['total'] <= cap or not dimensions:
+        if shard['total'] > cap:
+            print(f"{indent}WARNING: {describe_shard(shard)} still has {shard['total']} jobs "
+                  f"with no dimensions left to split (only ~{cap} reachable)")
+        return [shard]
+
+    dimension = dimensions[0]
+    print(f"{indent}Splitting {describe_shard(shard)} ({shard['total']} jobs) by {dimension}...")
+
+    shards = []
+    for value in get_dimension_values(dimension):
+        location = shard.get('location')
+        filters = dict(shard.get('filters', {}))
+        if dimension == 'location':
+            location = value
+        else:
+            filters[dimension] = value
+
+        total = count_search_results(driver, sort_by_date, location, filters)
+        child = {'location': location, 'filters': filters, 'total': total}
+        if total == 0:
+            continue
+        shards.extend(_split_shard(driver, child, dimensions[1:], sort_by_date, cap, depth + 1))
+
+    return shards
+
+
+def plan_shards(driver, reported_total, sort_by_date=False, cap=SEEK_RESULT_CAP, dimensions=None):
+    """
+    Plan a set of sub-searches that together cover a search larger than the cap.
+
+    Args:
+        driver: Selenium WebDriver used to probe shard totals
+        reported_total: Total reported by the full search (from get_total_jobs)
+        sort_by_date: Sort by listing date when probing and collecting
+        cap: Maximum results Seek exposes per search
+        dimensions: Ordered list of dimensions to split on (default: SHARD_DIMENSIONS)
+
+    Returns:
+        Shard plan dict with 'reported_total' and 'shards' (each with location, filters, total)
+    """
+    if dimensions is None:
+        dimensions = SHARD_DIMENSIONS
+
+    print(f"\nPlanning query shards: {reported_total} jobs reported, ~{cap} reachable per search")
+    root = {'location': None, 'filters': {}, 'total': reported_total}
+    shards = _split_shard(driver, root, list(dimensions), sort_by_date, cap)
+
+    shard_total = sum(shard['total'] for shard in shards)
+    print(f"Planned {len(shards)} shards covering {shard_total} reported jobs\n")
+
+    return {'reported_total': reported_total, 'shards': shards}
+
+
+def _collect_shard(shard, sort_by_date, headless, out_queue, stop_event, card_info=None):
+    """Collect every link from one shard with its own browser, pushing batches onto the queue."""
+    driver = None
+    try:
+        driver = setup_driver(headless=headless)
+        end_job = max(shard['total'], SEEK_RESULT_CAP)
+        for batch in stream_job_links(driver, end_job, sort_by_date=sort_by_date,
+                                      location=shard.get('location'), filters=shard.get('filters'),
+                                      card_info=card_info, frontier=link_frontier if LINK_FRONTIER else None):
+            if stop_event.is_set() or cancel_event.is_set():
+                break
+            out_queue.put((shard, batch))
+    except Exception as e:
+        print(f"  ✗ Shard failed ({describe_shard(shard)}): {e}")
+    finally:
+        if driver:
+            try:
+                driver.quit()
+            except:
+                pass
+        out_queue.put((shard, _SHARD_DONE))
+
+
+def stream_sharded_job_links(shard_plan, sort_by_date=False, num_workers=SHARD_WORKERS, headless=True, stats=None, card_info=None):
+    """
+    Collect all shards in parallel and yield batches of new links, merged by job ID.
+
+    Args:
+        shard_plan: Plan returned by plan_shards
+        sort_by_date: Sort by listing date when navigating
+        num_workers: Number of shards collected at once (one browser each)
+        headless: Run collection browsers headless
+        stats: Optional dict filled with 'collected', 'duplicates' and 'per_shard' counts
+        card_info: Optional dict filled with url -> advertiser name from the search cards
+
+    Yields:
+        Batches of job URLs not seen in any earlier batch
+    """
+    shards = shard_plan['shards']
+    if stats is None:
+        stats = {}
+    stats.update({'collected': 0, 'duplicates': 0, 'per_shard': {}})
+
+    seen_ids = set()
+    out_queue = Queue()
+    stop_event = Event()
+    executor = ThreadPoolExecutor(max_workers=max(1, min(num_workers, len(shards))))
+
+    try:
+        for shard in shards:
+            executor.submit(_collect_shard, shard, sort_by_date, headless, out_queue, stop_event, card_info)
+
+        finished = 0
+        while finished < len(shards):
+            shard, batch = out_queue.get()
+            if batch is _SHARD_DONE:
+                finished += 1
+                continue
+
+            label = describe_shard(shard)
+            stats['per_shard'][label] = stats['per_shard'].get(label, 0) + len(batch)
+
+            unique_links = []
+            for link in batch:
+                job_id = extract_job_id(link)
+                if job_id in seen_ids:
+                    stats['duplicates'] += 1
+                    continue
+                seen_ids.add(job_id)
+                unique_links.append(link)
+
+            stats['collected'] += len(unique_links)
+            if unique_links:
+                yield unique_links
+    finally:
+        stop_event.set()
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+def print_coverage_report(shard_plan, stats):
+    """Compare the number of unique jobs collected with the total Seek reported."""
+    reported = shard_plan['reported_total']
+    collected = stats.get('collected', 0)
+    coverage = (collected / reported * 100) if reported else 0.0
+
+    print("\n" + "=" * 60)
+    print("SHARD COVERAGE REPORT")
+    print("=" * 60)
+    print(f"Reported total: {reported}")
+    print(f"Shards: {len(shard_plan['shards'])}")
+    print(f"Unique jobs collected: {collected} ({coverage:.1f}% coverage)")
+    print(f"Duplicates merged across shards: {stats.get('duplicates', 0)}")
+    for shard in shard_plan['shards']:
+        label = describe_shard(shard)
+        got = stats.get('per_shard', {}).get(label, 0)
+        print(f"  {label}: {got}/{shard['total']}")
+    print("=" * 60)
@@ -0,0 +1,211 @@
+"""Readiness waits: poll for a concrete page condition instead of sleeping a fixed time."""
+
+import time
+from collections import deque
+from threading import Lock
+from selenium.webdriver.common.by import By
+from .config import (PAGE_LOAD_TIMEOUT, READINESS_POLL_INTERVAL, READINESS_TIMEOUT_FACTOR,
+                     READINESS_MIN_TIMEOUT, READINESS_MIN_SAMPLES, READINESS_QUIET_PERIOD)
+from .stage_timer import stage_timer, percentile
+
+# Installs a MutationObserver once per document; returns [readyState, ms since the last DOM change]
+MUTATION_SCRIPT = """
+var w = window;
+if (!w.__seekReady) {
+    w.__seekReady = {last: Date.now()};
+    new MutationObserver(function() { w.__seekReady.last = Date.now(); })
+        .observe(document.documentElement, {childList: true, subtree: true, attributes: true, characterData: true});
+}
+return [document.readyState, Date.now() - w.__seekReady.last];
+"""
+
+NETWORK_SCRIPT = "return [document.readyState, performance.getEntriesByType('resource').length];"
+
+
+class ReadinessTracker:
+    """
+    Wait-time samples per condition, used for adaptive timeouts and the sleep-saved report.
+
+    Once a condition has READINESS_MIN_SAMPLES samples its timeout becomes
+    p95 x READINESS_TIMEOUT_FACTOR, clamped between READINESS_MIN_TIMEOUT and
+    the caller's maximum. Timed-out waits are recorded at the full timeout, so
+    the limit grows back if pages get slower.
+    """
+
+    def __init__(self, window=200):
+        self.lock = Lock()
+        self.window = window
+        self.samples = {}
+        self.saved = {}
+        self.timeouts = {}
+
+    def reset(self):
+        with self.lock:
+            self.samples = {}
+            self.saved = {}
+            self.timeouts = {}
+
+    def get_timeout(self, condition, max_timeout):
+        """Return the timeout to use for the next wait on a condition."""
+        with self.lock:
+            values = sorted(self.samples.get(condition, ()))
+        if len(values) < READINESS_MIN_SAMPLES:
+            return max_timeout
+        adaptive = percentile(values, 95) * READINESS_TIMEOUT_FACTOR
+        return min(max_timeout, max(READINESS_MIN_TIMEOUT, adaptive))
+
+    def record(self, condition, waited, replaces, ready):
+        """
+        Record one wait.
+
+        Args:
+            condition: Name of the wait (e.g. 'job.title')
+            waited: Seconds actually spent waiting
+            replaces: Seconds of fixed sleep this wait replaced
+            ready: False if the wait timed out
+        """
+        with self.lock:
+            self.samples.setdefault(condition, deque(maxlen=self.window)).append(waited)
+            self.saved[condition] = self.saved.get(condition, 0.0) + max(0.0, replaces - waited)
+            if not ready:
+                self.timeouts[condition] = self.timeouts.get(condition, 0) + 1
+        stage_timer.record(f'ready.{condition}', waited)
+
+    def get_report(self, jobs=0):
+        """
+        Summarise waits per condition.
+
+        Args:
+            jobs: Jobs scraped in the run, for the per-job saving
+
+        Returns:
+            Dict with total and per-job seconds saved and per-condition stats
+        """
+        with self.lock:
+            conditions = {}
+            for condition, values in self.samples.items():
+                ordered = sorted(values)
+                conditions[condition] = {
+                    'waits': len(values),
+                    'p95': round(percentile(ordered, 95), 3),
+                    'timeouts': self.timeouts.get(condition, 0),
+                    'saved': round(self.saved.get(condition, 0.0), 1),
+                }
+            total = sum(self.saved.values())
+        return {
+            'saved_seconds': round(total, 1),
+            'saved_per_job': round(total / jobs, 3) if jobs else 0.0,
+            'conditions': conditions,
+        }
+
+    def print_report(self, jobs=0):
+        report = self.get_report(jobs)
+        if not report['conditions']:
+            return
+        print(f"\nReadiness waits: {report['saved_seconds']}s of fixed sleep removed"
+              + (f" ({report['saved_per_job']}s per job)" if jobs else ""))
+        for condition, stats in sorted(report['conditions'].items()):
+            print(f"  {condition:<22} waits: {stats['waits']:>5}  p95: {stats['p95']:.2f}s  "
+                  f"timeouts: {stats['timeouts']:>3}  saved: {stats['saved']}s")
+
+
+# Global tracker shared by all workers
+readiness = ReadinessTracker()
+
+
+def wait_until(driver, condition, check, replaces=0.0, timeout=None):
+    """
+    Poll check(driver) until it returns something truthy or the timeout passes.
+
+    Implicit waits are switched off while polling so a missing element costs one
+    poll interval rather than PAGE_LOAD_TIMEOUT.
+
+    Args:
+        driver: Selenium WebDriver instance
+        condition: Name for stats and adaptive timeouts
+        check: Callable driver -> value; exceptions count as not ready
+        replaces: Seconds of fixed sleep this wait stands in for (for the report)
+        timeout: Maximum seconds to wait (adaptive timeouts only ever shorten it)
+
+    Returns:
+        The first truthy value from check, or None on timeout
+    """
+    limit = readiness.get_timeout(condition, timeout if timeout is not None else max(replaces, READINESS_MIN_TIMEOUT))
+    start = time.perf_counter()
+    result = None
+    try:
+        driver.implicitly_wait(0)
+    except:
+        pass
+    try:
+        while True:
+            try:
+                result = check(driver)
+            except:
+                result = None
+            if result or time.perf_counter() - start >= limit:
+                break
+            time.sleep(READINESS_POLL_INTERVAL)
+    finally:
+        try:
+            driver.implicitly_wait(PAGE_LOAD_TIMEOUT)
+        except:
+            pass
+    readiness.record(condition, time.perf_counter() - start, replaces, bool(result))
+    return result or None
+
+
+def wait_for_element(driver, selectors, condition, replaces=0.0, timeout=None):
+    """
+    Wait until any of the CSS selectors matches.
+
+    Args:
+        selectors: CSS selector or list of selectors, tried in order
+
+    Returns:
+        The selector that matched, or None on timeout
+    """
+    if isinstance(selectors, str):
+        selectors = [selectors]
+
+    def check(driver):
+        for selector in selectors:
+            if driver.find_elements(By.CSS_SELECTOR, selector):
+                return selector
+        return None
+    return wait_until(driver, condition, check, replaces, timeout)
+
+
+def wait_for_url_change(driver, old_url, condition, replaces=0.0, timeout=None):
+    """Wait until driver.current_url differs from old_url. Returns the new URL or None."""
+    def check(driver):
+        url = driver.current_url
+        return url if url != old_url else None
+    return wait_until(driver, condition, check, replaces, timeout)
+
+
+def wait_for_dom_settled(driver, condition, replaces=0.0, timeout=None, quiet=READINESS_QUIET_PERIOD):
+    """Wait until the document has loaded and the DOM has not changed for `quiet` seconds."""
+    def check(driver):
+        state = driver.execute_script(MUTATION_SCRIPT)
+        if isinstance(state, list):
+            return state[0] == 'complete' and state[1] >= quiet * 1000
+        # Drivers without script support: fall back to readyState alone
+        return state in (None, 'complete')
+    return wait_until(driver, condition, check, replaces, timeout)
+
+
+def wait_for_network_idle(driver, condition, replaces=0.0, timeout=None, quiet=READINESS_QUIET_PERIOD):
+    """Wait until the document has loaded and no new resource requests started for `quiet` seconds."""
+    seen = {'count': None, 'since': time.perf_counter()}
+
+    def check(driver):
+        state = driver.execute_script(NETWORK_SCRIPT)
+        if not isinstance(state, list):
+            return state in (None, 'complete')
+        now = time.perf_counter()
+        if state[1] != seen['count']:
+            seen['count'], seen['since'] = state[1], now
+            return False
+        return state[0] == 'complete' and now - seen['since'] >= quiet
+    return wait_until(driver, condition, check, replaces, timeout)
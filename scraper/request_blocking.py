@@ -0,0 +1,110 @@
+"""Per-page request blocking over CDP, and page weight (requests and bytes) per page."""
+
+import weakref
+from threading import Lock
+from .config import REQUEST_BLOCKING, BLOCK_PROFILES, MEASURE_PAGE_WEIGHT
+
+# Navigation plus resource entries for the current document: [request count, bytes]
+PAGE_WEIGHT_SCRIPT = """
+var entries = performance.getEntriesByType('navigation').concat(performance.getEntriesByType('resource'));
+var bytes = 0;
+for (var i = 0; i < entries.length; i++) {
+    bytes += entries[i].transferSize || entries[i].encodedBodySize || 0;
+}
+return [entries.length, bytes];
+"""
+
+active_profiles = weakref.WeakKeyDictionary()
+profiles_lock = Lock()
+
+
+def use_block_profile(driver, profile):
+    """
+    Switch a browser to a blocking profile from BLOCK_PROFILES (no-op if it is already on it).
+
+    Args:
+        driver: Selenium WebDriver instance
+        profile: Profile name ('seek', 'google'); None or unknown clears the blocklist
+    """
+    if not REQUEST_BLOCKING:
+        return
+    with profiles_lock:
+        if active_profiles.get(driver, '') == profile:
+            return
+    patterns = BLOCK_PROFILES.get(profile, [])
+    try:
+        driver.execute_cdp_cmd('Network.enable', {})
+        driver.execute_cdp_cmd('Network.setBlockedURLs', {'urls': patterns})
+    except Exception as e:
+        print(f"WARNING: Could not apply request blocking profile '{profile}': {e}")
+        return
+    with profiles_lock:
+        active_profiles[driver] = profile
+
+
+class PageWeightStats:
+    """Thread-safe requests and bytes per page, grouped by page kind and blocking profile."""
+
+    def __init__(self):
+        self.lock = Lock()
+        self.pages = {}
+
+    def reset(self):
+        with self.lock:
+            self.pages = {}
+
+    def record(self, kind, profile, requests, transferred):
+        with self.lock:
+            entry = self.pages.setdefault((kind, profile), {'pages': 0, 'requests': 0, 'bytes': 0})
+            entry['pages'] += 1
+            entry['requests'] += requests
+            entry['bytes'] += transferred
+
+    def get_report(self):
+        """
+        Returns:
+            Dict of 'kind/profile' -> pages, average requests and average KB per page
+        """
+        with self.lock:
+            snapshot = {key: dict(entry) for key, entry in self.pages.items()}
+        report = {}
+        for (kind, profile), entry in sorted(snapshot.items()):
+            report[f"{kind}/{profile or 'off'}"] = {
+                'pages': entry['pages'],
+                'avg_requests': round(entry['requests'] / entry['pages'], 1),
+                'avg_kb': round(entry['bytes'] / entry['pages'] / 1024, 1),
+            }
+        return report
+
+    def print_report(self):
+        report = self.get_report()
+        if not report:
+            return
+        print("\nPage weight (page kind / blocking profile):")
+        for key, stats in report.items():
+            print(f"  {key:<16} pages: {stats['pages']:>5}  avg requests: {stats['avg_requests']:>6}  "
+                  f"avg transferred: {stats['avg_kb']} KB")
+
+
+# Global page weight stats shared by all workers
+page_weight = PageWeightStats()
+
+
+def measure_page_weight(driver, kind):
+    """
+    Record how many requests the current page made and how many bytes they transferred.
+
+    Cross-origin responses without Timing-Allow-Origin report 0 bytes, so the byte
+    figure is a lower bound; it is still comparable between profiles.
+    """
+    if not MEASURE_PAGE_WEIGHT:
+        return
+    try:
+        result = driver.execute_script(PAGE_WEIGHT_SCRIPT)
+    except:
+        return
+    if not isinstance(result, list) or len(result) != 2:
+        return
+    with profiles_lock:
+        profile = active_profiles.get(driver) if REQUEST_BLOCKING else None
+    page_weight.record(kind, profile, int(result[0] or 0), int(result[1] or 0))
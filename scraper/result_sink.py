@@ -0,0 +1,65 @@
+"""Append-only sink for scraped jobs, written as each job completes."""
+
+import json
+import os
+from threading import Lock
+
+
+class JsonlResultSink:
+    """
+    Writes each finished job as one JSON line instead of holding results in memory.
+
+    The file doubles as the checkpoint: an interrupted run resumes from the URLs
+    already in it, and the final export reads it back once at the end.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.lock = Lock()
+        self.count = 0
+        self.with_phone = 0
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        self.file = open(path, 'a', encoding='utf-8')
+
+    def write(self, job_data):
+        """Append one job."""
+        with self.lock:
+            self.file.write(json.dumps(job_data, ensure_ascii=False, default=str) + "\n")
+            self.count += 1
+            if job_data.get('office_phone'):
+                self.with_phone += 1
+
+    def flush(self):
+        """Force everything written so far to disk (used at checkpoints)."""
+        with self.lock:
+            self.file.flush()
+            os.fsync(self.file.fileno())
+
+    def close(self):
+        with self.lock:
+            if not self.file.closed:
+                self.file.close()
+
+    def read_all(self):
+        """Return every job in the file, including ones from an earlier interrupted run."""
+        return list(read_jobs(self.path))
+
+    def remove(self):
+        """Delete the file once its jobs have been exported."""
+        self.close()
+        try:
+            os.remove(self.path)
+        except OSError:
+            pass
+
+
+def read_jobs(path):
+    """Yield the jobs stored in a sink file, skipping a torn last line."""
+    if not os.path.exists(path):
+        return
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            try:
+                yield json.loads(line)
+            except ValueError:
+                continue
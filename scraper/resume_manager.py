@@ -6,18 +6,27 @@ import time
 import pandas as pd
 from datetime import datetime, timedelta
 from .config import COLUMNS
+from .result_sink import read_jobs
 
 
 class ResumeManager:
     """Manages scraping progress and auto-resume functionality."""
     
-    def __init__(self, filename):
+    def __init__(self, filename, load=True):
+        """
+        Args:
+            filename: Output Excel filename the progress belongs to
+            load: Read the completed jobs from the progress, checkpoint and results files
+        """
         self.filename = filename
         os.makedirs("cache", exist_ok=True)
         base_name = os.path.basename(filename).replace('.xlsx', '_progress.json')
         self.progress_file = os.path.join("cache", base_name)
+        # Jobs streamed to disk as they complete (see result_sink.JsonlResultSink)
+        self.results_file = os.path.join("cache", base_name.replace('_progress.json', '_results.jsonl'))
         self.completed_urls = set()
-        self.load_progress()
+        if load:
+            self.load_progress()
     
     def load_progress(self):
         """Load previously completed jobs from progress file."""
@@ -39,6 +48,11 @@ class ResumeManager:
                     print(f"Loaded from checkpoint: {len(excel_urls)} jobs in Excel file")
             except Exception as e:
                 print(f"WARNING: Could not load checkpoint file: {e}")
+        
+        if os.path.exists(self.results_file):
+            sink_urls = {job.get('url') for job in read_jobs(self.results_file) if job.get('url')}
+            self.completed_urls.update(sink_urls)
+            print(f"Loaded from results file: {len(sink_urls)} jobs already scraped")
     
     def save_progress(self, all_jobs_data):
         """Save current progress to JSON file."""
@@ -90,11 +104,13 @@ class ResumeManager:
         return combined
     
     def cleanup_progress_file(self):
-        """Remove progress file after successful completion."""
+        """Remove progress and results files once the results have been exported."""
         try:
             if os.path.exists(self.progress_file):
                 os.remove(self.progress_file)
                 print(f"🗑️  Cleaned up progress file")
+            if os.path.exists(self.results_file):
+                os.remove(self.results_file)
         except:
             pass
 
@@ -0,0 +1,85 @@
+"""Pluggable scoring for the order jobs are scraped in."""
+
+from .url_builder import extract_job_id
+from .phone_cache import phone_cache
+
+
+def newest_first(job):
+    """Higher Seek job IDs are newer listings."""
+    job_id = extract_job_id(job['url'])
+    return int(job_id) if job_id and job_id.isdigit() else 0
+
+
+def cached_phone_first(job):
+    """Advertisers whose office phone is already cached come first (they need no Google search)."""
+    company = job.get('company')
+    return 1 if company and phone_cache.get(company) is not None else 0
+
+
+def uncached_phone_first(job):
+    """Advertisers with no cached phone come first, for catching up on enrichment."""
+    return 1 - cached_phone_first(job)
+
+
+class CompanyRoundRobin:
+    """Interleave companies: each company's 1st job, then each one's 2nd job, and so on."""
+
+    def __init__(self):
+        self.seen = {}
+
+    def __call__(self, job):
+        company = (job.get('company') or '').strip().lower()
+        position = self.seen.get(company, 0)
+        self.seen[company] = position + 1
+        return -position
+
+
+# Scorer factories by name (SCHEDULER_SCORERS); higher scores are scraped sooner
+SCORERS = {
+    'newest': lambda: newest_first,
+    'cached_phone_first': lambda: cached_phone_first,
+    'uncached_phone_first': lambda: uncached_phone_first,
+    'round_robin_company': CompanyRoundRobin,
+}
+
+
+def build_priority(names):
+    """
+    Build a sort key from scorer names, applied in order (later names break ties).
+
+    Args:
+        names: List of keys from SCORERS; empty keeps discovery order
+
+    Returns:
+        Callable job -> tuple where lower sorts first, or None for plain FIFO
+    """
+    if not names:
+        return None
+    unknown = [name for name in names if name not in SCORERS]
+    if unknown:
+        raise ValueError(f"Unknown scheduler scorer(s): {', '.join(unknown)}")
+    scorers = [SCORERS[name]() for name in names]
+
+    def priority(job):
+        return tuple(-scorer(job) for scorer in scorers)
+    return priority
+
+
+def order_jobs(jobs, names):
+    """
+    Sort a list of known jobs by priority (stable, so ties keep their order).
+
+    Args:
+        jobs: List of job dicts with at least 'url' (and 'company' for company scorers)
+        names: Scorer names, as for build_priority
+
+    Returns:
+        New list, highest priority first
+    """
+    priority = build_priority(names)
+    if priority is None:
+        return list(jobs)
+    # Score in the given order so stateful scorers (round-robin) see jobs as listed
+    keyed = [(priority(job), i, job) for i, job in enumerate(jobs)]
+    keyed.sort(key=lambda k: (k[0], k[1]))
+    return [job for _, _, job in keyed]
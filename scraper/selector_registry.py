@@ -0,0 +1,142 @@
+"""Self-tuning fallback order for CSS selectors, with hit statistics persisted between runs."""
+
+import json
+import os
+from datetime import datetime
+from threading import Lock
+from .config import SELECTOR_SCORE_DECAY, SELECTOR_STALE_AFTER
+from .shared_json import merge_into_file
+
+STATS_FILE = os.path.join("cache", "selector_stats.json")
+
+
+class SelectorRegistry:
+    """
+    Hit and miss counts per selector per field.
+
+    Each selector carries a moving success score (SELECTOR_SCORE_DECAY); the
+    fallbacks for a field are tried highest score first, so when Seek changes
+    markup the selector that still works moves to the front and dead ones stop
+    costing an implicit wait on every call. A selector that keeps missing
+    while a later fallback hits is flagged as stale.
+
+    Saved with merge_into_file.
+    """
+
+    def __init__(self, stats_file=STATS_FILE):
+        self.stats_file = stats_file
+        self.lock = Lock()
+        self.stats = self._load()
+        self.changed = set()  # (field, selector) updated since the last save
+
+    def _load(self):
+        if os.path.exists(self.stats_file):
+            try:
+                with open(self.stats_file, 'r', encoding='utf-8') as f:
+                    return json.load(f)
+            except Exception as e:
+                print(f"WARNING: Error loading selector stats: {e}")
+        return {}
+
+    def save(self):
+        """Write the stats to disk."""
+        with self.lock:
+            if not self.changed:
+                return
+            try:
+                self.stats = merge_into_file(self.stats_file, self.stats, self.changed, indent=2)
+                self.changed.clear()
+            except Exception as e:
+                print(f"WARNING: Error saving selector stats: {e}")
+
+    def _entry(self, field, selector):
+        """Stats for one selector, marked as changed (caller holds the lock)."""
+        self.changed.add((field, selector))
+        return self.stats.setdefault(field, {}).setdefault(
+            selector, {'hits': 0, 'misses': 0, 'score': 0.5, 'beaten': 0, 'last_hit': None}
+        )
+
+    def order(self, field, selectors):
+        """
+        Return the selectors for a field, most successful first.
+
+        Selectors with no history keep their place relative to each other.
+        """
+        with self.lock:
+            known = self.stats.get(field, {})
+            scores = [known.get(selector, {}).get('score', 0.5) for selector in selectors]
+        ranked = sorted(range(len(selectors)), key=lambda i: -scores[i])
+        return [selectors[i] for i in ranked]
+
+    def record(self, field, missed, hit=None):
+        """
+        Record the outcome of one lookup.
+
+        Args:
+            field: Field the selectors are for (e.g. 'job.salary')
+            missed: Selectors tried that did not match, in order
+            hit: Selector that matched, or None if none did
+        """
+        with self.lock:
+            for selector in missed:
+                entry = self._entry(field, selector)
+                entry['misses'] += 1
+                entry['score'] *= SELECTOR_SCORE_DECAY
+                # Only a miss that a fallback made up for says the selector is broken;
+                # if everything missed the field is probably just absent from the page
+                if hit is not None:
+                    entry['beaten'] += 1
+            if hit is not None:
+                entry = self._entry(field, hit)
+                entry['hits'] += 1
+                entry['score'] = entry['score'] * SELECTOR_SCORE_DECAY + (1 - SELECTOR_SCORE_DECAY)
+                entry['beaten'] = 0
+                entry['last_hit'] = datetime.now().isoformat(timespec='seconds')
+
+    def find_first(self, field, selectors, find):
+        """
+        Try selectors in registry order and record the outcome.
+
+        Args:
+            field: Field name for the stats
+            selectors: Fallback selectors, in their default order
+            find: Callable selector -> result; None or an exception counts as a miss
+
+        Returns:
+            The first non-None result, or None if every selector missed
+        """
+        missed = []
+        for selector in self.order(field, selectors):
+            try:
+                result = find(selector)
+            except:
+                result = None
+            if result is not None:
+                self.record(field, missed, selector)
+                return result
+            missed.append(selector)
+        self.record(field, missed)
+        return None
+
+    def get_stale(self):
+        """Return (field, selector, entry) for selectors that keep losing to a fallback."""
+        with self.lock:
+            return [
+                (field, selector, dict(entry))
+                for field, selectors in sorted(self.stats.items())
+                for selector, entry in selectors.items()
+                if entry['beaten'] >= SELECTOR_STALE_AFTER
+            ]
+
+    def print_report(self):
+        stale = self.get_stale()
+        if not stale:
+            return
+        print(f"\nStale selectors ({len(stale)}) - these no longer match and were moved behind their fallbacks:")
+        for field, selector, entry in stale:
+            last_hit = entry['last_hit'] or 'never'
+            print(f"  {field:<22} {selector}  (lost {entry['beaten']} times in a row, last hit {last_hit})")
+
+
+# Global registry shared by all workers
+selector_registry = SelectorRegistry()
@@ -0,0 +1,364 @@
+"""Scrape sessions: the state of one parallel scrape, sharing the process's browser pool and caches."""
+
+import time
+from contextlib import nullcontext
+from threading import Event, Lock
+from weakref import WeakSet
+from .job_scraper import scrape_job_details, create_empty_job_data
+from .google_enrichment import search_google_business_phone
+from .config import (
+    ENABLE_GOOGLE_ENRICHMENT, ADAPTIVE_MIN_WORKERS, ADAPTIVE_MAX_WORKERS, JOB_DEADLINE
+)
+from .browser_pool import browser_pool as shared_browser_pool
+from .phone_cache import phone_cache as shared_phone_cache
+from .stage_timer import stage_timer, percentile
+from .concurrency import AdaptiveConcurrencyController
+from .memory_watchdog import MemoryWatchdog
+from .process_reaper import cancel_event
+from .job_deadline import JobDeadline, JobDeadlineExceeded
+
+MAX_QUOTA_ERRORS = 5  # Trigger pause after this many errors
+
+# Sessions not yet closed, so cleanup can cancel all of them
+open_sessions = WeakSet()
+sessions_lock = Lock()
+
+
+class ScrapeSession:
+    """
+    One scrape run: its executor, concurrency limiter, memory watchdog, Google
+    quota and deadline counters, and hedge stats.
+
+    Browsers come from a BrowserPool and office phones from a PhoneCache, both
+    shared process-wide by default. Several sessions (e.g. different queries)
+    can therefore run at once in one process, reusing the same warm browsers
+    and the same cache file.
+    """
+
+    def __init__(self, pool=None, phone_cache=None, headless=True):
+        """
+        Args:
+            pool: BrowserPool to take browsers from (default: the shared pool)
+            phone_cache: PhoneCache for office phones (default: the shared cache)
+            headless: Run this session's browsers headless
+        """
+        self.pool = pool or shared_browser_pool
+        self.phone_cache = phone_cache or shared_phone_cache
+        self.headless = headless
+        self.cancelled = Event()
+        self.lock = Lock()
+        self.executor = None
+        self.concurrency_controller = None
+        self.memory_watchdog = None
+        self.quota_errors = 0
+        # Jobs killed at JOB_DEADLINE, and how many of those were re-queued
+        self.deadline_overruns = 0
+        self.deadline_requeues = 0
+        self.hedge_stats = {'issued': 0, 'won': 0, 'won_latencies': []}
+        with sessions_lock:
+            open_sessions.add(self)
+
+    @property
+    def is_cancelled(self):
+        """True once this session or the whole process (signal, reaper) was cancelled."""
+        return self.cancelled.is_set() or cancel_event.is_set()
+
+    def start_pool(self, num_workers, adaptive=False):
+        """
+        Set up the concurrency limiter and memory watchdog for a pool of workers.
+
+        Args:
+            num_workers: Fixed pool size, or the starting point when adaptive
+            adaptive: Adjust concurrency between ADAPTIVE_MIN_WORKERS and ADAPTIVE_MAX_WORKERS
+
+        Returns:
+            Number of executor threads to create
+        """
+        if adaptive:
+            self.concurrency_controller = AdaptiveConcurrencyController(
+                floor=ADAPTIVE_MIN_WORKERS, ceiling=ADAPTIVE_MAX_WORKERS, initial=num_workers
+            )
+            print(f"Adaptive concurrency: starting at {self.concurrency_controller.limit} browsers "
+                  f"(range {self.concurrency_controller.floor}-{self.concurrency_controller.ceiling})")
+        else:
+            # Fixed size, but memory pressure can still lower it
+            self.concurrency_controller = AdaptiveConcurrencyController(
+                floor=1, ceiling=num_workers, initial=num_workers, adaptive=False
+            )
+        self.memory_watchdog = MemoryWatchdog(self.pool.snapshot, controller=self.concurrency_controller).start()
+        return self.concurrency_controller.ceiling
+
+    def stop_pool(self, adaptive=False):
+        """Stop the watchdog and print the concurrency and deadline summary for this session."""
+        self.executor = None
+        if self.memory_watchdog is not None:
+            self.memory_watchdog.stop()
+            self.memory_watchdog.print_report()
+            self.memory_watchdog = None
+
+        controller = self.concurrency_controller
+        if controller is not None:
+            stats = controller.get_stats()
+            if adaptive:
+                print(f"\nAdaptive concurrency: final {stats['limit']} browsers, peak {stats['peak_active']} active, "
+                      f"{stats['decisions']} adjustments")
+            elif stats['decisions']:
+                print(f"\nConcurrency lowered to {stats['limit']} browsers under memory pressure")
+            self.concurrency_controller = None
+        if self.deadline_overruns:
+            print(f"Deadline overruns: {self.deadline_overruns} jobs killed at {JOB_DEADLINE}s, "
+                  f"{self.deadline_requeues} re-queued")
+
+    def scrape_job(self, job_url, job_num, total_jobs, progress=None, task=None):
+        """
+        Scrape a single job on a pooled browser (for parallel execution).
+
+        Args:
+            progress: Optional dict filled with 'started', 'elapsed' and the job's 'deadline',
+                so the dispatcher can spot stragglers and abort a losing hedge
+            task: Optional callable(driver, job_url, outcome) run on the browser instead of
+                the full scrape (e.g. the pipeline's fetch step); its return value is the result
+        """
+        if self.is_cancelled:
+            return None
+        if progress is None:
+            progress = {}
+
+        controller = self.concurrency_controller
+        outcome = {}
+        deadline = JobDeadline(JOB_DEADLINE)
+        progress['deadline'] = deadline
+        if controller is None:
+            progress['started'] = time.perf_counter()
+            try:
+                with deadline, stage_timer.time('job.total'):
+                    return self._scrape_job(job_url, job_num, outcome, deadline, task)
+            finally:
+                progress['elapsed'] = time.perf_counter() - progress['started']
+
+        # Wait for a slot so the controller decides how many browsers run at once
+        with controller.slot():
+            start = progress['started'] = time.perf_counter()
+            try:
+                # The deadline only starts once the job has a slot
+                with deadline, stage_timer.time('job.total'):
+                    return self._scrape_job(job_url, job_num, outcome, deadline, task)
+            finally:
+                progress['elapsed'] = time.perf_counter() - start
+                if not deadline.aborted:
+                    error = outcome.get('error')
+                    controller.record(progress['elapsed'], error=error is not None, timeout=error == 'timeout')
+
+    def _discard(self, driver, recycled=False):
+        self.pool.discard(driver)
+        watchdog = self.memory_watchdog
+        if watchdog is not None:
+            watchdog.forget(driver, recycled=recycled)
+
+    def _scrape_job(self, job_url, job_num, outcome, deadline, task=None):
+        """
+        Body of scrape_job; failures are reported through the outcome dict.
+
+        Raises:
+            JobDeadlineExceeded: The job ran past JOB_DEADLINE and its browser was killed
+        """
+        driver = None
+        try:
+            driver = self.pool.acquire(headless=self.headless)
+            deadline.watch(driver)
+
+            if task is not None:
+                job_data = task(driver, job_url, outcome)
+            else:
+                job_data = scrape_job_details(driver, job_url, outcome)
+                # If job was not filtered, get the office phone
+                if job_data is not None:
+                    self.add_office_phone(job_data, driver)
+
+            # Steps swallow their own errors, so a killed browser can still get here
+            if deadline.aborted:
+                self._discard(driver)
+                return None
+            if deadline.expired:
+                raise JobDeadlineExceeded(f"Job #{job_num} ran past its {JOB_DEADLINE}s deadline")
+
+            watchdog = self.memory_watchdog
+            if watchdog is not None and watchdog.needs_recycle(driver):
+                print(f"  [Job #{job_num}] Recycling browser (memory limit)")
+                self._discard(driver, recycled=True)
+            else:
+                self.pool.release(driver)
+
+            if task is not None:
+                return job_data
+            if job_data is None:
+                print(f"  [Job #{job_num}] Filtered")
+                return None
+
+            office_phone_status = " (phone)" if job_data.get('office_phone') else ""
+            print(f"  [Job #{job_num}] Completed{office_phone_status}")
+            return job_data
+        except Exception as e:
+            # A failed job may leave the browser in a bad state - start fresh next time
+            if driver:
+                self._discard(driver)
+            if self.is_cancelled or deadline.aborted:
+                return None
+            if deadline.expired:
+                outcome['error'] = 'timeout'
+                with self.lock:
+                    self.deadline_overruns += 1
+                print(f"  ✗ [Job #{job_num}] Deadline of {JOB_DEADLINE}s exceeded - browser killed")
+                raise JobDeadlineExceeded(f"Job #{job_num} ran past its {JOB_DEADLINE}s deadline")
+            outcome['error'] = 'timeout' if 'timeout' in type(e).__name__.lower() else 'error'
+            print(f"  ✗ [Job #{job_num}] Failed: {e}")
+            return create_empty_job_data(job_url)
+
+    def add_office_phone(self, job_data, driver=None):
+        """
+        Fill in job_data['office_phone'] from the phone cache or a Google search (if enabled).
+
+        Args:
+            job_data: Job data dict that passed the filters
+            driver: Browser to search Google with; if None, one is taken from the pool
+                only when the phone is not cached
+        """
+        company = job_data.get('company', '')
+        location = job_data.get('location', '')
+        if not ENABLE_GOOGLE_ENRICHMENT or not company or company == 'N/A':
+            return
+
+        # Check persistent cache first
+        with stage_timer.time('cache.phone_lookup'):
+            cached_phone = self.phone_cache.get(company)
+        if cached_phone is not None:
+            job_data['office_phone'] = cached_phone
+            return
+
+        # Not in cache, search Google
+        if driver is not None:
+            self._search_office_phone(job_data, company, location, driver)
+            return
+
+        # A browser of its own counts against the concurrency limit and gets the job deadline
+        controller = self.concurrency_controller
+        with controller.slot() if controller is not None else nullcontext(), JobDeadline(JOB_DEADLINE) as deadline:
+            if self.is_cancelled:
+                return
+            found = False
+            try:
+                driver = self.pool.acquire(headless=self.headless)
+                deadline.watch(driver)
+                found = self._search_office_phone(job_data, company, location, driver, deadline)
+            except Exception as e:
+                print(f"  WARNING: No browser for the office phone search: {e}")
+                job_data['office_phone'] = ''
+            if driver is None:
+                return
+            watchdog = self.memory_watchdog
+            if not found:
+                # A failed or killed search may leave the browser in a bad state
+                self._discard(driver)
+            elif watchdog is not None and watchdog.needs_recycle(driver):
+                self._discard(driver, recycled=True)
+            else:
+                self.pool.release(driver)
+
+    def _search_office_phone(self, job_data, company, location, driver, deadline=None):
+        """
+        Search Google for the office phone and store it in the phone cache.
+
+        Returns:
+            True if the search finished, False if it failed or ran past the deadline
+        """
+        try:
+            with stage_timer.time('google.enrichment'):
+                office_phone = search_google_business_phone(driver, company, location)
+            if deadline is not None and deadline.expired:
+                raise JobDeadlineExceeded(f"Office phone search ran past its {JOB_DEADLINE}s deadline")
+            job_data['office_phone'] = office_phone
+            # Save to persistent cache
+            with stage_timer.time('cache.phone_store'):
+                self.phone_cache.set(company, office_phone, location)
+            return True
+        except Exception as google_err:
+            if deadline is not None and deadline.expired:
+                with self.lock:
+                    self.deadline_overruns += 1
+                print(f"  ✗ Office phone search for {company}: deadline of {JOB_DEADLINE}s exceeded - browser killed")
+            elif 'quota' in str(google_err).lower() or 'rate' in str(google_err).lower():
+                with self.lock:
+                    self.quota_errors += 1
+                    print(f"  WARNING: Quota error ({self.quota_errors}/{MAX_QUOTA_ERRORS})")
+            job_data['office_phone'] = ''
+            return False
+
+    def submit(self, executor, job_url, job_num, total_jobs, task=None):
+        """Submit scrape_job, keeping its progress record on the future for the dispatcher."""
+        progress = {}
+        future = executor.submit(self.scrape_job, job_url, job_num, total_jobs, progress=progress, task=task)
+        future.progress = progress
+        return future
+
+    def quota_exceeded(self):
+        """Check if the Google quota error threshold was reached."""
+        with self.lock:
+            return self.quota_errors >= MAX_QUOTA_ERRORS
+
+    def wait_for_quota_reset(self, wait_minutes=5):
+        """Wait for Google quota to reset."""
+        print(f"\n{'='*60}")
+        print(f"GOOGLE QUOTA LIMIT - Pausing for {wait_minutes} minutes")
+        print(f"{'='*60}\n")
+
+        # Browsers busy with other sessions' jobs are left alone
+        self.pool.close_idle()
+
+        for remaining in range(wait_minutes * 60, 0, -30):
+            mins = remaining // 60
+            secs = remaining % 60
+            print(f"Resuming in: {mins:02d}:{secs:02d}", end='\r', flush=True)
+            time.sleep(30)
+
+        print("\n\nQuota reset! Restarting browsers...\n")
+
+        with self.lock:
+            self.quota_errors = 0
+
+    def print_hedge_report(self):
+        """Print how many hedges were issued and won, and how long hedged jobs took."""
+        with self.lock:
+            issued = self.hedge_stats['issued']
+            won = self.hedge_stats['won']
+            won_latencies = sorted(self.hedge_stats['won_latencies'])
+        if not issued:
+            return
+        line = f"Hedging: {issued} issued, {won} won"
+        if won_latencies:
+            line += f" (won jobs finished {percentile(won_latencies, 50):.1f}s after their first attempt started)"
+        print(line)
+
+    def cancel(self):
+        """Stop queued jobs of this session; running ones return as soon as they notice."""
+        self.cancelled.set()
+        executor = self.executor
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def close(self):
+        """End the session; the last open session quits the pooled browsers."""
+        with sessions_lock:
+            open_sessions.discard(self)
+            last = not open_sessions
+        if last:
+            self.pool.close_all()
+        else:
+            self.pool.close_idle()
+
+
+def cancel_all_sessions():
+    """Cancel every open session (used when the whole process is shutting down)."""
+    with sessions_lock:
+        sessions = list(open_sessions)
+    for session in sessions:
+        session.cancel()
@@ -0,0 +1,79 @@
+"""JSON files in cache/ shared by several scraper processes (e.g. scaled worker containers)."""
+
+import json
+import os
+from contextlib import contextmanager
+
+try:
+    import fcntl
+except ImportError:  # Not POSIX: one scraper per cache directory
+    fcntl = None
+
+
+@contextmanager
+def locked(path):
+    """
+    Hold an exclusive lock on path (through path.lock) for a read-modify-write.
+
+    Other processes, and other threads opening the lock themselves, wait until
+    the body is done.
+    """
+    if fcntl is None:
+        yield
+        return
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    with open(f"{path}.lock", 'a') as lock_file:
+        fcntl.flock(lock_file, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+def read_json(path):
+    """Return the JSON object stored at path, or {} if it is missing or unreadable."""
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except Exception:
+        return {}
+
+
+def merge_into_file(path, data, changed, **dump_kwargs):
+    """
+    Write the keys this process changed into the JSON object at path, keeping everyone else's.
+
+    Under the file lock, the file is read back, each key in changed is set from
+    data (or removed if data no longer has it), and the result is written
+    atomically. Keys not in changed keep what is on disk, so processes sharing
+    cache/ (e.g. scaled worker containers) never drop each other's entries, and
+    a caller that adopts the returned object picks up what the others saved.
+
+    Args:
+        path: JSON file holding one object
+        data: This process's copy of the object
+        changed: Keys added, updated or removed in data since the last merge; a tuple
+            of keys names a nested entry, e.g. (field, selector)
+        dump_kwargs: Passed to json.dump (e.g. indent)
+
+    Returns:
+        The merged object, now on disk, for the caller to adopt
+    """
+    with locked(path):
+        merged = read_json(path)
+        for key in changed:
+            keys = key if isinstance(key, tuple) else (key,)
+            source, target = data, merged
+            for part in keys[:-1]:
+                source = source.get(part, {})
+                target = target.setdefault(part, {})
+            if keys[-1] in source:
+                target[keys[-1]] = source[keys[-1]]
+            else:
+                target.pop(keys[-1], None)
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        tmp_file = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_file, 'w', encoding='utf-8') as f:
+            json.dump(merged, f, **dump_kwargs)
+        os.replace(tmp_file, path)
+    return merged
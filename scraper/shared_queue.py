@@ -0,0 +1,260 @@
+"""Work queue shared between a coordinator and worker processes (distributed mode)."""
+
+import json
+import os
+import sqlite3
+import time
+from abc import ABC, abstractmethod
+from threading import local
+from .config import SHARED_QUEUE_URL, WORK_LEASE_SECONDS, WORK_MAX_ATTEMPTS
+
+
+class SharedJobQueue(ABC):
+    """
+    Jobs handed out to worker processes by lease.
+
+    The coordinator reopens the queue when it starts collecting, adds jobs and
+    closes it once link collection is done. Workers lease jobs, renew their leases while scraping and complete
+    each job with its result (None if it was filtered out). A lease that is
+    not renewed in time expires and the job is handed to another worker;
+    after max_attempts lost leases it is marked failed.
+
+    Backends subclass this and are registered in BACKENDS.
+    """
+
+    @abstractmethod
+    def add(self, jobs):
+        """
+        Queue jobs that are not in the queue yet.
+
+        Args:
+            jobs: List of dicts with 'job_id', 'url', 'job_num' and optionally 'company'
+
+        Returns:
+            Number of jobs added
+        """
+
+    @abstractmethod
+    def lease(self, worker_id, count=1, lease_seconds=WORK_LEASE_SECONDS):
+        """Lease up to count queued jobs; returns a list of job dicts."""
+
+    @abstractmethod
+    def renew(self, worker_id, job_ids, lease_seconds=WORK_LEASE_SECONDS):
+        """Extend the leases a worker still holds."""
+
+    @abstractmethod
+    def release(self, worker_id, job_ids):
+        """Return leased jobs to the queue without counting an attempt (graceful shutdown)."""
+
+    @abstractmethod
+    def complete(self, worker_id, job_id, job_data):
+        """Store a job's result. The first result wins, even from a worker whose lease expired."""
+
+    @abstractmethod
+    def close(self):
+        """Mark link collection as done: workers stop once nothing is queued or leased."""
+
+    @abstractmethod
+    def reopen(self):
+        """Mark link collection as running again (a resumed run), keeping the jobs already queued or done."""
+
+    @abstractmethod
+    def reset(self):
+        """Drop every job and reopen the queue (start a new run)."""
+
+    @abstractmethod
+    def finished(self):
+        """True once the queue is closed and every job is done or failed."""
+
+    @abstractmethod
+    def results(self):
+        """Yield the job data of every completed job that passed the filters."""
+
+    @abstractmethod
+    def get_stats(self):
+        """Return job counts per state and the number of workers holding leases."""
+
+
+class SqliteJobQueue(SharedJobQueue):
+    """
+    SharedJobQueue in a SQLite file, e.g. on a volume shared by containers on one host.
+
+    Leases are taken in an immediate (write-locked) transaction, so two workers
+    never lease the same job. Uses the rollback journal rather than WAL, which
+    needs shared memory and breaks on network filesystems.
+    """
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS jobs (
+            job_id TEXT PRIMARY KEY,
+            url TEXT NOT NULL,
+            job_num INTEGER,
+            company TEXT,
+            state TEXT NOT NULL DEFAULT 'queued',
+            worker TEXT,
+            lease_expires REAL,
+            attempts INTEGER NOT NULL DEFAULT 0,
+            result TEXT,
+            finished_at REAL
+        );
+        CREATE INDEX IF NOT EXISTS jobs_state ON jobs (state, job_num);
+        CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT);
+    """
+
+    def __init__(self, path, max_attempts=WORK_MAX_ATTEMPTS):
+        self.path = path
+        self.max_attempts = max_attempts
+        self.local = local()
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        self._connect().executescript(self.SCHEMA)
+
+    def _connect(self):
+        """Return this thread's connection (sqlite3 connections are not shared across threads)."""
+        connection = getattr(self.local, 'connection', None)
+        if connection is None:
+            connection = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            connection.row_factory = sqlite3.Row
+            self.local.connection = connection
+        return connection
+
+    def _write(self, func):
+        """Run func(connection) in an immediate transaction, so concurrent workers take turns."""
+        connection = self._connect()
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            result = func(connection)
+            connection.execute("COMMIT")
+            return result
+        except:
+            connection.execute("ROLLBACK")
+            raise
+
+    def add(self, jobs):
+        rows = [(job['job_id'], job['url'], job.get('job_num'), job.get('company', '')) for job in jobs]
+
+        def insert(connection):
+            before = connection.total_changes
+            connection.executemany("INSERT OR IGNORE INTO jobs (job_id, url, job_num, company) VALUES (?, ?, ?, ?)", rows)
+            return connection.total_changes - before
+
+        return self._write(insert)
+
+    def _expire_leases(self, connection, now):
+        """Requeue jobs whose worker stopped renewing them, failing those out of attempts."""
+        connection.execute(
+            "UPDATE jobs SET state = 'failed', worker = NULL, finished_at = ? "
+            "WHERE state = 'leased' AND lease_expires < ? AND attempts >= ?",
+            (now, now, self.max_attempts))
+        expired = connection.execute(
+            "UPDATE jobs SET state = 'queued', worker = NULL WHERE state = 'leased' AND lease_expires < ?",
+            (now,)).rowcount
+        if expired:
+            connection.execute(
+                "INSERT INTO meta (key, value) VALUES ('requeued', ?) "
+                "ON CONFLICT (key) DO UPDATE SET value = value + excluded.value", (expired,))
+
+    def lease(self, worker_id, count=1, lease_seconds=WORK_LEASE_SECONDS):
+        def take(connection):
+            now = time.time()
+            self._expire_leases(connection, now)
+            rows = connection.execute(
+                "SELECT job_id, url, job_num, company FROM jobs WHERE state = 'queued' ORDER BY job_num LIMIT ?",
+                (count,)).fetchall()
+            connection.executemany(
+                "UPDATE jobs SET state = 'leased', worker = ?, lease_expires = ?, attempts = attempts + 1 WHERE job_id = ?",
+                [(worker_id, now + lease_seconds, row['job_id']) for row in rows])
+            return [dict(row) for row in rows]
+
+        return self._write(take)
+
+    def renew(self, worker_id, job_ids, lease_seconds=WORK_LEASE_SECONDS):
+        if not job_ids:
+            return
+        expires = time.time() + lease_seconds
+        self._write(lambda connection: connection.executemany(
+            "UPDATE jobs SET lease_expires = ? WHERE job_id = ? AND worker = ? AND state = 'leased'",
+            [(expires, job_id, worker_id) for job_id in job_ids]))
+
+    def release(self, worker_id, job_ids):
+        if not job_ids:
+            return
+        self._write(lambda connection: connection.executemany(
+            "UPDATE jobs SET state = 'queued', worker = NULL, attempts = attempts - 1 "
+            "WHERE job_id = ? AND worker = ? AND state = 'leased'",
+            [(job_id, worker_id) for job_id in job_ids]))
+
+    def complete(self, worker_id, job_id, job_data):
+        result = json.dumps(job_data, ensure_ascii=False, default=str) if job_data is not None else None
+        self._write(lambda connection: connection.execute(
+            "UPDATE jobs SET state = 'done', worker = ?, result = ?, finished_at = ? "
+            "WHERE job_id = ? AND state != 'done'",
+            (worker_id, result, time.time(), job_id)))
+
+    def close(self):
+        self._write(lambda connection: connection.execute(
+            "INSERT OR REPLACE INTO meta (key, value) VALUES ('closed', '1')"))
+
+    def reopen(self):
+        self._write(lambda connection: connection.execute("DELETE FROM meta WHERE key = 'closed'"))
+
+    def reset(self):
+        def clear(connection):
+            connection.execute("DELETE FROM jobs")
+            connection.execute("DELETE FROM meta")
+
+        self._write(clear)
+
+    def finished(self):
+        connection = self._connect()
+        closed = connection.execute("SELECT value FROM meta WHERE key = 'closed'").fetchone()
+        if closed is None:
+            return False
+        pending = connection.execute(
+            "SELECT COUNT(*) FROM jobs WHERE state IN ('queued', 'leased')").fetchone()[0]
+        return pending == 0
+
+    def results(self):
+        cursor = self._connect().execute(
+            "SELECT result FROM jobs WHERE state = 'done' AND result IS NOT NULL ORDER BY job_num")
+        for row in cursor:
+            yield json.loads(row['result'])
+
+    def get_stats(self):
+        connection = self._connect()
+        counts = dict(connection.execute("SELECT state, COUNT(*) FROM jobs GROUP BY state").fetchall())
+        kept = connection.execute(
+            "SELECT COUNT(*) FROM jobs WHERE state = 'done' AND result IS NOT NULL").fetchone()[0]
+        workers = connection.execute(
+            "SELECT COUNT(DISTINCT worker) FROM jobs WHERE state = 'leased'").fetchone()[0]
+        requeued = connection.execute("SELECT value FROM meta WHERE key = 'requeued'").fetchone()
+        return {
+            'queued': counts.get('queued', 0),
+            'leased': counts.get('leased', 0),
+            'done': counts.get('done', 0),
+            'kept': kept,
+            'failed': counts.get('failed', 0),
+            'workers': workers,
+            'requeued': int(requeued[0]) if requeued else 0,
+        }
+
+
+# Queue backends by URL scheme, e.g. sqlite:///cache/work_queue.db
+BACKENDS = {
+    'sqlite': lambda location: SqliteJobQueue(location),
+}
+
+
+def open_shared_queue(url=SHARED_QUEUE_URL):
+    """
+    Open the shared queue a URL points to.
+
+    Args:
+        url: '<backend>://<location>', e.g. 'sqlite:///cache/work_queue.db' (relative path)
+            or 'sqlite:////data/work_queue.db' (absolute path)
+    """
+    scheme, separator, location = url.partition('://')
+    if not separator or scheme not in BACKENDS:
+        raise ValueError(f"Unknown shared queue '{url}' (backends: {', '.join(BACKENDS)})")
+    if scheme == 'sqlite' and location.startswith('/'):
+        location = location[1:]
+    return BACKENDS[scheme](location)
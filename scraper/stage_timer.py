@@ -0,0 +1,109 @@
+"""Lightweight per-stage timing for scraper runs."""
+
+import json
+import time
+from contextlib import contextmanager
+from functools import wraps
+from threading import Lock
+
+
+def percentile(sorted_values, pct):
+    """Return the pct-th percentile (0-100) of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(round(pct / 100 * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+class StageTimer:
+    """Thread-safe collection of duration samples per named stage."""
+
+    def __init__(self):
+        self.lock = Lock()
+        self.samples = {}
+        self.started_at = time.time()
+
+    def reset(self):
+        """Drop all samples and restart the wall clock."""
+        with self.lock:
+            self.samples = {}
+            self.started_at = time.time()
+
+    def record(self, stage, seconds):
+        """Record one duration sample (in seconds) for a stage."""
+        with self.lock:
+            self.samples.setdefault(stage, []).append(seconds)
+
+    @contextmanager
+    def time(self, stage):
+        """Context manager that records how long its body took."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(stage, time.perf_counter() - start)
+
+    def timed(self, stage):
+        """Decorator that records every call of the wrapped function."""
+        def decorator(func):
+            @wraps(func)
+            def wrapper(*args, **kwargs):
+                with self.time(stage):
+                    return func(*args, **kwargs)
+            return wrapper
+        return decorator
+
+    def get_report(self):
+        """
+        Summarise the samples as histograms.
+
+        Returns:
+            Dict with wall time and per-stage count, total, mean, p50, p95 and max (seconds)
+        """
+        with self.lock:
+            snapshot = {stage: sorted(values) for stage, values in self.samples.items()}
+            wall_time = time.time() - self.started_at
+
+        stages = {}
+        for stage, values in snapshot.items():
+            total = sum(values)
+            stages[stage] = {
+                'count': len(values),
+                'total': round(total, 3),
+                'mean': round(total / len(values), 3),
+                'p50': round(percentile(values, 50), 3),
+                'p95': round(percentile(values, 95), 3),
+                'max': round(values[-1], 3),
+            }
+
+        return {'wall_time': round(wall_time, 3), 'stages': stages}
+
+    def print_report(self):
+        """Print where the time went, slowest stages (by total time) first."""
+        report = self.get_report()
+        stages = sorted(report['stages'].items(), key=lambda item: item[1]['total'], reverse=True)
+
+        print("\n" + "=" * 78)
+        print(f"PERFORMANCE REPORT (wall time: {report['wall_time']:.1f}s)")
+        print("=" * 78)
+        if not stages:
+            print("No timings recorded.")
+        else:
+            print(f"{'Stage':<26}{'Count':>8}{'Total(s)':>11}{'p50(s)':>9}{'p95(s)':>9}{'Max(s)':>9}")
+            for stage, stats in stages:
+                print(f"{stage:<26}{stats['count']:>8}{stats['total']:>11.1f}"
+                      f"{stats['p50']:>9.2f}{stats['p95']:>9.2f}{stats['max']:>9.2f}")
+        print("=" * 78)
+
+    def save_report(self, path):
+        """Write the report as JSON (e.g. next to the Excel output)."""
+        try:
+            with open(path, 'w', encoding='utf-8') as f:
+                json.dump(self.get_report(), f, indent=2)
+            print(f"Performance report saved to: {path}")
+        except Exception as e:
+            print(f"WARNING: Could not save performance report: {e}")
+
+
+# Global singleton instance
+stage_timer = StageTimer()
@@ -1,12 +1,14 @@
 """Streaming link collection that yields links as they're discovered."""
 
-from .page_parser import get_job_links_on_page, click_next_page
+from .page_parser import get_job_links_on_page, get_job_cards_on_page, click_next_page
 from .url_builder import build_search_url
-from .config import MAX_PAGES
-import time
+from .config import MAX_PAGES, CAPTURE_NETWORK
+from .network_capture import get_search_results
+from .request_blocking import measure_page_weight
+from .stage_timer import stage_timer
 
 
-def stream_job_links(driver, end_job, start_page=1, sort_by_date=False, end_page=None):
+def stream_job_links(driver, end_job, start_page=1, sort_by_date=False, end_page=None, location=None, filters=None, card_info=None, frontier=None):
     """
     Stream job links from search result pages as they're collected.
     Yields links in batches to allow parallel scraping to start immediately.
@@ -20,6 +22,11 @@ def stream_job_links(driver, end_job, start_page=1, sort_by_date=False, end_page
         start_page: Page number to start from (default: 1). Use for page-based collection.
         sort_by_date: Sort by listing date when navigating (default: False)
         end_page: Page number to stop at (inclusive). If None, uses end_job as link count threshold.
+        location: Optional location slug overriding LOCATION (used by query shards)
+        filters: Optional dict of extra search query parameters (used by query shards)
+        card_info: Optional dict filled with url -> advertiser name from the search cards
+        frontier: Optional LinkFrontier; pages it already holds for this search are replayed
+            without the browser, and each newly harvested page is recorded in it
     
     Yields:
         Batches of job URLs (one batch per page)
@@ -33,12 +40,28 @@ def stream_job_links(driver, end_job, start_page=1, sort_by_date=False, end_page
     if end_page is not None:
         print(f"  Will collect through page {end_page}")
     
-    # If start_page > 1, navigate directly to that page
-    if start_page > 1:
-        start_url = build_search_url(sort_by_date=sort_by_date, page=start_page)
+    search_key = build_search_url(sort_by_date=sort_by_date, page=1, location=location, filters=filters)
+    if frontier is not None:
+        pages, page_num, complete = frontier.replay(search_key, start_page, end_page)
+        for _, jobs in pages:
+            if card_info is not None:
+                for job_url, company in jobs:
+                    card_info[job_url] = company
+            unique_links = [job_url for job_url, _ in jobs if job_url not in all_collected]
+            all_collected.extend(unique_links)
+            if unique_links:
+                yield unique_links
+        if pages:
+            print(f"  Reused pages {start_page}-{page_num - 1} from the link frontier ({len(all_collected)} links)")
+        if complete or (end_page is None and len(all_collected) >= end_job):
+            print("  Link frontier is fresh and covers this search - skipping collection.")
+            return
+    
+    # If starting past page 1 (or resuming) or this is a narrowed search, navigate directly to that page
+    if page_num > 1 or location or filters:
+        start_url = build_search_url(sort_by_date=sort_by_date, page=page_num, location=location, filters=filters)
         print(f"  Navigating to: {start_url}")
         driver.get(start_url)
-        time.sleep(1)
     
     while True:
         # Check if we've reached the end page (if specified for page-based search)
@@ -52,7 +75,18 @@ def stream_job_links(driver, end_job, start_page=1, sort_by_date=False, end_page
             break
         
         print(f"  Scraping page {page_num}... (collected {len(all_collected)} links so far)")
-        links = get_job_links_on_page(driver)
+        with stage_timer.time('search.links'):
+            if card_info is not None:
+                cards = get_job_cards_on_page(driver)
+                links = [card['url'] for card in cards]
+                for card in cards:
+                    card_info[card['url']] = card['company']
+            else:
+                links = get_job_links_on_page(driver)
+        measure_page_weight(driver, 'search')
+        if frontier is not None and links:
+            frontier.record_page(search_key, page_num,
+                                 [(link, card_info.get(link, '') if card_info is not None else '') for link in links])
         
         if not links:
             print(f"  No links found on page {page_num}")
@@ -64,10 +98,9 @@ def stream_job_links(driver, end_job, start_page=1, sort_by_date=False, end_page
                 print(f"  WARNING: No links on page {page_num}, but target is page {end_page}. Attempting direct navigation...")
                 next_page_num = page_num + 1
                 try:
-                    fallback_url = build_search_url(sort_by_date=False, page=next_page_num)
+                    fallback_url = build_search_url(sort_by_date=False, page=next_page_num, location=location, filters=filters)
                     print(f"  Attempting direct navigation to page {next_page_num}...")
                     driver.get(fallback_url)
-                    time.sleep(1)
                     page_num = next_page_num
                     continue
                 except Exception as e:
@@ -85,22 +118,32 @@ def stream_job_links(driver, end_job, start_page=1, sort_by_date=False, end_page
         if unique_links:
             yield unique_links
         
-        next_page_clicked = click_next_page(driver)
+        # The search payload knows when this is the last page, so skip looking for a Next button
+        if CAPTURE_NETWORK:
+            search = get_search_results(driver)
+            if search and search['has_next'] is False:
+                print(f"  Last page reached (page {page_num}, {search['total']} jobs in total).")
+                if frontier is not None:
+                    frontier.mark_complete(search_key)
+                break
+        
+        with stage_timer.time('search.next_page'):
+            next_page_clicked = click_next_page(driver)
         if not next_page_clicked:
             if end_page is not None and page_num < end_page:
                 print(f"  WARNING: Failed to click next page, but target is page {end_page}. Attempting direct navigation...")
                 next_page_num = page_num + 1
                 if next_page_num <= end_page:
                     try:
-                        fallback_url = build_search_url(sort_by_date=False, page=next_page_num)
+                        fallback_url = build_search_url(sort_by_date=False, page=next_page_num, location=location, filters=filters)
                         print(f"  Attempting direct navigation to page {next_page_num}...")
                         driver.get(fallback_url)
-                        time.sleep(1)
                         page_num = next_page_num
                         continue
                     except Exception as e:
                         print(f"  Direct navigation failed: {e}")
             
+            # Not recorded as complete: a failed click can be transient, so the next run retries this page
             print("  No more pages available.")
             break
         
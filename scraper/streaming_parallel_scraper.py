@@ -1,145 +1,278 @@
 """Streaming parallel scraper that starts processing immediately."""
 
-from concurrent.futures import ThreadPoolExecutor, as_completed
-from threading import Lock
+from collections import deque
+from concurrent.futures import wait, FIRST_COMPLETED
+from threading import Lock, Thread
 import pandas as pd
 import signal
 import time
 from datetime import datetime, timedelta
-from .driver_setup import setup_driver
-from .job_scraper import scrape_job_details, create_empty_job_data
-from .google_enrichment import search_google_business_phone
-from .config import COLUMNS, ENABLE_GOOGLE_ENRICHMENT, CHECKPOINT_INTERVAL
+from .config import (
+    COLUMNS, ENABLE_GOOGLE_ENRICHMENT, CHECKPOINT_INTERVAL, SAVE_TIMING_REPORT, JOB_MAX_RETRIES,
+    RESULT_POLL_INTERVAL, ENABLE_HEDGING, HEDGE_PERCENTILE, HEDGE_MIN_SAMPLES, HEDGE_MAX_RATIO,
+    HEDGE_CHECK_INTERVAL, WORK_QUEUE_SIZE, SPILL_WORK_QUEUE, SCHEDULER_SCORERS, SCRAPE_TIME_BUDGET,
+    ADVERTISER_CACHE, LINK_FRONTIER
+)
 from .streaming_collector import stream_job_links
-from .link_collector import filter_job_range
+from .frontier import link_frontier
+from .query_sharding import stream_sharded_job_links, print_coverage_report
 from .resume_manager import ResumeManager
-from .phone_cache import PhoneCache
+from .job_queue import BoundedJobQueue
+from .scheduler import build_priority
+from .result_sink import JsonlResultSink
+from .stage_timer import stage_timer, percentile
+from .readiness import readiness
+from .selector_registry import selector_registry
+from .request_blocking import page_weight
+from .http_cache import response_cache
+from .advertiser_cache import advertiser_cache
+from .browser_pool import browser_pool
+from .session import ScrapeSession, cancel_all_sessions, open_sessions
+from .pipeline import ScrapePipeline
+from .process_reaper import reap_owned
+from .job_deadline import JobDeadlineExceeded
 
 # Thread-safe lock for data collection
 data_lock = Lock()
-# Persistent cache for company phone numbers
-phone_cache = PhoneCache()
-# Global executor for cleanup
-current_executor = None
-active_drivers = []
-drivers_lock = Lock()
-# Quota error tracking
-quota_errors = 0
-quota_lock = Lock()
-MAX_QUOTA_ERRORS = 5  # Trigger pause after this many errors
+# Session for callers that don't bring their own (created on first use)
+default_session = None
+
+
+def get_default_session(headless=True):
+    """Return the process's default ScrapeSession, creating it if there is none or it was closed."""
+    global default_session
+    if default_session is None or default_session not in open_sessions:
+        default_session = ScrapeSession(headless=headless)
+    return default_session
 
 
 def cleanup_all_browsers():
-    """Force cleanup of all active browser instances."""
-    global current_executor, active_drivers
+    """Cancel every session: stop queued jobs, interrupt in-flight ones and close every browser."""
+    global default_session
     
-    # Shutdown executor
-    if current_executor:
-        current_executor.shutdown(wait=False, cancel_futures=True)
+    # Queued jobs see the flag and return without starting a browser
+    cancel_all_sessions()
     
-    # Close all active drivers
-    with drivers_lock:
-        for driver in active_drivers:
-            try:
-                driver.quit()
-            except:
-                pass
-        active_drivers.clear()
+    # Kill process groups first so workers blocked in driver.get() fail fast
+    reap_owned()
+    browser_pool.close_all()
+    default_session = None
+
 
+def submit_job(executor, job_url, job_num, total_jobs, headless=True, session=None):
+    """Submit a job to a session (default: the process's default session), keeping its progress record on the future."""
+    session = session or get_default_session(headless)
+    return session.submit(executor, job_url, job_num, total_jobs)
 
-def wait_for_quota_reset(wait_minutes=5):
-    """Wait for Google quota to reset."""
-    global quota_errors
+
+class JobDispatcher:
+    """
+    Tracks submitted jobs and turns finished futures into results.
     
-    print(f"\n{'='*60}")
-    print(f"GOOGLE QUOTA LIMIT - Pausing for {wait_minutes} minutes")
-    print(f"{'='*60}\n")
+    Jobs that hit their deadline are re-queued on a fresh browser (up to
+    JOB_MAX_RETRIES). With hedging on, a job running longer than the observed
+    HEDGE_PERCENTILE latency is also started on an idle worker; whichever copy
+    succeeds first wins and the other is aborted. Jobs can be added while
+    earlier ones are still running, so a producer can feed it incrementally.
+    """
     
-    cleanup_all_browsers()
+    def __init__(self, executor, headless=True, hedging=ENABLE_HEDGING, backlog=None, session=None, task=None):
+        """
+        Args:
+            executor: Executor jobs are submitted to
+            headless: Run jobs headless (only used when falling back to the default session)
+            hedging: Launch hedges for stragglers
+            backlog: Optional callable returning how many jobs are still waiting to be
+                submitted; hedges are only launched when it is zero
+            session: ScrapeSession running the jobs (default: the process's default session)
+            task: Optional callable(driver, job_url, outcome) run on the browser instead of
+                the full scrape (see ScrapeSession.scrape_job)
+        """
+        self.executor = executor
+        self.session = session or get_default_session(headless)
+        self.task = task
+        self.hedging = hedging
+        self.backlog = backlog
+        self.job_args = {}  # key -> (job_url, job_num, total_jobs)
+        self.pending = {}  # future -> key
+        self.in_flight = {}  # key -> futures currently running that job
+        self.attempts = {}
+        self.hedged = set()
+        self.latencies = deque(maxlen=200)
+        self.submitted = 0
     
-    for remaining in range(wait_minutes * 60, 0, -30):
-        mins = remaining // 60
-        secs = remaining % 60
-        print(f"Resuming in: {mins:02d}:{secs:02d}", end='\r', flush=True)
-        time.sleep(30)
+    @property
+    def active_jobs(self):
+        """Number of distinct jobs submitted and not yet finished."""
+        return len(self.in_flight)
     
-    print(f"\n\nQuota reset! Restarting browsers...\n")
+    def submit(self, key, job_url, job_num, total_jobs):
+        """Submit a job under a caller-chosen key."""
+        self.submitted += 1
+        self.job_args[key] = (job_url, job_num, total_jobs)
+        self._track(key, self.session.submit(self.executor, job_url, job_num, total_jobs, task=self.task))
     
-    with quota_lock:
-        quota_errors = 0
-
-
-def check_quota_exceeded():
-    """Check if quota threshold reached."""
-    with quota_lock:
-        return quota_errors >= MAX_QUOTA_ERRORS
-
-
-def scrape_job_parallel(job_url, job_num, total_jobs, headless=True):
-    """Scrape a single job in a separate browser instance (for parallel execution)."""
-    global quota_errors
-    driver = None
-    try:
-        driver = setup_driver(headless=headless)
-        
-        # Track driver globally for cleanup
-        with drivers_lock:
-            active_drivers.append(driver)
-        
-        job_data = scrape_job_details(driver, job_url)
+    def adopt(self, futures, job_args):
+        """Track futures that were submitted directly (future -> key, key -> args)."""
+        self.submitted += len(job_args)
+        self.job_args.update(job_args)
+        for future, key in futures.items():
+            self._track(key, future)
+    
+    def _track(self, key, future):
+        self.pending[future] = key
+        self.in_flight.setdefault(key, set()).add(future)
+    
+    def _finish(self, key, future, finished):
+        """Record a job's final future and drop its bookkeeping."""
+        self.in_flight.pop(key, None)
+        self.job_args.pop(key, None)
+        self.attempts.pop(key, None)
+        self.hedged.discard(key)
+        finished.append((key, future))
+    
+    def poll(self, timeout):
+        """
+        Wait up to timeout seconds for jobs to finish.
         
-        # If job was not filtered and Google enrichment is enabled, get office phone
-        if job_data is not None and ENABLE_GOOGLE_ENRICHMENT:
-            company = job_data.get('company', '')
-            location = job_data.get('location', '')
+        Returns:
+            List of (key, future) for jobs that finished or ran out of retries
+        """
+        session = self.session
+        finished = []
+        if self.pending:
+            done, _ = wait(self.pending, timeout=timeout, return_when=FIRST_COMPLETED)
+        else:
+            done = ()
+        for future in done:
+            key = self.pending.pop(future)
+            racing = self.in_flight.get(key, set())
+            racing.discard(future)
+            if future.cancelled():
+                if not racing:
+                    self.in_flight.pop(key, None)
+                continue
+            error = future.exception()
+            elapsed = getattr(future, 'progress', {}).get('elapsed')
+            if error is None and elapsed is not None:
+                self.latencies.append(elapsed)
             
-            if company and company != 'N/A':
-                # Check persistent cache first
-                cached_phone = phone_cache.get(company)
-                
-                if cached_phone is not None:
-                    job_data['office_phone'] = cached_phone
-                else:
-                    # Not in cache, search Google
-                    try:
-                        office_phone = search_google_business_phone(driver, company, location)
-                        job_data['office_phone'] = office_phone
-                        # Save to persistent cache
-                        phone_cache.set(company, office_phone, location)
-                    except Exception as google_err:
-                        if 'quota' in str(google_err).lower() or 'rate' in str(google_err).lower():
-                            with quota_lock:
-                                quota_errors += 1
-                                print(f"  WARNING: Quota error ({quota_errors}/{MAX_QUOTA_ERRORS})")
-                        job_data['office_phone'] = ''
-        
-        driver.quit()
-        
-        with drivers_lock:
-            if driver in active_drivers:
-                active_drivers.remove(driver)
+            if racing:
+                # Another copy of this job is still running
+                if error is not None:
+                    continue
+                for loser in racing:
+                    self.pending.pop(loser, None)
+                    loser.cancel()
+                    loser_deadline = getattr(loser, 'progress', {}).get('deadline')
+                    if loser_deadline is not None:
+                        loser_deadline.abort()
+                racing.clear()
+                if getattr(future, 'is_hedge', False):
+                    with session.lock:
+                        session.hedge_stats['won'] += 1
+                        session.hedge_stats['won_latencies'].append(time.perf_counter() - future.first_started)
+                self._finish(key, future, finished)
+                continue
+            
+            if isinstance(error, JobDeadlineExceeded) and not session.is_cancelled:
+                self.attempts[key] = self.attempts.get(key, 0) + 1
+                if self.attempts[key] <= JOB_MAX_RETRIES:
+                    job_url, job_num, total_jobs = self.job_args[key]
+                    with session.lock:
+                        session.deadline_requeues += 1
+                    print(f"  [Job #{job_num}] Re-queued (retry {self.attempts[key]}/{JOB_MAX_RETRIES})")
+                    self._track(key, session.submit(self.executor, job_url, job_num, total_jobs, task=self.task))
+                    continue
+            self._finish(key, future, finished)
         
-        if job_data is None:
-            print(f"  [Job #{job_num}] Filtered")
-            return None
+        if self.hedging:
+            self._maybe_hedge()
+        return finished
+    
+    def _has_idle_worker(self):
+        """True if nothing is waiting and the concurrency limit leaves room for another job."""
+        if self.backlog is not None and self.backlog():
+            return False
+        if any(not f.running() and not f.done() for f in self.pending):
+            return False
+        controller = self.session.concurrency_controller
+        if controller is None:
+            return True
+        with controller.condition:
+            return controller.active < controller.limit
+    
+    def _maybe_hedge(self):
+        """Duplicate the longest-running straggler onto an idle worker (one per poll keeps hedges rare)."""
+        session = self.session
+        if session.is_cancelled or len(self.latencies) < HEDGE_MIN_SAMPLES:
+            return
+        max_hedges = max(1, int(self.submitted * HEDGE_MAX_RATIO))
+        if session.hedge_stats['issued'] >= max_hedges or not self._has_idle_worker():
+            return
         
-        office_phone_status = " (phone)" if job_data.get('office_phone') else ""
-        print(f"  [Job #{job_num}] Completed{office_phone_status}")
-        return job_data
-    except Exception as e:
-        if driver:
-            try:
-                driver.quit()
-                with drivers_lock:
-                    if driver in active_drivers:
-                        active_drivers.remove(driver)
-            except:
-                pass
-        print(f"  ✗ [Job #{job_num}] Failed: {e}")
-        return create_empty_job_data(job_url)
+        threshold = percentile(sorted(self.latencies), HEDGE_PERCENTILE)
+        now = time.perf_counter()
+        stragglers = [
+            (now - f.progress['started'], f, key) for f, key in self.pending.items()
+            if key not in self.hedged and len(self.in_flight.get(key, ())) == 1
+            and getattr(f, 'progress', {}).get('started') and 'elapsed' not in f.progress
+        ]
+        stragglers = [s for s in stragglers if s[0] > threshold]
+        if not stragglers:
+            return
+        running_for, primary, key = max(stragglers, key=lambda s: s[0])
+        job_url, job_num, total_jobs = self.job_args[key]
+        hedge = session.submit(self.executor, job_url, job_num, total_jobs, task=self.task)
+        hedge.is_hedge = True
+        hedge.first_started = primary.progress['started']
+        self._track(key, hedge)
+        self.hedged.add(key)
+        with session.lock:
+            session.hedge_stats['issued'] += 1
+        print(f"  [Job #{job_num}] Hedging: running {running_for:.1f}s (p{HEDGE_PERCENTILE} {threshold:.1f}s)")
+
+
+def wait_with_requeue(executor, futures, job_args, headless=True, hedging=ENABLE_HEDGING, session=None):
+    """
+    Yield jobs as they finish, re-queueing deadline overruns and hedging stragglers.
+    
+    Waits with a timeout so a hung job can never block the loop indefinitely.
+    
+    Args:
+        executor: Executor the jobs were submitted to
+        futures: Dict of submitted future -> job key (use submit_job so stragglers can be hedged)
+        job_args: Dict of job key -> (job_url, job_num, total_jobs)
+        headless: Run re-queued and hedged jobs headless
+        hedging: Launch hedges for stragglers
+        session: ScrapeSession the jobs were submitted to (default: the process's default
+            session, which is closed once its jobs are done)
+    
+    Yields:
+        (key, future) for every job that finished or ran out of retries
+    """
+    dispatcher = JobDispatcher(executor, headless=headless, hedging=hedging, session=session)
+    dispatcher.adopt(futures, job_args)
+    poll_interval = HEDGE_CHECK_INTERVAL if hedging else RESULT_POLL_INTERVAL
+    try:
+        while dispatcher.pending:
+            for key, future in dispatcher.poll(poll_interval):
+                yield key, future
+    finally:
+        if session is None:
+            # Nothing else closes the default session, and while it is open the
+            # last caller-owned session to close leaves the pooled browsers running
+            dispatcher.session.close()
 
 
-def scrape_jobs_streaming(driver, start_job, end_job, num_workers, filename, use_page_based=False, start_page=1, end_page=None, sort_by_date=False):
+def print_hedge_report(session=None):
+    """Print the hedging summary of a session (default: the process's default session)."""
+    session = session or default_session
+    if session is not None:
+        session.print_hedge_report()
+
+
+def scrape_jobs_streaming(driver, start_job, end_job, num_workers, filename, use_page_based=False, start_page=1, end_page=None, sort_by_date=False, shard_plan=None, adaptive_workers=False, hedging=ENABLE_HEDGING, scorers=SCHEDULER_SCORERS, time_budget=SCRAPE_TIME_BUDGET, session=None):
     """
     Scrape jobs using streaming approach - starts scraping while still collecting links.
     Auto-resumes from checkpoint if available.
@@ -156,111 +289,173 @@ def scrape_jobs_streaming(driver, start_job, end_job, num_workers, filename, use
         start_page: Page number to start from (default: 1)
         end_page: Page number to stop at (inclusive). If None, uses end_job as link count threshold.
         sort_by_date: Sort by listing date when navigating (default: False)
+        shard_plan: Optional plan from plan_shards. When given, links are collected from
+            all shards in parallel and merged by job ID instead of walking one search.
+        adaptive_workers: If True, num_workers is only the starting point and the number of
+            concurrent browsers is adjusted between ADAPTIVE_MIN_WORKERS and ADAPTIVE_MAX_WORKERS.
+        hedging: If True, stragglers past the observed p95 latency are duplicated on idle workers.
+        scorers: Scheduler scorer names ordering queued jobs (see scheduler.SCORERS)
+        time_budget: Seconds after which no new jobs are started (None = no limit)
+        session: ScrapeSession to run in, e.g. one shared with other queries in this process.
+            If None, a session is created for this run and closed at the end.
     
     Returns:
-        Tuple of (all_jobs_data, all_job_urls)
+        Tuple of (all_jobs_data, job_urls) - every job exported so far (this run merged
+        with any checkpoint) and the URLs in the requested range. The progress and results
+        files in cache/ are kept; remove them with ResumeManager.cleanup_progress_file()
+        once the data has been exported.
     """
-    global current_executor
+    own_session = session is None
+    if own_session:
+        session = ScrapeSession(headless=True)
+    advertiser_cache.reset()
+    pool_size = session.start_pool(num_workers, adaptive=adaptive_workers)
     
     # Initialize resume manager
     resume_mgr = ResumeManager(filename)
     
-    all_jobs_data = []
-    all_job_urls = []
+    # Finished jobs go straight to disk; the queue bounds how far collection runs ahead of scraping
+    sink = JsonlResultSink(resume_mgr.results_file)
+    spill_file = resume_mgr.results_file.replace('_results.jsonl', '_queue.jsonl') if SPILL_WORK_QUEUE else None
+    job_queue = BoundedJobQueue(WORK_QUEUE_SIZE, spill_file=spill_file, priority=build_priority(scorers))
+    card_info = {}  # url -> advertiser name from the search cards, for the scorers
+    collection = {'links': 0, 'queued': 0, 'excluded': 0, 'done': False}
+    scraped_urls = []
     completed = 0
+    shard_stats = {}
     
-    # Create thread pool for scraping
-    with ThreadPoolExecutor(max_workers=num_workers) as executor:
-        current_executor = executor
-        futures = {}
-        job_index = 0
-        
-        # Stream links and submit jobs as we get them
-        for batch_links in stream_job_links(driver, end_job, start_page=start_page, sort_by_date=sort_by_date, end_page=end_page):
-            all_job_urls.extend(batch_links)
-            
-            # Submit this batch for scraping immediately
-            for job_url in batch_links:
-                # Calculate actual job number (1-indexed position in ALL jobs)
-                current_job_num = len(all_job_urls) - len(batch_links) + job_index + 1
-                
-                # Only scrape if within requested range AND not already completed
-                if current_job_num >= start_job and current_job_num <= end_job:
-                    if not resume_mgr.is_completed(job_url):
-                        future = executor.submit(scrape_job_parallel, job_url, current_job_num, end_job, headless=True)
-                        futures[future] = len(futures)
-                    else:
+    if shard_plan is not None:
+        link_stream = stream_sharded_job_links(shard_plan, sort_by_date=sort_by_date, stats=shard_stats,
+                                               card_info=card_info)
+    else:
+        link_stream = stream_job_links(driver, end_job, start_page=start_page, sort_by_date=sort_by_date,
+                                       end_page=end_page, card_info=card_info,
+                                       frontier=link_frontier if LINK_FRONTIER else None)
+    
+    def collect_links():
+        """Producer: walk the link stream and queue jobs in range (blocks while the queue is full)."""
+        try:
+            for batch_links in link_stream:
+                for job_url in batch_links:
+                    # Actual job number (1-indexed position in ALL jobs)
+                    collection['links'] += 1
+                    current_job_num = collection['links']
+                    
+                    company = card_info.pop(job_url, '')
+                    
+                    # Only scrape if within requested range AND not already completed
+                    if current_job_num < start_job or current_job_num > end_job:
+                        continue
+                    scraped_urls.append(job_url)
+                    if resume_mgr.is_completed(job_url):
                         print(f"  [Job #{current_job_num}] Already completed (skipped)")
+                    elif ADVERTISER_CACHE and advertiser_cache.should_skip(company):
+                        # Recruiter or large employer every time it was checked: the job would be filtered out
+                        collection['excluded'] += 1
+                    elif not job_queue.put({'url': job_url, 'job_num': current_job_num, 'company': company}):
+                        return
+                    else:
+                        collection['queued'] += 1
+                    if session.is_cancelled:
+                        return
                 
-                job_index += 1
+                print(f"  Batch collected. Queued: {collection['queued']}, Waiting: {len(job_queue)}, "
+                      f"Already done: {len(resume_mgr.completed_urls)}, Known-excluded advertiser: {collection['excluded']}")
             
-            jobs_to_scrape = len(futures)
-            already_done = len(resume_mgr.completed_urls)
-            print(f"  Batch collected. To scrape: {jobs_to_scrape}, Already done: {already_done}")
-        
-        print(f"\nLink collection complete! {len(all_job_urls)} total links found.")
-        print(f"Job range {start_job}-{end_job}: {len(futures)} jobs to scrape")
-        if len(resume_mgr.completed_urls) > 0:
-            print(f"Resuming: {len(resume_mgr.completed_urls)} jobs already completed")
-        print(f"Scraping in progress with {num_workers} parallel browsers...\n")
-        driver.quit()
+            print(f"\nLink collection complete! {collection['links']} total links found.")
+            if shard_plan is not None:
+                print_coverage_report(shard_plan, shard_stats)
+            print(f"Job range {start_job}-{end_job}: {collection['queued']} jobs to scrape")
+            if len(resume_mgr.completed_urls) > 0:
+                print(f"Resuming: {len(resume_mgr.completed_urls)} jobs already completed")
+        except Exception as e:
+            print(f"  ✗ Link collection failed: {e}")
+        finally:
+            collection['done'] = True
+            job_queue.close()
+            try:
+                driver.quit()
+            except:
+                pass
+    
+    if adaptive_workers:
+        print(f"Scraping with adaptive concurrency as links arrive...\n")
+    else:
+        print(f"Scraping with {num_workers} parallel browsers as links arrive...\n")
+    
+    collector = Thread(target=collect_links, name="link-collector", daemon=True)
+    collector.start()
+    
+    def checkpoint():
+        with stage_timer.time('checkpoint.write'):
+            sink.flush()
+            selector_registry.save()
+            response_cache.save()
+            advertiser_cache.save()
+    
+    def write_result(item):
+        """Sink: store a finished job, report progress and checkpoint (runs in the pipeline's sink thread)."""
+        nonlocal completed
+        job_data = item['job_data']
+        if job_data is not None:
+            sink.write(job_data)
+        completed += 1
         
-        all_jobs_data = [None] * len(futures)
+        if completed % 10 == 0 or (collection['done'] and completed == collection['queued']):
+            total_done = completed + len(resume_mgr.completed_urls)
+            known = collection['queued'] if collection['done'] else f"{collection['queued']}+"
+            print(f"  Progress: {completed}/{known} jobs completed this session | Total: {total_done} | {pipeline.depth_line()}")
         
-        for future in as_completed(futures):
-            if check_quota_exceeded():
-                print("\nWARNING: Quota threshold reached - triggering pause...")
-                # Save checkpoint before pausing
-                valid_data = [j for j in all_jobs_data if j is not None]
-                merged_data = resume_mgr.merge_with_existing(valid_data)
-                df_checkpoint = pd.DataFrame(merged_data, columns=COLUMNS)
-                df_checkpoint.to_excel(filename, index=False, engine='openpyxl')
-                resume_mgr.save_progress(valid_data)
-                wait_for_quota_reset(wait_minutes=5)
-            
-            idx = futures[future]
-            try:
-                job_data = future.result()
-                all_jobs_data[idx] = job_data
-                completed += 1
-                
-                if completed % 10 == 0 or completed == len(futures):
-                    total_done = completed + len(resume_mgr.completed_urls)
-                    print(f"  Progress: {completed}/{len(futures)} jobs completed this session ({(completed/len(futures)*100):.1f}%) | Total: {total_done}")
-                
-                if completed % CHECKPOINT_INTERVAL == 0:
-                    valid_data = [j for j in all_jobs_data if j is not None]
-                    merged_data = resume_mgr.merge_with_existing(valid_data)
-                    df_checkpoint = pd.DataFrame(merged_data, columns=COLUMNS)
-                    df_checkpoint.to_excel(filename, index=False, engine='openpyxl')
-                    resume_mgr.save_progress(valid_data)
-                    print(f"  Checkpoint saved: {len(merged_data)} total jobs")
-                    
-            except Exception as e:
-                print(f"  ✗ Job {idx+1} failed: {e}")
-                if idx < len(all_job_urls):
-                    all_jobs_data[idx] = create_empty_job_data(all_job_urls[idx])
+        if completed % CHECKPOINT_INTERVAL == 0:
+            checkpoint()
+            print(f"  Checkpoint saved: {sink.count} jobs this session")
+    
+    pipeline = ScrapePipeline(session, job_queue, pool_size, write_result, total_jobs=end_job, hedging=hedging,
+                              time_budget=time_budget, on_quota=checkpoint)
+    try:
+        pipeline.run()
+    finally:
+        # Unblocks the collector if scraping stopped early
+        job_queue.close()
+        checkpoint()
     
-    current_executor = None
+    collector.join(timeout=5)
+    queue_stats = job_queue.get_stats()
+    print(f"\nWork queue: peak {queue_stats['max_depth']}/{WORK_QUEUE_SIZE} waiting, "
+          f"collection blocked {queue_stats['blocked_seconds']}s, {queue_stats['spilled']} spilled to disk")
     
-    print("\nProcessing scraped data...")
-    all_jobs_data = [j for j in all_jobs_data if j is not None]
+    pipeline.print_report()
+    session.stop_pool(adaptive=adaptive_workers)
+    session.print_hedge_report()
+    if own_session:
+        # Worker threads are gone; quit the browsers kept warm for them (unless another session still uses them)
+        session.close()
+    readiness.print_report(completed)
+    selector_registry.print_report()
+    selector_registry.save()
+    page_weight.print_report()
+    response_cache.print_report()
+    response_cache.save()
+    advertiser_cache.print_report()
+    advertiser_cache.save()
     
-    final_data = resume_mgr.merge_with_existing(all_jobs_data)
+    print("\nProcessing scraped data...")
+    final_data = resume_mgr.merge_with_existing(sink.read_all())
+    sink.close()
     
     if ENABLE_GOOGLE_ENRICHMENT:
         phones_found = sum(1 for job in final_data if job.get('office_phone'))
-        cache_stats = phone_cache.get_stats()
+        cache_stats = session.phone_cache.get_stats()
         print(f"  Office phones found: {phones_found}/{len(final_data)} jobs")
         print(f"  Cache: {cache_stats['total_companies']} companies ({cache_stats['with_phone']} with phones)")
     
     print(f"  Data processing complete: {len(final_data)} jobs ready for export")
     
-    resume_mgr.cleanup_progress_file()
-    
-    filtered_urls = filter_job_range(all_job_urls, start_job, end_job)
+    stage_timer.print_report()
+    if SAVE_TIMING_REPORT:
+        stage_timer.save_report(filename.replace('.xlsx', '_timing.json'))
     
-    return final_data, filtered_urls
+    return final_data, scraped_urls
 
 
 def save_checkpoint(all_jobs_data, filename):
@@ -1,32 +1,58 @@
 """URL building for Seek search."""
 
+import re
 from .config import BASE_URL, CLASSIFICATION, LOCATION
 
 
-def build_search_url(sort_by_date=False, page=None):
+def build_search_url(sort_by_date=False, page=None, location=None, filters=None):
     """
     Build the Seek URL for ICT jobs in All Melbourne VIC.
-    
+
     Args:
         sort_by_date: Sort by listing date (newest first) if True
         page: Optional page number for direct pagination (default: None)
-    
+        location: Optional location slug overriding LOCATION (e.g. a sub-location shard)
+        filters: Optional dict of extra query parameters (e.g. {'worktype': '242'})
+
     Returns:
         Complete URL with optional page parameter
     """
     # Use the correct URL format from your config
-    url = f"{BASE_URL}/{CLASSIFICATION}-jobs/in-{LOCATION}"
-    
+    url = f"{BASE_URL}/{CLASSIFICATION}-jobs/in-{location or LOCATION}"
+
     params = []
-    
+
     # Add page parameter BEFORE sortmode for Seek's URL structure
     if page is not None and page > 1:
         params.append(f"page={page}")
-    
+
     if sort_by_date:
         params.append("sortmode=ListedDate")
-    
+
+    if filters:
+        for key, value in filters.items():
+            params.append(f"{key}={value}")
+            # Seek needs the salary type alongside a salary range
+            if key == 'salaryrange':
+                params.append("salarytype=annual")
+
     if params:
         url += "?" + "&".join(params)
-    
-    return url
\ No newline at end of file
+
+    return url
+
+
+def extract_job_id(job_url):
+    """
+    Extract Seek's numeric job ID from a job URL.
+
+    The same job is linked with different tracking query strings from different
+    searches, so the ID is the stable key for de-duplication.
+
+    Returns:
+        Job ID string, or the URL without its query string if no ID is found
+    """
+    match = re.search(r'/job/(\d+)', job_url or '')
+    if match:
+        return match.group(1)
+    return (job_url or '').split('?')[0]
@@ -0,0 +1,262 @@
+"""End-to-end throughput benchmark against the local fixture Seek server."""
+
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import argparse
+import json
+import resource
+import subprocess
+import time
+from datetime import datetime
+
+from scraper.fixture_server import FixtureServer
+
+BENCHMARK_HISTORY = os.path.join("data", "benchmarks.jsonl")
+
+
+def get_git_commit():
+    """Return the current short commit hash, or '' outside a git checkout."""
+    try:
+        return subprocess.check_output(['git', 'rev-parse', '--short', 'HEAD'], stderr=subprocess.DEVNULL).decode().strip()
+    except Exception:
+        return ''
+
+
+def cpu_seconds():
+    """CPU time used by this process and its reaped children (browsers included once they exit)."""
+    own = resource.getrusage(resource.RUSAGE_SELF)
+    children = resource.getrusage(resource.RUSAGE_CHILDREN)
+    return own.ru_utime + own.ru_stime + children.ru_utime + children.ru_stime
+
+
+def peak_memory_mb():
+    """Peak RSS of this process and of its largest reaped child, in MB."""
+    own = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    children = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss
+    return round(max(own, children) / 1024, 1)
+
+
+def run_engine(engine, num_workers, total_jobs, workdir):
+    """Run one scrape against the fixture server and return the number of jobs processed."""
+    # Imported lazily so SEEK_BASE_URL is already set when config is loaded
+    from scraper.driver_setup import setup_driver
+    from scraper.url_builder import build_search_url
+    from scraper.streaming_parallel_scraper import scrape_jobs_streaming, cleanup_all_browsers
+    from scraper.streaming_collector import collect_job_links_streaming
+    from scraper.parallel_scraper import scrape_jobs_in_parallel
+    from scraper.resume_manager import ResumeManager
+
+    filename = os.path.join(workdir, f"bench_{engine}_{num_workers}_{int(time.time())}.xlsx")
+    driver = setup_driver(headless=True)
+    try:
+        driver.get(build_search_url())
+        if engine in ('streaming', 'streaming-hedged'):
+            _, job_urls = scrape_jobs_streaming(driver, 1, total_jobs, num_workers, filename,
+                                                hedging=engine == 'streaming-hedged')
+        elif engine == 'batch':
+            job_urls = collect_job_links_streaming(driver, total_jobs)
+            scrape_jobs_in_parallel(job_urls, 1, num_workers, filename)
+        else:
+            raise ValueError(f"Unknown engine: {engine}")
+        return len(job_urls)
+    finally:
+        try:
+            driver.quit()
+        except:
+            pass
+        cleanup_all_browsers()
+        # Nothing is exported, so drop this run's progress and results files too
+        ResumeManager(filename, load=False).cleanup_progress_file()
+        for path in (filename, filename.replace('.xlsx', '_timing.json')):
+            if os.path.exists(path):
+                os.remove(path)
+
+
+def run_extract_benchmark(num_pages, total_jobs):
+    """Run extraction + filtering over synthetic job pages with the fake driver (no browser)."""
+    from scraper.fake_driver import FakeDriver
+    from scraper.fixture_server import FixtureSite, FIRST_JOB_ID
+    from scraper.job_scraper import extract_job_details
+
+    site = FixtureSite(total_jobs=total_jobs)
+    driver = FakeDriver.for_fixture_site(site)
+    kept = 0
+    start = time.perf_counter()
+    for i in range(num_pages):
+        driver.get(f"/job/{FIRST_JOB_ID + i % total_jobs}")
+        if extract_job_details(driver, driver.current_url) is not None:
+            kept += 1
+    elapsed = time.perf_counter() - start
+    return kept, elapsed
+
+
+def matcher_benchmark_names():
+    """Advertiser names as they appear on job ads: gov names in several spellings plus non-target advertisers."""
+    from scraper.config import GOV_COMPANIES, RECRUITMENT_COMPANIES
+    from scraper.fixture_server import SYNTHETIC_COMPANIES
+
+    names = []
+    for company in GOV_COMPANIES:
+        names += [company, company.upper(), f"{company} (VIC)", f"The {company}", company.replace(' and ', ' & ')]
+    names += RECRUITMENT_COMPANIES + [company for company, _ in SYNTHETIC_COMPANIES]
+    names += [f"{company} Pty Ltd" for company in RECRUITMENT_COMPANIES]
+    return list(dict.fromkeys(names))
+
+
+def run_matcher_benchmark(rounds=5):
+    """
+    Time matching advertiser names against the whole gov list: pairwise company_names_match vs CompanyMatcher.
+
+    Returns:
+        Dict with lookups, per-lookup microseconds for both, and how often they agree
+    """
+    from scraper.config import GOV_COMPANIES
+    from scraper.company_matcher import CompanyMatcher, company_names_match
+
+    names = matcher_benchmark_names()
+    start = time.perf_counter()
+    for _ in range(rounds):
+        pairwise = [any(company_names_match(name, company) for company in GOV_COMPANIES) for name in names]
+    pairwise_s = (time.perf_counter() - start) / rounds
+
+    start = time.perf_counter()
+    matcher = CompanyMatcher(GOV_COMPANIES)
+    build_s = time.perf_counter() - start
+    start = time.perf_counter()
+    for _ in range(rounds):
+        # Unique names, so every lookup is a real match rather than a memo hit
+        matcher.memo.clear()
+        indexed = [matcher.match(name) is not None for name in names]
+    indexed_s = (time.perf_counter() - start) / rounds
+
+    return {
+        'lookups': len(names),
+        'targets': len(GOV_COMPANIES),
+        'pairwise_us': round(pairwise_s / len(names) * 1e6, 1),
+        'indexed_us': round(indexed_s / len(names) * 1e6, 1),
+        'build_ms': round(build_s * 1000, 2),
+        'indexed_s': indexed_s,
+        'agreement': round(sum(a == b for a, b in zip(pairwise, indexed)) / len(names), 4),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark scraper throughput against a local fixture server.")
+    parser.add_argument('--workers', default='1,5,10,20', help="Comma-separated worker counts")
+    parser.add_argument('--engines', default='streaming,batch', help="Comma-separated engines (streaming, streaming-hedged, batch)")
+    parser.add_argument('--total-jobs', type=int, default=100)
+    parser.add_argument('--latency', type=float, default=0.1)
+    parser.add_argument('--latency-jitter', type=float, default=0.2)
+    parser.add_argument('--error-rate', type=float, default=0.0)
+    parser.add_argument('--fixture-dir', default=None, help="Directory of recorded pages to serve")
+    parser.add_argument('--output', default=BENCHMARK_HISTORY, help="JSONL file the results are appended to")
+    parser.add_argument('--extract-pages', type=int, default=0,
+                        help="Also benchmark extractors over this many pages with the fake driver (no Chrome)")
+    parser.add_argument('--extract-only', action='store_true', help="Only run the fake-driver extractor benchmark")
+    parser.add_argument('--matcher', action='store_true',
+                        help="Also benchmark company-name matching against the full GOV_COMPANIES list")
+    parser.add_argument('--matcher-only', action='store_true', help="Only run the company matcher benchmark")
+    args = parser.parse_args()
+    if args.extract_only and not args.extract_pages:
+        args.extract_pages = 2000
+
+    server = FixtureServer(total_jobs=args.total_jobs, latency=args.latency, latency_jitter=args.latency_jitter,
+                           error_rate=args.error_rate, fixture_dir=args.fixture_dir).start()
+    os.environ['SEEK_BASE_URL'] = server.url
+    os.environ['ENABLE_GOOGLE_ENRICHMENT'] = 'false'
+    # Every run must fetch its pages, not replay an earlier run's
+    os.environ['HTTP_CACHE'] = 'false'
+    os.environ['LINK_FRONTIER'] = 'false'
+    os.makedirs(os.path.dirname(args.output) or '.', exist_ok=True)
+    workdir = os.path.dirname(args.output) or '.'
+
+    print("=" * 60)
+    print(f"BENCHMARK against {server.url}")
+    print(f"Jobs: {args.total_jobs} | Latency: {args.latency}s (+{args.latency_jitter}s) | Error rate: {args.error_rate}")
+    print("=" * 60)
+
+    results = []
+    if args.extract_pages:
+        print(f"\n>>> engine=fake-extract pages={args.extract_pages}")
+        cpu_before = cpu_seconds()
+        kept, elapsed = run_extract_benchmark(args.extract_pages, args.total_jobs)
+        results.append({
+            'timestamp': datetime.now().isoformat(),
+            'commit': get_git_commit(),
+            'engine': 'fake-extract',
+            'workers': 1,
+            'jobs': args.extract_pages,
+            'elapsed_s': round(elapsed, 2),
+            'jobs_per_sec': round(args.extract_pages / elapsed, 3) if elapsed else 0.0,
+            'cpu_s': round(cpu_seconds() - cpu_before, 2),
+            'peak_memory_mb': peak_memory_mb(),
+            'kept': kept,
+        })
+
+    if args.matcher or args.matcher_only:
+        print("\n>>> engine=matcher")
+        cpu_before = cpu_seconds()
+        stats = run_matcher_benchmark()
+        print(f"  {stats['lookups']} advertiser names vs {stats['targets']} companies: "
+              f"pairwise {stats['pairwise_us']}us/lookup, indexed {stats['indexed_us']}us/lookup "
+              f"(index built in {stats['build_ms']}ms), agreement {stats['agreement']:.1%}")
+        results.append({
+            'timestamp': datetime.now().isoformat(),
+            'commit': get_git_commit(),
+            'engine': 'matcher',
+            'workers': 1,
+            'jobs': stats['lookups'],
+            'elapsed_s': round(stats['indexed_s'], 4),
+            'jobs_per_sec': round(stats['lookups'] / stats['indexed_s'], 3) if stats['indexed_s'] else 0.0,
+            'cpu_s': round(cpu_seconds() - cpu_before, 2),
+            'peak_memory_mb': peak_memory_mb(),
+            'pairwise_us': stats['pairwise_us'],
+            'indexed_us': stats['indexed_us'],
+            'agreement': stats['agreement'],
+        })
+
+    try:
+        for engine in ([] if args.extract_only or args.matcher_only else args.engines.split(',')):
+            for num_workers in [int(w) for w in args.workers.split(',')]:
+                print(f"\n>>> engine={engine} workers={num_workers}")
+                cpu_before = cpu_seconds()
+                start = time.perf_counter()
+                jobs = run_engine(engine, num_workers, args.total_jobs, workdir)
+                elapsed = time.perf_counter() - start
+                cpu_used = cpu_seconds() - cpu_before
+
+                results.append({
+                    'timestamp': datetime.now().isoformat(),
+                    'commit': get_git_commit(),
+                    'engine': engine,
+                    'workers': num_workers,
+                    'jobs': jobs,
+                    'elapsed_s': round(elapsed, 2),
+                    'jobs_per_sec': round(jobs / elapsed, 3) if elapsed else 0.0,
+                    'cpu_s': round(cpu_used, 2),
+                    'peak_memory_mb': peak_memory_mb(),
+                    'latency': args.latency,
+                    'latency_jitter': args.latency_jitter,
+                    'error_rate': args.error_rate,
+                })
+    finally:
+        server.stop()
+
+    with open(args.output, 'a', encoding='utf-8') as f:
+        for result in results:
+            f.write(json.dumps(result) + "\n")
+
+    print("\n" + "=" * 60)
+    print("BENCHMARK RESULTS")
+    print("=" * 60)
+    print(f"{'Engine':<12}{'Workers':>8}{'Jobs':>7}{'Time(s)':>10}{'Jobs/s':>9}{'CPU(s)':>9}{'PeakMB':>9}")
+    for r in results:
+        print(f"{r['engine']:<12}{r['workers']:>8}{r['jobs']:>7}{r['elapsed_s']:>10.1f}"
+              f"{r['jobs_per_sec']:>9.2f}{r['cpu_s']:>9.1f}{r['peak_memory_mb']:>9.1f}")
+    print(f"\nResults appended to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,143 @@
+"""Collect job links onto the shared work queue for worker processes, then export their results."""
+
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import argparse
+import time
+
+from scraper.driver_setup import setup_driver
+from scraper.url_builder import build_search_url, extract_job_id
+from scraper.page_parser import get_total_jobs
+from scraper.streaming_collector import stream_job_links
+from scraper.query_sharding import plan_shards, stream_sharded_job_links, print_coverage_report
+from scraper.frontier import link_frontier
+from scraper.advertiser_cache import advertiser_cache
+from scraper.shared_queue import open_shared_queue
+from scraper.data_export import create_filename, save_to_excel, print_statistics
+from scraper.process_reaper import install_reaper, reap_owned
+from scraper.config import (
+    SHARED_QUEUE_URL, ENABLE_QUERY_SHARDING, SEEK_RESULT_CAP, LINK_FRONTIER, ADVERTISER_CACHE, WORK_POLL_INTERVAL
+)
+
+PROGRESS_INTERVAL = 30  # Seconds between progress lines while waiting on the workers
+
+
+def collect(queue, start_job, end_job, sort_by_date=False):
+    """
+    Walk the search and queue every job in the range.
+
+    Returns:
+        Tuple of (links seen, jobs added, jobs skipped as known-excluded advertisers)
+    """
+    driver = setup_driver(headless=True)
+    try:
+        driver.get(build_search_url(sort_by_date=sort_by_date))
+        total_jobs = get_total_jobs(driver)
+        print(f"Total jobs found: {total_jobs}\n")
+        end_job = min(end_job, total_jobs)
+
+        card_info = {}
+        shard_stats = {}
+        shard_plan = None
+        # Seek stops paginating at ~550 results, so split larger ranges into shards
+        if ENABLE_QUERY_SHARDING and end_job > SEEK_RESULT_CAP:
+            shard_plan = plan_shards(driver, total_jobs, sort_by_date=sort_by_date)
+            link_stream = stream_sharded_job_links(shard_plan, sort_by_date=sort_by_date, stats=shard_stats,
+                                                   card_info=card_info)
+        else:
+            link_stream = stream_job_links(driver, end_job, sort_by_date=sort_by_date, card_info=card_info,
+                                           frontier=link_frontier if LINK_FRONTIER else None)
+
+        links = added = excluded = 0
+        for batch_links in link_stream:
+            jobs = []
+            for job_url in batch_links:
+                links += 1
+                company = card_info.pop(job_url, '')
+                if links < start_job or links > end_job:
+                    continue
+                if ADVERTISER_CACHE and advertiser_cache.should_skip(company):
+                    # Recruiter or large employer every time it was checked: the job would be filtered out
+                    excluded += 1
+                    continue
+                jobs.append({'job_id': extract_job_id(job_url), 'url': job_url, 'job_num': links, 'company': company})
+            added += queue.add(jobs)
+            stats = queue.get_stats()
+            print(f"  Batch collected. Queued: {added}, Done: {stats['done']}, Workers: {stats['workers']}, "
+                  f"Known-excluded advertiser: {excluded}")
+
+        if shard_plan is not None:
+            print_coverage_report(shard_plan, shard_stats)
+        return links, added, excluded
+    finally:
+        try:
+            driver.quit()
+        except:
+            pass
+
+
+def wait_for_workers(queue):
+    """Block until every queued job is done or failed, printing progress."""
+    last_print = 0
+    while not queue.finished():
+        if time.time() - last_print >= PROGRESS_INTERVAL:
+            stats = queue.get_stats()
+            print(f"  Progress: {stats['done']} done ({stats['kept']} kept), {stats['leased']} running on "
+                  f"{stats['workers']} workers, {stats['queued']} queued, {stats['failed']} failed")
+            last_print = time.time()
+        time.sleep(WORK_POLL_INTERVAL)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Queue job links for scripts/worker.py processes and export their results.")
+    parser.add_argument('--queue', default=SHARED_QUEUE_URL, help="Shared queue URL (default: SHARED_QUEUE_URL)")
+    parser.add_argument('--start-job', type=int, default=1, help="First job number to scrape")
+    parser.add_argument('--end-job', type=int, default=999999, help="Last job number to scrape (default: all)")
+    parser.add_argument('--sort-by-date', action='store_true', help="Walk the search sorted by listing date")
+    parser.add_argument('--fresh', action='store_true',
+                        help="Start a new run: drop the jobs and results of the earlier run (without it, the earlier run is resumed)")
+    parser.add_argument('--output', default=None, help="Excel file to write (default: timestamped file in data/)")
+    args = parser.parse_args()
+
+    install_reaper()
+    queue = open_shared_queue(args.queue)
+    if args.fresh:
+        queue.reset()
+    else:
+        stats = queue.get_stats()
+        if queue.finished():
+            print(f"The earlier run on this queue finished ({stats['done']} jobs done). Its jobs are not scraped again "
+                  f"and its results are exported with the new ones - use --fresh for a new run.")
+        elif stats['done'] or stats['queued'] or stats['leased']:
+            print(f"Resuming queue: {stats['done']} jobs already done, {stats['queued'] + stats['leased']} pending")
+        # Workers must not see the earlier run's close and stop while links are still being collected
+        queue.reopen()
+
+    print(f"Collecting links onto {args.queue}...")
+    try:
+        links, added, excluded = collect(queue, args.start_job, args.end_job, sort_by_date=args.sort_by_date)
+    finally:
+        reap_owned()
+    queue.close()
+    print(f"\nLink collection complete! {links} links found, {added} new jobs queued, {excluded} known-excluded skipped")
+    advertiser_cache.print_report()
+
+    print("Waiting for workers...")
+    wait_for_workers(queue)
+    stats = queue.get_stats()
+    print(f"\nAll jobs finished: {stats['kept']} kept, {stats['done'] - stats['kept']} filtered, "
+          f"{stats['failed']} failed, {stats['requeued']} re-leased after a worker stopped")
+
+    output = args.output or create_filename()
+    all_jobs_data = list(queue.results())
+    df = save_to_excel(all_jobs_data, output)
+    if df is not None:
+        print_statistics(df, output)
+    else:
+        print("No jobs to export")
+
+
+if __name__ == "__main__":
+    main()
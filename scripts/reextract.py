@@ -0,0 +1,96 @@
+"""Re-run extraction and filtering over archived job pages and rebuild the Excel export, without a browser."""
+
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import argparse
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+
+from scraper.html_archive import HtmlArchive
+from scraper.fake_driver import FakeDriver
+from scraper.job_scraper import extract_job_details
+from scraper.phone_cache import phone_cache
+from scraper.data_export import save_to_excel, print_statistics
+from scraper.config import HTML_ARCHIVE_DIR
+
+
+def reextract_entry(task):
+    """
+    Extract one archived page (runs in a worker process).
+
+    Args:
+        task: Tuple of (archive root, index entry)
+
+    Returns:
+        Job data dict, or None if the job is filtered out or its page is missing
+    """
+    root, entry = task
+    try:
+        html = HtmlArchive(root).load(entry['sha256'])
+    except OSError:
+        return None
+    driver = FakeDriver(pages={entry['url']: html})
+    driver.get(entry['url'])
+    return extract_job_details(driver, entry['url'])
+
+
+def reextract(root=HTML_ARCHIVE_DIR, output=None, workers=None, since=None):
+    """
+    Rebuild an export from the latest archived page of every job.
+
+    Args:
+        root: Archive directory
+        output: Excel path (default: timestamped file in data/)
+        workers: Worker processes (default: one per CPU)
+        since: Optional ISO timestamp; only pages fetched after it are used
+
+    Returns:
+        List of job data dicts that passed the filters
+    """
+    archive = HtmlArchive(root)
+    entries = archive.latest(since)
+    if not entries:
+        print(f"No archived pages found in {root}")
+        return []
+
+    print(f"Re-extracting {len(entries)} archived jobs with {workers or os.cpu_count()} processes...")
+    start = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        results = list(executor.map(reextract_entry, [(root, entry) for entry in entries], chunksize=20))
+    elapsed = time.perf_counter() - start
+
+    jobs = []
+    for job_data in results:
+        if job_data is None:
+            continue
+        # Office phones come from Google enrichment, which the archive does not replay
+        job_data['office_phone'] = phone_cache.get(job_data['company']) or ''
+        jobs.append(job_data)
+
+    filtered_count = len(entries) - len(jobs)
+    print(f"Done in {elapsed:.1f}s ({len(entries) / elapsed:.0f} pages/sec)" if elapsed else "Done")
+
+    if output is None:
+        os.makedirs("data", exist_ok=True)
+        output = os.path.join("data", f"seek_ict_jobs_melbourne_reextracted_{datetime.now().strftime('%Y%m%d_%H%M%S')}.xlsx")
+    df = save_to_excel(jobs, output)
+    print_statistics(df, output, total_processed=len(entries), filtered_count=filtered_count)
+    return jobs
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Re-run extractors over archived job pages (set ARCHIVE_HTML=true when scraping).")
+    parser.add_argument('--archive', default=HTML_ARCHIVE_DIR, help="Archive directory")
+    parser.add_argument('--output', default=None, help="Excel file to write")
+    parser.add_argument('--workers', type=int, default=None, help="Worker processes (default: CPU count)")
+    parser.add_argument('--since', default=None, help="Only use pages fetched at or after this ISO timestamp")
+    args = parser.parse_args()
+
+    reextract(args.archive, args.output, args.workers, args.since)
+
+
+if __name__ == "__main__":
+    main()
@@ -4,79 +4,26 @@ import sys
 import os
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from scraper.company_search import search_multiple_companies_parallel
-from scraper.streaming_parallel_scraper import scrape_job_parallel, phone_cache
+from scraper.company_search import stream_company_job_links
+from scraper.session import ScrapeSession
+from scraper.pipeline import ScrapePipeline
+from scraper.stage_timer import stage_timer
+from scraper.readiness import readiness
+from scraper.selector_registry import selector_registry
+from scraper.request_blocking import page_weight
+from scraper.http_cache import response_cache
+from scraper.advertiser_cache import advertiser_cache
+from scraper.process_reaper import install_reaper
+from scraper.scheduler import build_priority
+from scraper.job_queue import BoundedJobQueue
+from scraper.company_matcher import CompanyMatcher
 from scraper.config import (
     COLUMNS, GOV_COMPANIES, CLASSIFICATION, LOCATION,
-    DEFAULT_WORKERS, ENABLE_GOOGLE_ENRICHMENT
+    DEFAULT_WORKERS, ENABLE_GOOGLE_ENRICHMENT, COMPANY_SCHEDULER_SCORERS,
+    WORK_QUEUE_SIZE, ADVERTISER_CACHE
 )
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from threading import Thread
 import pandas as pd
-import re
-
-
-def company_names_match(scraped_company, expected_company, threshold=0.6):
-    """
-    Check if scraped company name matches expected company name.
-    Uses fuzzy matching to handle variations.
-    
-    Args:
-        scraped_company: Company name from scraped job
-        expected_company: Company name we're searching for
-        threshold: Minimum similarity ratio (0-1)
-    
-    Returns:
-        True if names match closely enough
-    """
-    if not scraped_company or scraped_company == 'N/A':
-        return False
-    
-    # Normalize both names (lowercase, remove special chars)
-    def normalize(text):
-        # Remove parentheses and contents
-        text = re.sub(r'\([^)]*\)', '', text)
-        # Keep only alphanumeric and spaces
-        text = re.sub(r'[^a-zA-Z0-9\s]', '', text)
-        # Collapse whitespace
-        text = ' '.join(text.split())
-        return text.lower().strip()
-    
-    scraped_norm = normalize(scraped_company)
-    expected_norm = normalize(expected_company)
-    
-    # Exact match after normalization
-    if scraped_norm == expected_norm:
-        return True
-    
-    # Check if one contains the other (for cases like "Department of X" vs "X")
-    if expected_norm in scraped_norm or scraped_norm in expected_norm:
-        # But make sure it's a substantial match (not just "the" or "of")
-        shorter = min(len(expected_norm), len(scraped_norm))
-        if shorter >= 10:  # Require at least 10 chars overlap
-            return True
-    
-    # Simple similarity: count matching words
-    scraped_words = set(scraped_norm.split())
-    expected_words = set(expected_norm.split())
-    
-    # Remove common words that don't help identify the company
-    common_words = {'the', 'of', 'and', 'for', 'in', 'victoria', 'victorian', 'department', 'office'}
-    scraped_words -= common_words
-    expected_words -= common_words
-    
-    if not expected_words:  # If no meaningful words left, can't match
-        return False
-    
-    # Calculate word overlap ratio
-    intersection = scraped_words & expected_words
-    union = scraped_words | expected_words
-    
-    if not union:
-        return False
-    
-    similarity = len(intersection) / len(union)
-    
-    return similarity >= threshold
 
 
 def scrape_company_jobs(companies=None, scrape_workers=None, search_workers=None, max_jobs_per_company=5, output_file=None):
@@ -102,7 +49,9 @@ def scrape_company_jobs(companies=None, scrape_workers=None, search_workers=None
     if search_workers is None:
         search_workers = 20  # Use fewer workers for search
     
-    # Step 1: Search for jobs from each company (parallel headless)
+    install_reaper()
+    
+    # Step 1: Search for jobs from each company (parallel headless), feeding the scrape pool
     print("=" * 60)
     print("🏢 VICTORIAN GOVERNMENT ICT JOB SCRAPER")
     print("=" * 60)
@@ -117,86 +66,135 @@ def scrape_company_jobs(companies=None, scrape_workers=None, search_workers=None
     # Convert LOCATION from "All-Melbourne-VIC" to "Melbourne" for search
     location_search = LOCATION.replace("All-", "").replace("-VIC", "")
     
-    company_jobs = search_multiple_companies_parallel(
-        companies, 
-        location=location_search,
-        classification=CLASSIFICATION,
-        num_workers=search_workers, 
-        headless=True
-    )
-    
-    # Flatten job list and track which company posted each job
-    all_jobs = []
+    # Jobs are scraped as soon as a company search finds them; the queue interleaves
+    # companies so an interrupted run still covers every company
+    job_queue = BoundedJobQueue(WORK_QUEUE_SIZE, priority=build_priority(COMPANY_SCHEDULER_SCORERS))
     job_to_company = {}
-    skipped_jobs = 0
-    
-    for company, jobs in company_jobs.items():
-        # Limit jobs per company if specified
-        if max_jobs_per_company and len(jobs) > max_jobs_per_company:
-            jobs_to_scrape = jobs[:max_jobs_per_company]
-            skipped_jobs += len(jobs) - max_jobs_per_company
-        else:
-            jobs_to_scrape = jobs
-        
-        for job_url in jobs_to_scrape:
-            all_jobs.append(job_url)
-            job_to_company[job_url] = company
-    
-    if skipped_jobs > 0:
-        print(f"\nLimiting to top {max_jobs_per_company} jobs per company (skipped {skipped_jobs} jobs)")
-    
-    if not all_jobs:
-        print("\nNo jobs found!")
-        return
+    collection = {'queued': 0, 'duplicates': 0, 'excluded': 0}
+    card_info = {}  # url -> advertiser name from the search cards
+    
+    def collect_jobs():
+        """Producer: run the company searches and queue each job link as it is found."""
+        try:
+            for company, job_url in stream_company_job_links(
+                companies,
+                location=location_search,
+                classification=CLASSIFICATION,
+                num_workers=search_workers,
+                headless=True,
+                max_jobs=max_jobs_per_company,
+                card_info=card_info
+            ):
+                # The advertiser on the card, which can differ from the company searched for
+                advertiser = card_info.pop(job_url, '')
+                # A job can turn up under two similar company names; scrape it once
+                if job_url in job_to_company:
+                    collection['duplicates'] += 1
+                    continue
+                job_to_company[job_url] = company
+                if ADVERTISER_CACHE and advertiser_cache.should_skip(advertiser):
+                    # Recruiter or large employer every time it was checked: the job would be filtered out
+                    collection['excluded'] += 1
+                    continue
+                collection['queued'] += 1
+                if not job_queue.put({'url': job_url, 'job_num': collection['queued'], 'company': company}):
+                    return
+        except Exception as e:
+            print(f"  ✗ Company search failed: {e}")
+        finally:
+            job_queue.close()
     
     print(f"\n{'=' * 60}")
-    print(f"SCRAPING {len(all_jobs)} JOBS")
+    print("SEARCHING AND SCRAPING")
     print(f"{'=' * 60}")
+    print(f"Search Workers: {search_workers}")
     print(f"Scrape Workers: {scrape_workers}")
     if max_jobs_per_company:
         print(f"Max per company: {max_jobs_per_company}")
     print(f"Output: {output_file}\n")
     
-    # Step 2: Scrape jobs in parallel (with filtering)
+    collector = Thread(target=collect_jobs, name="company-search", daemon=True)
+    collector.start()
+    
+    # Step 2: Scrape jobs in parallel as they arrive (with filtering)
     results = []
     completed = 0
     filtered_count = 0
     company_mismatch_count = 0
+    reattributed_count = 0
     company_job_counts = {}  # Track valid jobs per company
-    
-    with ThreadPoolExecutor(max_workers=scrape_workers) as executor:
-        futures = {
-            executor.submit(scrape_job_parallel, url, i+1, len(all_jobs), headless=True): url
-            for i, url in enumerate(all_jobs)
-        }
+    matcher = CompanyMatcher(companies)
+    session = ScrapeSession(headless=True)
+    
+    def check_company(item, job_data):
+        """Filter stage: keep jobs posted by the company we searched for, or another target company."""
+        nonlocal company_mismatch_count, reattributed_count
+        # SEEK's search is fuzzy, so verify the company name matches what we searched for
+        expected_company = job_to_company[item['url']]
+        scraped_company = job_data.get('company', '')
+        if matcher.matches(scraped_company, expected_company):
+            matched_company = expected_company
+        else:
+            matched_company = matcher.match(scraped_company)
+            if matched_company:
+                reattributed_count += 1
+        if not matched_company:
+            company_mismatch_count += 1
+            return None
+        item['matched_company'] = matched_company
+        return job_data
+    
+    def collect_result(item):
+        """Sink stage: keep valid jobs and report progress."""
+        nonlocal completed, filtered_count
+        job_data = item['job_data']
+        if job_data:
+            results.append(job_data)
+            # Track count per company
+            matched_company = item['matched_company']
+            company_job_counts[matched_company] = company_job_counts.get(matched_company, 0) + 1
+        elif not item.get('cancelled'):
+            filtered_count += 1
+        completed += 1
         
-        for future in as_completed(futures):
-            job_url = futures[future]
-            expected_company = job_to_company[job_url]
-            
-            try:
-                job_data = future.result()
-                if job_data:
-                    # Verify the company name matches what we searched for
-                    scraped_company = job_data.get('company', '')
-                    if company_names_match(scraped_company, expected_company):
-                        results.append(job_data)
-                        # Track count per company
-                        company_job_counts[expected_company] = company_job_counts.get(expected_company, 0) + 1
-                    else:
-                        company_mismatch_count += 1
-                        filtered_count += 1
-                else:
-                    filtered_count += 1
-                
-                completed += 1
-                
-                # Progress update
-                if completed % 10 == 0 or completed == len(all_jobs):
-                    print(f"  Progress: {completed}/{len(all_jobs)} ({completed/len(all_jobs)*100:.1f}%) | Valid: {len(results)} | Filtered: {filtered_count}")
-                    
-            except Exception as e:
-                print(f"  ✗ Failed to scrape job: {e}")
+        # Progress update
+        if completed % 10 == 0:
+            known = collection['queued'] if job_queue.exhausted else f"{collection['queued']}+"
+            print(f"  Progress: {completed}/{known} | Valid: {len(results)} | Filtered: {filtered_count} | "
+                  f"{pipeline.depth_line()}")
+    
+    # Matching runs before enrichment, so no Google searches are spent on other advertisers' jobs
+    pipeline = ScrapePipeline(session, job_queue, scrape_workers, collect_result, filter_job=check_company)
+    try:
+        pipeline.run()
+    finally:
+        # Unblocks the search thread if scraping stopped early
+        job_queue.close()
+    
+    collector.join(timeout=5)
+    if collection['duplicates']:
+        print(f"Skipped {collection['duplicates']} jobs found under more than one company")
+    if collection['excluded']:
+        print(f"Skipped {collection['excluded']} jobs from known-excluded advertisers")
+    if not completed:
+        session.close()
+        print("\nNo jobs found!")
+        return
+    if completed % 10:
+        print(f"  Progress: {completed}/{collection['queued']} | Valid: {len(results)} | Filtered: {filtered_count}")
+    
+    # Pooled browsers are kept warm between jobs; quit them now the session is done
+    session.close()
+    pipeline.print_report()
+    session.print_hedge_report()
+    readiness.print_report(completed)
+    selector_registry.print_report()
+    selector_registry.save()
+    page_weight.print_report()
+    response_cache.print_report()
+    response_cache.save()
+    advertiser_cache.print_report()
+    advertiser_cache.save()
     
     print(f"\n{'=' * 60}")
     print("SAVING RESULTS")
@@ -209,8 +207,10 @@ def scrape_company_jobs(companies=None, scrape_workers=None, search_workers=None
         print(f"Filtered out: {filtered_count} jobs")
         print(f"   - Recruitment/contract/temp/large: {filtered_count - company_mismatch_count}")
         print(f"   - Company name mismatches: {company_mismatch_count}")
+        if reattributed_count:
+            print(f"Kept {reattributed_count} jobs found under another company's search (posted by a target company)")
         
-        stats = phone_cache.get_stats()
+        stats = session.phone_cache.get_stats()
         print(f"Phone cache: {stats['with_phone']}/{stats['total_companies']} companies have phone numbers")
         
         print(f"\nJobs by Company:")
@@ -225,6 +225,8 @@ def scrape_company_jobs(companies=None, scrape_workers=None, search_workers=None
         print(f"No valid jobs scraped!")
         if filtered_count > 0:
             print(f"All {filtered_count} jobs were filtered out (recruitment/contract/temp/large companies)")
+    
+    stage_timer.print_report()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,150 @@
+"""Lease jobs from the shared work queue, scrape them and write the results back (run as many as needed)."""
+
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import argparse
+import socket
+import time
+from threading import Event, Lock, Thread
+
+from scraper.shared_queue import open_shared_queue
+from scraper.session import ScrapeSession
+from scraper.pipeline import ScrapePipeline
+from scraper.job_queue import BoundedJobQueue
+from scraper.stage_timer import stage_timer
+from scraper.selector_registry import selector_registry
+from scraper.http_cache import response_cache
+from scraper.advertiser_cache import advertiser_cache
+from scraper.phone_cache import phone_cache
+from scraper.process_reaper import install_reaper
+from scraper.config import (
+    SHARED_QUEUE_URL, WORKER_BROWSERS, WORK_LEASE_SECONDS, WORK_POLL_INTERVAL
+)
+
+
+def run_worker(queue_url=SHARED_QUEUE_URL, num_browsers=WORKER_BROWSERS, worker_id=None, exit_when_done=False):
+    """
+    Scrape jobs from the shared queue as the coordinator adds them.
+
+    A feeder thread leases jobs as the local pipeline has room for them, and a
+    heartbeat thread renews the leases of jobs still being scraped. If this
+    process dies, its leases expire and other workers pick the jobs up.
+
+    Args:
+        queue_url: Shared queue URL
+        num_browsers: Browsers fetching pages in this process
+        worker_id: Name recorded on leases (default: hostname-pid)
+        exit_when_done: Return once the coordinator has closed the queue and it is empty,
+            instead of waiting for the next run
+
+    Returns:
+        Number of jobs finished by this worker
+    """
+    worker_id = worker_id or f"{socket.gethostname()}-{os.getpid()}"
+    queue = open_shared_queue(queue_url)
+    session = ScrapeSession(headless=True)
+    # Fixed size per worker (memory pressure can still lower it); scale out by adding workers
+    pool_size = session.start_pool(num_browsers)
+    # Lease no further ahead than the pool can start, so a dead worker strands few jobs
+    local_queue = BoundedJobQueue(pool_size)
+    leased = set()  # job_ids leased and not finished yet
+    leased_lock = Lock()
+    stopping = Event()
+    finished = {'count': 0, 'kept': 0}
+
+    def feed():
+        """Lease jobs while the local queue has room; close it once the shared queue is finished."""
+        try:
+            while not stopping.is_set() and not session.is_cancelled:
+                room = pool_size - len(local_queue)
+                jobs = queue.lease(worker_id, count=room) if room > 0 else []
+                for job in jobs:
+                    with leased_lock:
+                        leased.add(job['job_id'])
+                    if not local_queue.put(job):
+                        return
+                if not jobs:
+                    if exit_when_done and room > 0 and queue.finished():
+                        return
+                    time.sleep(WORK_POLL_INTERVAL)
+        except Exception as e:
+            print(f"  ✗ Leasing failed: {e}")
+        finally:
+            local_queue.close()
+
+    def heartbeat():
+        """Renew held leases well before they expire."""
+        while not stopping.wait(WORK_LEASE_SECONDS / 3):
+            with leased_lock:
+                job_ids = list(leased)
+            try:
+                queue.renew(worker_id, job_ids)
+            except Exception as e:
+                print(f"  WARNING: Could not renew leases: {e}")
+
+    def write_back(item):
+        """Sink: store the result on the shared queue (None = filtered out)."""
+        if item.get('cancelled'):
+            # Still leased: released for other workers below
+            return
+        queue.complete(worker_id, item['job_id'], item['job_data'])
+        with leased_lock:
+            leased.discard(item['job_id'])
+        finished['count'] += 1
+        if item['job_data'] is not None:
+            finished['kept'] += 1
+        if finished['count'] % 10 == 0:
+            print(f"  Progress: {finished['count']} jobs finished ({finished['kept']} kept) | {pipeline.depth_line()}")
+
+    print(f"Worker {worker_id}: {pool_size} browsers on {queue_url}\n")
+    feeder = Thread(target=feed, name="lease-feeder", daemon=True)
+    renewer = Thread(target=heartbeat, name="lease-heartbeat", daemon=True)
+    pipeline = ScrapePipeline(session, local_queue, pool_size, write_back)
+    feeder.start()
+    renewer.start()
+    try:
+        pipeline.run()
+    finally:
+        stopping.set()
+        local_queue.close()
+        feeder.join(timeout=5)
+        # Jobs leased but never finished go back for other workers
+        with leased_lock:
+            unfinished = list(leased)
+        if unfinished:
+            queue.release(worker_id, unfinished)
+            print(f"Returned {len(unfinished)} unfinished jobs to the queue")
+        session.stop_pool()
+        session.close()
+        selector_registry.save()
+        response_cache.save()
+        advertiser_cache.save()
+        phone_cache.save()
+
+    pipeline.print_report()
+    session.print_hedge_report()
+    stage_timer.print_report()
+    print(f"\nWorker {worker_id} done: {finished['count']} jobs finished, {finished['kept']} kept")
+    return finished['count']
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Scrape jobs queued by scripts/coordinator.py.")
+    parser.add_argument('--queue', default=SHARED_QUEUE_URL, help="Shared queue URL (default: SHARED_QUEUE_URL)")
+    parser.add_argument('--browsers', type=int, default=WORKER_BROWSERS, help="Browsers in this worker (default: WORKER_BROWSERS)")
+    parser.add_argument('--worker-id', default=None, help="Name recorded on leases (default: hostname-pid)")
+    parser.add_argument('--exit-when-done', action='store_true',
+                        help="Exit once the current run is finished instead of waiting for the next one")
+    args = parser.parse_args()
+
+    install_reaper()
+    try:
+        run_worker(args.queue, args.browsers, args.worker_id, args.exit_when_done)
+    except KeyboardInterrupt:
+        print("\n\nWorker stopped.")
+
+
+if __name__ == "__main__":
+    main()